@@ -1,50 +1,156 @@
 import os
+import argparse
+import heapq
+import mmap
+import tempfile
+from contextlib import ExitStack
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 INPUT_DIR = os.path.join(BASE_DIR, "Input")
 OUTPUT_DIR = os.path.join(BASE_DIR, "Output")
 
 def citeste_fisier(nume_fisier):
+    """
+    Citeste liniile din fisier una cate una, prin mmap: fisierul nu este
+    incarcat in memorie, iar fiecare linie este decodata direct din
+    pagina mapata (fara copie intermediara in bytes).
+    """
     try:
-        with open(nume_fisier, "r") as f:
-            return f.readlines()
+        f = open(nume_fisier, "rb")
     except FileNotFoundError:
         print("Fisierul de input nu este gasit!")
-        return []
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            vedere = memoryview(mm)
+            try:
+                pozitie = 0
+                marime = len(mm)
+                while pozitie < marime:
+                    sfarsit = mm.find(b"\n", pozitie)
+                    if sfarsit == -1:
+                        sfarsit = marime
+                    yield str(vedere[pozitie:sfarsit], "utf-8", "replace")
+                    pozitie = sfarsit + 1
+            finally:
+                vedere.release()
 
-def proceseaza_nume(linii):
-    rezultat = []
+def normalizeaza(linie):
+    return linie.strip().lower()
 
+def proceseaza_nume(linii):
+    """
+    Numele unice, in ordinea primei aparitii. Verificarea se face intr-un
+    set (O(1) pe nume), nu in lista rezultatelor (O(n) pe nume).
+    """
+    vazute = set()
     for linie in linii:
-        nume = linie.strip().lower()
-        if nume and nume not in rezultat:
-            rezultat.append(nume)
-    return rezultat
+        nume = normalizeaza(linie)
+        if nume and nume not in vazute:
+            vazute.add(nume)
+            yield nume
+
+def proceseaza_nume_limitat(linii, partitii=64, director=None):
+    """
+    Ca proceseaza_nume, dar cu memorie limitata, pentru fisiere mai mari
+    decat RAM-ul. Pasul 1: fiecare nume ajunge, cu pozitia lui, intr-unul
+    din `partitii` fisiere temporare dupa hash, deci duplicatele ajung in
+    aceeasi partitie. Pasul 2: fiecare partitie e deduplicata separat (in
+    memorie e doar o partitie odata). Pasul 3: partitiile, deja ordonate
+    dupa pozitie, sunt interclasate cu heapq.merge ca sa pastram ordinea
+    din fisierul original.
+    """
+    with tempfile.TemporaryDirectory(dir=director) as tmp, ExitStack() as stack:
+        cai = [os.path.join(tmp, f"partitie_{i}.txt") for i in range(partitii)]
+        # newline="\n": un "\r" din interiorul unui nume nu devine sfarsit de linie la recitire
+        fisiere = [stack.enter_context(open(cale, "w", encoding="utf-8", newline="\n")) for cale in cai]
+        for pozitie, linie in enumerate(linii):
+            nume = normalizeaza(linie)
+            if nume:
+                fisiere[hash(nume) % partitii].write(f"{pozitie}\t{nume}\n")
+        for f in fisiere:
+            f.close()
+
+        unice = []
+        for cale in cai:
+            vazute = set()
+            cale_unice = cale + ".unice"
+            with open(cale, encoding="utf-8", newline="\n") as intrare, \
+                    open(cale_unice, "w", encoding="utf-8", newline="\n") as iesire:
+                for rand in intrare:
+                    nume = rand.rstrip("\n").split("\t", 1)[1]
+                    if nume not in vazute:
+                        vazute.add(nume)
+                        iesire.write(rand)
+            os.remove(cale)
+            unice.append(cale_unice)
+
+        def citeste_partitie(cale):
+            with open(cale, encoding="utf-8", newline="\n") as f:
+                for rand in f:
+                    pozitie, nume = rand.rstrip("\n").split("\t", 1)
+                    yield int(pozitie), nume
+
+        for _, nume in heapq.merge(*(citeste_partitie(cale) for cale in unice)):
+            yield nume
 
 
 def scrie_fisier(nume_fisier, lista):
+    """
+    Scrie intai intr-un fisier temporar si il muta peste cel final doar daca
+    totul a reusit, ca o eroare la mijloc sa nu lase output-ul trunchiat.
+    """
+    temporar = nume_fisier + ".tmp"
     try:
-        with open(nume_fisier, "w") as f:
+        with open(temporar, "w") as f:
             for nume in lista:
                 f.write(nume + "\n")
+        os.replace(temporar, nume_fisier)
+        return True
     except FileNotFoundError:
         print("Fisierul de output nu este gasit!")
         return False
     except PermissionError:
         print("Nu ai destule permisiuni!")
         return False
+    finally:
+        if os.path.exists(temporar):
+            os.remove(temporar)
 
 def main():
-    input_path = os.path.join(INPUT_DIR, "input.txt")
-    output_path = os.path.join(OUTPUT_DIR, "output2.txt")
-    linii = citeste_fisier(input_path)
-    if linii:
+    parser = argparse.ArgumentParser(description="Elimina numele duplicate dintr-un fisier")
+    parser.add_argument("--input", default=os.path.join(INPUT_DIR, "input.txt"))
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, "output2.txt"))
+    parser.add_argument("--partitii", type=int, default=0,
+                        help="Mod cu memorie limitata: numarul de partitii pe disc (0 = totul in memorie)")
+    parser.add_argument("--fara-afisare", action="store_true", help="Nu afisa numele in consola")
+    args = parser.parse_args()
+
+    # Totul e citit lenes, deci verificam inainte sa deschidem output-ul
+    if not os.path.isfile(args.input):
+        print("Fisierul de input nu este gasit!")
+        return
+    if os.path.exists(args.output) and os.path.samefile(args.input, args.output):
+        print("Fisierul de output trebuie sa fie diferit de cel de input!")
+        return
+
+    linii = citeste_fisier(args.input)
+    if args.partitii > 0:
+        nume_procesate = proceseaza_nume_limitat(linii, args.partitii)
+    else:
         nume_procesate = proceseaza_nume(linii)
 
+    def afiseaza(nume_procesate):
         print("Nume procesate:")
         for n in nume_procesate:
             print(n)
+            yield n
 
-        scrie_fisier(output_path, nume_procesate)
+    if not args.fara_afisare:
+        nume_procesate = afiseaza(nume_procesate)
+    scrie_fisier(args.output, nume_procesate)
 
-main()
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import sys
 from unittest.mock import patch
 from collections import defaultdict
 from main1 import citeste_csv, proceseaza_people
+from main import citeste_fisier, proceseaza_nume, proceseaza_nume_limitat, main
 
 class TestMain1(unittest.TestCase):
 
@@ -74,5 +75,52 @@ Numar persoane pe orase:
         
         self.assertEqual(mock_stdout.getvalue(), expected_output)
 
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write("Ana\nana \nBogdan\n\nANA\nbogdan\nCris")
+            self.temp_file = f.name
+
+    def tearDown(self):
+        os.unlink(self.temp_file)
+
+    def test_citeste_fisier(self):
+        self.assertEqual(list(citeste_fisier(self.temp_file)),
+                         ['Ana', 'ana ', 'Bogdan', '', 'ANA', 'bogdan', 'Cris'])
+
+    def test_citeste_fisier_gol(self):
+        with open(self.temp_file, 'w'):
+            pass
+        self.assertEqual(list(citeste_fisier(self.temp_file)), [])
+
+    def test_proceseaza_nume_pastreaza_ordinea(self):
+        rezultat = list(proceseaza_nume(citeste_fisier(self.temp_file)))
+        self.assertEqual(rezultat, ['ana', 'bogdan', 'cris'])
+
+    def test_proceseaza_nume_limitat(self):
+        linii = [f"Nume{i % 50}" for i in range(1000)]
+        self.assertEqual(list(proceseaza_nume_limitat(linii, partitii=7)),
+                         list(proceseaza_nume(linii)))
+
+    def test_proceseaza_nume_limitat_cu_cr_in_nume(self):
+        linii = ["ana\rmaria", "Ion", "ANA\rMaria", "x\u2028y"]
+        self.assertEqual(list(proceseaza_nume_limitat(linii, partitii=3)),
+                         ["ana\rmaria", "ion", "x\u2028y"])
+
+    def test_main_nu_suprascrie_inputul(self):
+        argv = ['main.py', '--input', self.temp_file, '--output', self.temp_file]
+        with patch('sys.argv', argv), patch('sys.stdout', new_callable=io.StringIO):
+            main()
+        self.assertEqual(list(citeste_fisier(self.temp_file))[0], 'Ana')
+
+    def test_main_input_lipsa(self):
+        output = self.temp_file + '.out'
+        argv = ['main.py', '--input', self.temp_file + '.lipsa', '--output', output]
+        with patch('sys.argv', argv), patch('sys.stdout', new_callable=io.StringIO):
+            main()
+        self.assertFalse(os.path.exists(output))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,11 +1,24 @@
 import os
 import csv
 import json
+import gzip
+import hashlib
 import argparse
 import logging
+import queue
+import atexit
+from array import array
+from logging.handlers import QueueHandler, QueueListener
 from dataclasses import dataclass
-from collections import defaultdict
-from typing import Any, Dict, List
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np  # opțional: agregări și filtre vectorizate pe PeopleTable
+except ImportError:
+    np = None
 
 
 # ---------- OOP domain model ----------
@@ -15,17 +28,450 @@ class Person:
     city: str
     age: int
 
+# ---------- Agregare incrementală ----------
+class StatsAccumulator:
+    """
+    Statistici actualizate rând cu rând, care pot fi combinate între bucăți
+    de fișier (merge) și salvate/încărcate ca JSON (to_dict/from_dict).
+
+    Vârstele sunt întregi în [0, 130], așa că păstrăm histograma lor:
+    minimul, maximul și mediana se obțin exact din ea, indiferent de câte
+    rânduri au fost agregate.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.age_sum = 0
+        self.cities: dict[str, int] = defaultdict(int)
+        self.city_age_sum: dict[str, int] = defaultdict(int)
+        self.age_counts: dict[int, int] = defaultdict(int)
+
+    def add(self, person: Person) -> None:
+        self.total += 1
+        self.age_sum += person.age
+        self.cities[person.city] += 1
+        self.city_age_sum[person.city] += person.age
+        self.age_counts[person.age] += 1
+
+    def merge(self, other: "StatsAccumulator") -> None:
+        self.total += other.total
+        self.age_sum += other.age_sum
+        for city, n in other.cities.items():
+            self.cities[city] += n
+        for city, n in other.city_age_sum.items():
+            self.city_age_sum[city] += n
+        for age, n in other.age_counts.items():
+            self.age_counts[age] += n
+
+    def median_age(self) -> float:
+        if not self.total:
+            return 0
+        lo_rank, hi_rank = (self.total - 1) // 2, self.total // 2
+        lo = hi = None
+        seen = 0
+        for age in sorted(self.age_counts):
+            seen += self.age_counts[age]
+            if lo is None and seen > lo_rank:
+                lo = age
+            if seen > hi_rank:
+                hi = age
+                break
+        return (lo + hi) / 2
+
+    def result(self) -> dict[str, Any]:
+        avg_age = round(self.age_sum / self.total, 2) if self.total else 0
+        return {
+            "numar_total_persoane": self.total,
+            "varsta_medie": avg_age,
+            "numar_persoane_pe_orase": dict(self.cities),
+            "varsta_minima": min(self.age_counts) if self.age_counts else 0,
+            "varsta_maxima": max(self.age_counts) if self.age_counts else 0,
+            "varsta_mediana": self.median_age(),
+            "varsta_medie_pe_orase": {
+                city: round(self.city_age_sum[city] / n, 2)
+                for city, n in self.cities.items()
+            },
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "age_sum": self.age_sum,
+            "cities": dict(self.cities),
+            "city_age_sum": dict(self.city_age_sum),
+            "age_counts": {str(age): n for age, n in self.age_counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "StatsAccumulator":
+        acc = cls()
+        acc.total = data["total"]
+        acc.age_sum = data["age_sum"]
+        acc.cities.update(data["cities"])
+        acc.city_age_sum.update(data["city_age_sum"])
+        acc.age_counts.update({int(age): n for age, n in data["age_counts"].items()})
+        return acc
+
+
+# ---------- Reprezentare pe coloane ----------
+class PeopleTable:
+    """
+    Persoanele stocate pe coloane, nu ca obiecte Person:
+    - numele (aproape toate distincte) stau concatenate, în UTF-8, într-un
+      singur bytearray, cu offset-urile lor într-un array; un nume costă
+      lungimea lui + 8 bytes, nu un obiect str separat;
+    - orașele (puține) sunt codificate prin dicționar: fiecare oraș e
+      păstrat o singură dată, iar rândul ține doar codul lui;
+    - vârstele stau într-un array de bytes (sunt în [0, 130]).
+    Un rând costă ~lungimea numelui + 13 bytes, față de ~250 de bytes
+    pentru un Person (obiect, __dict__ și două str-uri) plus pointerul din listă.
+
+    stats() și filter() lucrează pe coloane întregi: cu NumPy prin
+    bincount/măști, fără NumPy prin Counter și compress (tot în C).
+    Tabelele obținute prin filter() împart dicționarul de orașe cu sursa.
+    """
+
+    def __init__(self) -> None:
+        self.name_data = bytearray()
+        self.name_offsets = array("Q", [0])  # numele i e name_data[offsets[i]:offsets[i + 1]]
+        self.city_codes = array("I")
+        self.ages = array("B")
+        self.cities: list[str] = []
+        self._city_index: dict[str, int] = {}
+
+    @classmethod
+    def from_people(cls, people: Iterable[Person]) -> "PeopleTable":
+        table = cls()
+        table.extend(people)
+        return table
+
+    def append(self, name: str, city: str, age: int) -> None:
+        self.name_data += name.encode("utf-8")
+        self.name_offsets.append(len(self.name_data))
+        code = self._city_index.get(city)
+        if code is None:
+            code = self._city_index[city] = len(self.cities)
+            self.cities.append(city)
+        self.city_codes.append(code)
+        self.ages.append(age)
+
+    def add(self, person: Person) -> None:
+        self.append(person.name, person.city, person.age)
+
+    def extend(self, people: Iterable[Person]) -> None:
+        for p in people:
+            self.append(p.name, p.city, p.age)
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def name(self, i: int) -> str:
+        return self.name_data[self.name_offsets[i]:self.name_offsets[i + 1]].decode("utf-8")
+
+    def names(self) -> Iterator[str]:
+        data, offsets = self.name_data, self.name_offsets
+        start = 0
+        for end in offsets[1:]:
+            yield data[start:end].decode("utf-8")
+            start = end
+
+    def __iter__(self) -> Iterator[Person]:
+        """
+        Person-urile, create pe rând (de ex. pentru write_report_stream).
+        """
+        cities = self.cities
+        for name, c, a in zip(self.names(), self.city_codes, self.ages):
+            yield Person(name=name, city=cities[c], age=a)
+
+    def __getitem__(self, i: int) -> Person:
+        return Person(name=self.name(i), city=self.cities[self.city_codes[i]], age=self.ages[i])
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        cities = self.cities
+        return [
+            {"name": name, "city": cities[c], "age": a}
+            for name, c, a in zip(self.names(), self.city_codes, self.ages)
+        ]
+
+    def _take(self, mask: list[bool]) -> "PeopleTable":
+        """
+        Tabel nou cu rândurile pentru care mask e adevărat.
+        """
+        table = PeopleTable()
+        table.cities, table._city_index = self.cities, self._city_index
+        data, offsets = self.name_data, self.name_offsets
+        for i in compress(range(len(mask)), mask):
+            table.name_data += data[offsets[i]:offsets[i + 1]]
+            table.name_offsets.append(len(table.name_data))
+        table.city_codes.extend(compress(self.city_codes, mask))
+        table.ages.extend(compress(self.ages, mask))
+        return table
+
+    def filter(
+        self, city: Optional[str] = None, min_age: Optional[int] = None, max_age: Optional[int] = None
+    ) -> "PeopleTable":
+        """
+        Rândurile cu orașul `city` și vârsta în [min_age, max_age] (capetele
+        lipsă nu limitează), ca un tabel nou. Orașul e comparat după cod,
+        deci un oraș necunoscut dă direct un tabel gol.
+        """
+        city_code = None
+        if city is not None:
+            city_code = self._city_index.get(city)
+            if city_code is None:
+                return self._take([])
+
+        if np is not None and len(self):
+            ages = np.frombuffer(self.ages, dtype=np.uint8)
+            mask = np.ones(len(ages), dtype=bool)
+            if city_code is not None:
+                mask &= np.frombuffer(self.city_codes, dtype=np.uint32) == city_code
+            if min_age is not None:
+                mask &= ages >= min_age
+            if max_age is not None:
+                mask &= ages <= max_age
+            return self._take(mask.tolist())
+
+        # Fără NumPy: masca vine dintr-un tabel de 256 de valori pe vârstă
+        lo = 0 if min_age is None else max(min_age, 0)
+        hi = 255 if max_age is None else min(max_age, 255)
+        keep_age = [lo <= a <= hi for a in range(256)]
+        mask = [keep_age[a] for a in self.ages]
+        if city_code is not None:
+            mask = [m and c == city_code for m, c in zip(mask, self.city_codes)]
+        return self._take(mask)
+
+    def stats(self) -> StatsAccumulator:
+        """
+        Un StatsAccumulator calculat pe coloane, egal cu cel obținut
+        adăugând persoanele una câte una (inclusiv ordinea orașelor).
+        """
+        acc = StatsAccumulator()
+        acc.total = len(self)
+        if not acc.total:
+            return acc
+
+        if np is not None:
+            ages = np.frombuffer(self.ages, dtype=np.uint8)
+            codes = np.frombuffer(self.city_codes, dtype=np.uint32)
+            acc.age_sum = int(ages.sum(dtype=np.int64))
+            city_counts = np.bincount(codes, minlength=len(self.cities)).tolist()
+            city_age_sums = np.bincount(codes, weights=ages, minlength=len(self.cities)).tolist()
+            acc.age_counts.update({age: n for age, n in enumerate(np.bincount(ages).tolist()) if n})
+            # orașele în ordinea primei apariții, ca la add()
+            present, first = np.unique(codes, return_index=True)
+            order = present[np.argsort(first)].tolist()
+        else:
+            age_counts = Counter(self.ages)
+            acc.age_sum = sum(age * n for age, n in age_counts.items())
+            acc.age_counts.update(age_counts)
+            city_counts = Counter(self.city_codes)  # cheile sunt deja în ordinea primei apariții
+            city_age_sums: dict[int, int] = defaultdict(int)
+            # perechile (oraș, vârstă) distincte sunt cel mult orașe x 131
+            for (code, age), n in Counter(zip(self.city_codes, self.ages)).items():
+                city_age_sums[code] += age * n
+            order = city_counts
+
+        for code in order:
+            acc.cities[self.cities[code]] = city_counts[code]
+            acc.city_age_sum[self.cities[code]] = int(city_age_sums[code])
+        return acc
+
+
+# ---------- Stare pentru rulări incrementale ----------
+# Câți bytes dinaintea offset-ului intră în amprenta prefixului deja agregat
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def prefix_fingerprint(path: str, offset: int, size: int = FINGERPRINT_BYTES) -> str:
+    """
+    SHA-256 peste ultimii `size` bytes dinaintea lui `offset`: dacă fișierul
+    a fost regenerat, nu doar completat, partea deja citită nu mai arată la fel.
+    """
+    start = max(0, offset - size)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+@dataclass
+class FileIdentity:
+    """Inode, dimensiune și mtime ale fișierului de input la ultima rulare."""
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, path: str) -> "FileIdentity":
+        st = os.stat(path)
+        return cls(st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def same_file_appended(self, current: "FileIdentity") -> bool:
+        """
+        Același fișier, cel mult completat: alt inode înseamnă alt fișier, iar
+        aceeași dimensiune cu alt mtime înseamnă rescris pe loc (o adăugare
+        schimbă mereu dimensiunea).
+        """
+        if self.inode != current.inode or current.size < self.size:
+            return False
+        return current.size != self.size or current.mtime_ns == self.mtime_ns
+
+
+@dataclass
+class IncrementalState:
+    """
+    Cât din fișierul de input a fost deja agregat: offset-ul în bytes după
+    ultima linie completă, numărul de linii fizice și statisticile de până atunci,
+    plus identitatea fișierului și amprenta prefixului citit, ca un export
+    regenerat cu același header să nu fie luat drept date adăugate.
+    """
+    input_path: str
+    header: list[str]
+    offset: int
+    lines: int
+    stats: StatsAccumulator
+    identity: Optional[FileIdentity] = None
+    fingerprint: Optional[str] = None
+
+    def matches(self, path: str, header: list[str], data_start: int, end: int, identity: FileIdentity) -> bool:
+        return (
+            self.input_path == os.path.abspath(path)
+            and self.header == header
+            and data_start <= self.offset <= end
+            and self.identity is not None
+            and self.identity.same_file_appended(identity)
+            and self.fingerprint == prefix_fingerprint(path, self.offset)
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "input_path": self.input_path,
+                "header": self.header,
+                "offset": self.offset,
+                "lines": self.lines,
+                "stats": self.stats.to_dict(),
+                "identity": vars(self.identity) if self.identity is not None else None,
+                "fingerprint": self.fingerprint,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, path)  # atomic: o rulare întreruptă nu strică starea
+
+    @classmethod
+    def load(cls, path: str) -> Optional["IncrementalState"]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        identity = data.get("identity")  # lipsește în stările salvate de versiunile vechi
+        return cls(
+            input_path=data["input_path"],
+            header=data["header"],
+            offset=data["offset"],
+            lines=data["lines"],
+            stats=StatsAccumulator.from_dict(data["stats"]),
+            identity=FileIdentity(**identity) if identity else None,
+            fingerprint=data.get("fingerprint"),
+        )
+
+# ---------- Raportare rânduri invalide ----------
+class InvalidRowReport:
+    """
+    Numără rândurile invalide pe tip de eroare și păstrează doar primele
+    `sample` exemple din fiecare tip, ca un fișier murdar să nu transforme
+    parsarea într-o avalanșă de WARNING-uri.
+
+    Cu logger, exemplele sunt logate imediat; fără logger (în procesele
+    worker) sunt păstrate în `samples` și logate de părinte la merge.
+    Tipul erorii e textul dinaintea primului ":" (ex. "age invalid").
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, sample: int = 20) -> None:
+        self.logger = logger
+        self.sample = sample
+        self.counts: dict[str, int] = defaultdict(int)
+        self.reported: dict[str, int] = defaultdict(int)
+        self.samples: list[tuple[int, str, dict[str, str]]] = []
+
+    @staticmethod
+    def kind(error: str) -> str:
+        return error.split(":", 1)[0]
+
+    def record(self, line: int, error: str, row: dict[str, str]) -> None:
+        kind = self.kind(error)
+        self.counts[kind] += 1
+        if self.sample is not None and self.reported[kind] >= self.sample:
+            return
+        self.reported[kind] += 1
+        if self.logger is not None:
+            self.logger.warning("Rând invalid la linia %d: %s | row=%s", line, error, row)
+        else:
+            self.samples.append((line, error, row))
+
+    def merge(self, other: "InvalidRowReport", line_offset: int = 0) -> None:
+        """
+        Adaugă raportul unei bucăți; numerele de linie ale exemplelor
+        sunt decalate cu line_offset.
+        """
+        for line, error, row in other.samples:
+            kind = self.kind(error)
+            if self.sample is not None and self.reported[kind] >= self.sample:
+                continue
+            self.reported[kind] += 1
+            if self.logger is not None:
+                self.logger.warning("Rând invalid la linia %d: %s | row=%s", line + line_offset, error, row)
+            else:
+                self.samples.append((line + line_offset, error, row))
+        for kind, n in other.counts.items():
+            self.counts[kind] += n
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def log_summary(self) -> None:
+        if self.logger is None or not self.counts:
+            return
+        suppressed = self.total - sum(self.reported.values())
+        details = ", ".join(f"{kind}={n}" for kind, n in sorted(self.counts.items(), key=lambda kv: -kv[1]))
+        self.logger.warning("Rânduri invalide: %d (%s); %d nelogate individual", self.total, details, suppressed)
+
+
 # ---------- Processor (OOP) ----------
 class PeopleProcessor:
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(self, logger: logging.Logger, invalid_sample: Optional[int] = 20) -> None:
         self.logger = logger
+        self.invalid_sample = invalid_sample  # None = loghează toate rândurile invalide
+
+    def _invalid_report(self) -> InvalidRowReport:
+        return InvalidRowReport(self.logger, self.invalid_sample)
 
     def read_csv(self, path: str) -> list[Person]:
         """
         Citește CSV (name,city,age) și returnează o listă de Person.
         Rândurile invalide sunt ignorate, dar sunt logate cu WARNING.
+        Potrivit pentru fișiere mici; pentru fișiere mari vezi iter_people.
         """
-        people: list[Person] = []
+        return list(self.iter_people(path))
+
+    def read_table(self, path: str) -> PeopleTable:
+        """
+        Ca read_csv, dar persoanele sunt păstrate pe coloane într-un PeopleTable,
+        cu o fracțiune din memoria unei liste de Person.
+        """
+        return PeopleTable.from_people(self.iter_people(path))
+
+    def iter_people(self, path: str, log_invalid: bool = True) -> Iterator[Person]:
+        """
+        Generator peste Person-urile valide din CSV, rând cu rând.
+        Memoria folosită nu depinde de mărimea fișierului.
+        Erorile de citire sunt logate, iar generatorul se oprește.
+        log_invalid=False nu mai logează rândurile invalide (util la o a doua trecere).
+        """
+        count = 0
+        report = self._invalid_report()
 
         try:
             with open(path, newline="", encoding="utf-8") as f:
@@ -39,22 +485,73 @@ class PeopleProcessor:
                 for idx, row in enumerate(reader, start=2):  # header=1, primul rând de date=2
                     try:
                         person = self._parse_row(row)
-                        people.append(person)
                     except ValueError as e:
-                        self.logger.warning("Rând invalid la linia %d: %s | row=%s", idx, e, row)
+                        if log_invalid:
+                            report.record(idx, str(e), row)
+                        continue
+                    count += 1
+                    yield person
 
         except FileNotFoundError:
             self.logger.error("Fișierul de input nu a fost găsit: %s", path)
-            return []
+            return
         except PermissionError:
             self.logger.error("Nu ai permisiuni să citești fișierul: %s", path)
-            return []
+            return
         except Exception as e:
             self.logger.exception("Eroare neașteptată la citire CSV: %s", e)
-            return []
+            return
+        finally:
+            report.log_summary()
+
+        self.logger.info("Am citit %d persoane valide din %s", count, path)
+
+    def read_csv_parallel(
+        self, path: str, workers: int, keep_people: bool = True
+    ) -> tuple[list[Person], StatsAccumulator]:
+        """
+        Citește CSV-ul în paralel: fișierul e împărțit în `workers` bucăți
+        aliniate la capăt de linie, parsate într-un pool de procese.
+        Returnează (persoane, statistici agregate); lista e goală dacă
+        keep_people=False. Câmpurile cu newline în interior nu sunt suportate.
+        """
+        people: list[Person] = []
+        acc = StatsAccumulator()
+        report = self._invalid_report()
+
+        try:
+            fieldnames, ranges = split_csv(path, workers)
+            required = {"name", "city", "age"}
+            if not required.issubset(set(fieldnames)):
+                raise ValueError(f"CSV trebuie să aibă coloanele: {sorted(required)}. Găsit: {fieldnames}")
 
-        self.logger.info("Am citit %d persoane valide din %s", len(people), path)
-        return people
+            line_offset = 1  # header
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(parse_chunk, path, start, end, fieldnames, keep_people, self.invalid_sample)
+                    for start, end in ranges
+                ]
+                for future in futures:
+                    chunk = future.result()
+                    report.merge(chunk.invalid, line_offset)
+                    line_offset += chunk.lines
+                    acc.merge(chunk.stats)
+                    people.extend(chunk.people)
+
+        except FileNotFoundError:
+            self.logger.error("Fișierul de input nu a fost găsit: %s", path)
+            return [], StatsAccumulator()
+        except PermissionError:
+            self.logger.error("Nu ai permisiuni să citești fișierul: %s", path)
+            return [], StatsAccumulator()
+        except Exception as e:
+            self.logger.exception("Eroare neașteptată la citire CSV: %s", e)
+            return [], StatsAccumulator()
+        finally:
+            report.log_summary()
+
+        self.logger.info("Am citit %d persoane valide din %s (%d procese)", acc.total, path, workers)
+        return people, acc
 
     def _parse_row(self, row: dict[str, str]) -> Person:
         name = (row.get("name") or "").strip().lower()
@@ -76,33 +573,122 @@ class PeopleProcessor:
 
         return Person(name=name, city=city, age=age)
 
-    def compute_stats(self, people: list[Person]) -> dict[str, Any]:
+    def compute_stats(self, people: "list[Person] | PeopleTable") -> dict[str, Any]:
         """
         Produce un dict JSON-serializabil cu statistici și lista de persoane.
+        Pentru un PeopleTable statisticile sunt calculate pe coloane.
         """
-        total = len(people)
-        cities = defaultdict(int)
-        age_sum = 0
+        if isinstance(people, PeopleTable):
+            stats = people.stats().result()
+            stats["people"] = people.to_dicts()
+        else:
+            acc = StatsAccumulator()
+            for p in people:
+                acc.add(p)
+            stats = acc.result()
+            stats["people"] = [
+                {"name": p.name, "city": p.city, "age": p.age}
+                for p in people
+            ]
 
-        for p in people:
-            cities[p.city] += 1
-            age_sum += p.age
+        self._log_stats(stats)
+        return stats
 
-        avg_age = round(age_sum / total, 2) if total else 0
+    def update_incremental(self, path: str, state_path: str) -> Optional[StatsAccumulator]:
+        """
+        Agregă doar rândurile adăugate în CSV de la ultima rulare și salvează
+        noua stare în state_path. Dacă starea lipsește sau nu mai corespunde
+        fișierului (alt fișier, alt header, fișier trunchiat sau regenerat),
+        reia de la zero.
+        Returnează statisticile cumulate sau None la eroare.
 
-        stats: dict[str, Any] = {
-            "numar_total_persoane": total,
-            "varsta_medie": avg_age,
-            "numar_persoane_pe_orase": dict(cities),
-            "people": [
+        O ultimă linie fără newline intră în statisticile returnate, dar nu
+        și în starea salvată: offset-ul rămâne înaintea ei, așa că e parsată
+        din nou (eventual completată) la rularea următoare.
+        """
+        try:
+            fieldnames, ranges = split_csv(path, 1)
+            required = {"name", "city", "age"}
+            if not required.issubset(set(fieldnames)):
+                raise ValueError(f"CSV trebuie să aibă coloanele: {sorted(required)}. Găsit: {fieldnames}")
+            identity = FileIdentity.of(path)
+            size = identity.size
+            data_start = ranges[0][0] if ranges else size
+            end = max(last_complete_line_end(path), data_start)
+
+            state = IncrementalState.load(state_path)
+            if state is None or not state.matches(path, fieldnames, data_start, end, identity):
+                if state is not None:
+                    self.logger.warning("Starea din %s nu corespunde fișierului; recalculez de la zero", state_path)
+                state = IncrementalState(os.path.abspath(path), fieldnames, data_start, 1, StatsAccumulator())
+
+            chunk = parse_chunk(path, state.offset, end, fieldnames, False, self.invalid_sample)
+            tail = parse_chunk(path, end, size, fieldnames, False, self.invalid_sample) if end < size else None
+            report = self._invalid_report()
+            report.merge(chunk.invalid, state.lines)
+            if tail is not None:
+                report.merge(tail.invalid, state.lines + chunk.lines)
+            report.log_summary()
+
+            state.stats.merge(chunk.stats)
+            state.offset = end
+            state.lines += chunk.lines
+            state.identity = identity
+            state.fingerprint = prefix_fingerprint(path, end)
+            state.save(state_path)
+
+            stats = state.stats
+            if tail is not None:
+                stats = StatsAccumulator.from_dict(state.stats.to_dict())
+                stats.merge(tail.stats)
+
+        except FileNotFoundError:
+            self.logger.error("Fișierul de input nu a fost găsit: %s", path)
+            return None
+        except PermissionError:
+            self.logger.error("Nu ai permisiuni să citești fișierul: %s", path)
+            return None
+        except Exception as e:
+            self.logger.exception("Eroare neașteptată la citire incrementală: %s", e)
+            return None
+
+        self.logger.info("Rulare incrementală: %d persoane noi, %d în total", chunk.stats.total, stats.total)
+        return stats
+
+    def stats_from_accumulator(self, acc: StatsAccumulator, people: Optional[list[Person]] = None) -> dict[str, Any]:
+        """
+        Construiește raportul dintr-un StatsAccumulator deja calculat
+        (de ex. de read_csv_parallel). Lista "people" e inclusă doar dacă e dată.
+        """
+        stats = acc.result()
+        if people is not None:
+            stats["people"] = [
                 {"name": p.name, "city": p.city, "age": p.age}
                 for p in people
-            ],
-        }
+            ]
+        self._log_stats(stats)
+        return stats
 
-        self.logger.info("Statistici calculate: total=%d, avg_age=%s, orase=%d", total, avg_age, len(cities))
+    def compute_stats_stream(self, people: Iterable[Person]) -> dict[str, Any]:
+        """
+        Consumă un iterator de Person și agregă statisticile pe măsură ce
+        rândurile sosesc, fără să păstreze persoanele în memorie.
+        Rezultatul nu conține lista "people".
+        """
+        acc = StatsAccumulator()
+        for p in people:
+            acc.add(p)
+
+        stats = acc.result()
+        self._log_stats(stats)
         return stats
 
+    def _log_stats(self, stats: dict[str, Any]) -> None:
+        self.logger.info(
+            "Statistici calculate: total=%d, avg_age=%s, orase=%d",
+            stats["numar_total_persoane"], stats["varsta_medie"], len(stats["numar_persoane_pe_orase"]),
+        )
+
     def write_json(self, path: str, data: dict[str, Any]) -> bool:
         """
         Scrie JSON la path. Returnează True dacă a reușit.
@@ -120,10 +706,205 @@ class PeopleProcessor:
             self.logger.exception("Eroare neașteptată la scriere JSON: %s", e)
             return False
 
+    def write_report_stream(
+        self,
+        path: str,
+        stats: dict[str, Any],
+        people: Optional[Iterable[Person]],
+        fmt: str = "json",
+        use_gzip: bool = False,
+    ) -> bool:
+        """
+        Scrie raportul incremental: întâi statisticile, apoi persoanele una
+        câte una din iterator, deci memoria nu depinde de numărul lor.
+        fmt="json" produce același document ca write_json; fmt="ndjson"
+        scrie statisticile pe prima linie și câte o persoană pe fiecare linie.
+        use_gzip=True (sau un path care se termină în .gz) scrie gzip.
+        Cu people=None raportul conține doar statisticile.
+        Returnează True dacă a reușit.
+        """
+        if fmt not in ("json", "ndjson"):
+            raise ValueError(f"Format necunoscut: {fmt!r}")
+
+        use_gzip = use_gzip or path.endswith(".gz")
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            opener = gzip.open if use_gzip else open
+            with opener(path, "wt", encoding="utf-8") as f:
+                if fmt == "ndjson":
+                    _write_ndjson(f, stats, people)
+                else:
+                    _write_json(f, stats, people)
+            self.logger.info("Am scris raportul %s: %s", fmt.upper(), path)
+            return True
+        except PermissionError:
+            self.logger.error("Nu ai permisiuni să scrii fișierul: %s", path)
+            return False
+        except Exception as e:
+            self.logger.exception("Eroare neașteptată la scriere %s: %s", fmt.upper(), e)
+            return False
+
+
+# ---------- Scriere incrementală ----------
+def _person_dict(p: Person) -> dict[str, Any]:
+    return {"name": p.name, "city": p.city, "age": p.age}
+
+
+def _write_json(f, stats: dict[str, Any], people: Optional[Iterable[Person]]) -> None:
+    """
+    Emite același text ca json.dump(..., indent=2) pentru stats + "people",
+    dar fără să construiască lista în memorie.
+    """
+    def indented(value: Any, prefix: str) -> str:
+        return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + prefix)
+
+    if people is None:
+        header = {k: v for k, v in stats.items() if k != "people"}
+        f.write(json.dumps(header, indent=2, ensure_ascii=False))
+        return
+
+    f.write("{\n")
+    for key, value in stats.items():
+        if key == "people":
+            continue
+        f.write(f"  {json.dumps(key, ensure_ascii=False)}: {indented(value, '  ')},\n")
+
+    f.write('  "people": [')
+    first = True
+    for p in people:
+        f.write(_PERSON_JSON_FIRST if first else _PERSON_JSON_NEXT)
+        f.write(_person_json_body(p))
+        first = False
+    f.write("]\n}" if first else "\n  ]\n}")
+
+
+# Textul unei persoane exact ca în json.dump(indent=2), fără encoder-ul
+# Python lent pe care îl implică indent la fiecare apel json.dumps
+_PERSON_JSON_FIRST = "\n    "
+_PERSON_JSON_NEXT = ",\n    "
+
+
+def _person_json_body(p: Person) -> str:
+    name = json.dumps(p.name, ensure_ascii=False)
+    city = json.dumps(p.city, ensure_ascii=False)
+    return f'{{\n      "name": {name},\n      "city": {city},\n      "age": {p.age}\n    }}'
+
+
+def _write_ndjson(f, stats: dict[str, Any], people: Optional[Iterable[Person]]) -> None:
+    header = {k: v for k, v in stats.items() if k != "people"}
+    f.write(json.dumps(header, ensure_ascii=False) + "\n")
+    for p in people or ():
+        f.write(json.dumps(_person_dict(p), ensure_ascii=False) + "\n")
+
+
+# ---------- Parsare paralelă ----------
+@dataclass
+class ChunkResult:
+    stats: StatsAccumulator
+    people: list[Person]
+    invalid: InvalidRowReport  # exemple cu numere de linie relative la bucată
+    lines: int  # numărul de linii fizice din bucată
+
+
+def split_csv(path: str, parts: int) -> tuple[list[str], list[tuple[int, int]]]:
+    """
+    Citește header-ul și împarte restul fișierului în `parts` intervale de
+    bytes [start, end), fiecare începând la început de linie.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        fieldnames = next(csv.reader([header.decode("utf-8-sig")]), [])
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        bounds = [data_start]
+        step = max((size - data_start) // max(parts, 1), 1)
+        for i in range(1, parts):
+            target = data_start + i * step
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # avansează până la începutul liniei următoare
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+        bounds.append(size)
+
+    ranges = [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+    return fieldnames, ranges
+
+
+def last_complete_line_end(path: str) -> int:
+    """
+    Offset-ul de după ultimul newline: o linie încă în curs de scriere
+    la finalul fișierului e lăsată pentru rularea următoare.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        while pos > 0:
+            step = min(64 * 1024, pos)
+            f.seek(pos - step)
+            block = f.read(step)
+            i = block.rfind(b"\n")
+            if i != -1:
+                return pos - step + i + 1
+            pos -= step
+    return 0
+
+
+def parse_chunk(
+    path: str, start: int, end: int, fieldnames: list[str], keep_people: bool, invalid_sample: Optional[int] = 20
+) -> ChunkResult:
+    """
+    Parsează liniile din [start, end) într-un proces worker.
+    Rândurile invalide sunt numărate și returnate (nu logate) cu numărul de linie relativ.
+    """
+    processor = PeopleProcessor(logging.getLogger("people_app.worker"))
+    result = ChunkResult(stats=StatsAccumulator(), people=[], invalid=InvalidRowReport(None, invalid_sample), lines=0)
+
+    def lines():
+        with open(path, "rb") as f:
+            f.seek(start)
+            pos = start
+            for raw in f:
+                if pos >= end:
+                    break
+                pos += len(raw)
+                result.lines += 1
+                yield raw.decode("utf-8")
+
+    reader = csv.DictReader(lines(), fieldnames=fieldnames)
+    for row in reader:
+        try:
+            person = processor._parse_row(row)
+        except ValueError as e:
+            result.invalid.record(reader.line_num, str(e), row)
+            continue
+        result.stats.add(person)
+        if keep_people:
+            result.people.append(person)
+
+    return result
+
 
 # ---------- Logging setup ----------
-def setup_logging(log_path: str, level: str = "INFO") -> logging.Logger:
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(log_path: str, level: str = "INFO", use_queue: bool = False) -> logging.Logger:
+    """
+    Configurează logger-ul "people_app" (fișier + consolă).
+    Cu use_queue=True, logger-ul doar pune înregistrările într-o coadă, iar
+    un QueueListener le scrie pe un thread separat, deci I/O-ul de log nu
+    mai blochează bucla de parsare. Listener-ul e oprit la ieșire (atexit)
+    sau explicit cu shutdown_logging().
+    """
+    global _listener
     os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    shutdown_logging()
 
     logger = logging.getLogger("people_app")
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
@@ -135,46 +916,115 @@ def setup_logging(log_path: str, level: str = "INFO") -> logging.Logger:
     fh = logging.FileHandler(log_path, encoding="utf-8")
     fh.setLevel(getattr(logging, level.upper(), logging.INFO))
     fh.setFormatter(fmt)
-    logger.addHandler(fh)
 
     # Log și în consolă (util la dev)
     ch = logging.StreamHandler()
     ch.setLevel(getattr(logging, level.upper(), logging.INFO))
     ch.setFormatter(fmt)
-    logger.addHandler(ch)
+
+    if use_queue:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        _listener = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+        _listener.start()
+    else:
+        logger.addHandler(fh)
+        logger.addHandler(ch)
 
     return logger
 
+
+def shutdown_logging() -> None:
+    """
+    Oprește listener-ul asincron (golește coada) și închide handlerele lui.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
+
 # ---------- CLI ----------
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="CSV -> JSON report (OOP + logging)")
     parser.add_argument("--input", required=True, help="Calea către fișierul CSV de input")
     parser.add_argument("--output", required=True, help="Calea către fișierul JSON de output")
     parser.add_argument("--log", required=True, help="Calea către fișierul de log")
+    parser.add_argument("--mode", default="auto", choices=["auto", "list", "stream"], help="list: încarcă tot fișierul în memorie; stream: agregă rând cu rând și recitește CSV-ul la scrierea raportului; auto: stream pentru fișiere peste --stream-threshold-mb (default: auto)")
+    parser.add_argument("--stream-threshold-mb", type=float, default=100.0, help="Pragul (MB) peste care modul auto trece pe stream (default: 100)")
+    parser.add_argument("--format", default="json", choices=["json", "ndjson"], help="Formatul raportului (default: json)")
+    parser.add_argument("--gzip", action="store_true", help="Comprimă raportul cu gzip (implicit pentru output .gz)")
+    parser.add_argument("--state", help="Fișier de stare pentru rulări incrementale: se agregă doar rândurile noi din CSV, iar raportul conține doar statisticile")
+    parser.add_argument("--workers", type=int, default=1, help="Numărul de procese pentru parsarea CSV (default: 1, fără paralelism)")
+    parser.add_argument("--async-log", action="store_true", help="Scrie logurile pe un thread separat (QueueHandler/QueueListener)")
+    parser.add_argument("--invalid-sample", type=int, default=20, help="Câte rânduri invalide se loghează individual pentru fiecare tip de eroare; restul sunt doar numărate (0 = niciunul, -1 = toate; default: 20)")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Nivelul de logare (default: INFO)")
     return parser.parse_args()
 
 
+def choose_mode(mode: str, path: str, threshold_mb: float) -> str:
+    """
+    Rezolvă modul "auto" după mărimea fișierului de input.
+    """
+    if mode != "auto":
+        return mode
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return "list"  # eroarea va fi logată la citire
+    return "stream" if size > threshold_mb * 1024 * 1024 else "list"
+
+
 def main() -> int:
     args = parse_args()
-    logger = setup_logging(args.log, args.log_level)
+    logger = setup_logging(args.log, args.log_level, use_queue=args.async_log)
 
     logger.info("Pornire aplicație. input=%s output=%s log=%s log_level=%s", args.input, args.output, args.log, args.log_level)
 
-    processor = PeopleProcessor(logger)
-    people = processor.read_csv(args.input)
-    if not people:
-        logger.warning("Nu există persoane valide. Ieșire.")
-        return 1
+    processor = PeopleProcessor(logger, invalid_sample=None if args.invalid_sample < 0 else args.invalid_sample)
+    mode = choose_mode(args.mode, args.input, args.stream_threshold_mb)
+    if args.state:
+        acc = processor.update_incremental(args.input, args.state)
+        if not acc or not acc.total:
+            logger.warning("Nu există persoane valide. Ieșire.")
+            return 1
+        stats = processor.stats_from_accumulator(acc)
+        people = None
+    elif args.workers > 1:
+        people, acc = processor.read_csv_parallel(args.input, args.workers, keep_people=(mode == "list"))
+        if not acc.total:
+            logger.warning("Nu există persoane valide. Ieșire.")
+            return 1
+        stats = processor.stats_from_accumulator(acc)
+    elif mode == "stream":
+        logger.info("Mod stream: statisticile sunt agregate rând cu rând")
+        stats = processor.compute_stats_stream(processor.iter_people(args.input))
+        if not stats["numar_total_persoane"]:
+            logger.warning("Nu există persoane valide. Ieșire.")
+            return 1
+    else:
+        people = processor.read_table(args.input)
+        if not people:
+            logger.warning("Nu există persoane valide. Ieșire.")
+            return 1
+
+        stats = processor.stats_from_accumulator(people.stats())
 
-    stats = processor.compute_stats(people)
+    if mode == "stream" and not args.state:
+        # A doua trecere prin CSV: persoanele merg direct în fișier
+        people = processor.iter_people(args.input, log_invalid=False)
 
     # Afișează un rezumat în consolă (nu tot JSON-ul)
     print("Numar total persoane:", stats["numar_total_persoane"])
     print("Varsta medie:", stats["varsta_medie"])
     print("Persoane pe orase:", stats["numar_persoane_pe_orase"])
 
-    ok = processor.write_json(args.output, stats)
+    ok = processor.write_report_stream(args.output, stats, people, fmt=args.format, use_gzip=args.gzip)
     return 0 if ok else 2
 
 
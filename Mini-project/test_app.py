@@ -0,0 +1,382 @@
+import os
+import io
+import gzip
+import json
+import logging
+import tempfile
+import random
+import unittest
+from unittest.mock import patch
+
+import app
+from app import (
+    Person, PeopleProcessor, PeopleTable, StatsAccumulator, InvalidRowReport, IncrementalState,
+    _write_json, choose_mode, parse_chunk, setup_logging, shutdown_logging, split_csv,
+)
+
+ROWS = [
+    "name,city,age",
+    "Ana,Cluj,30",
+    "Bogdan,,41",           # city lipsă
+    "Cris,Iasi,abc",        # age invalid
+    "Dan,Cluj,25",
+    "Elena,Brasov,140",     # age în afara intervalului
+    "Filip,Iasi,33",
+    ",Cluj,20",             # name lipsă
+    "Gina,Brasov,19",
+    "Horia,Cluj,52",
+]
+
+
+def quiet_logger() -> logging.Logger:
+    logger = logging.getLogger("people_app.test")
+    logger.handlers[:] = [logging.NullHandler()]
+    logger.propagate = False
+    return logger
+
+
+class CsvTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.processor = PeopleProcessor(quiet_logger(), invalid_sample=None)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_csv(self, lines, name="people.csv", trailing_newline=True):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write("\n".join(lines) + ("\n" if trailing_newline else ""))
+        return path
+
+
+class TestStreaming(CsvTestCase):
+    def test_iter_people_is_lazy_and_matches_read_csv(self):
+        """Test that iter_people yields the same people as read_csv, one at a time"""
+        path = self.write_csv(ROWS)
+        people = self.processor.iter_people(path)
+        self.assertEqual(next(people), Person("ana", "Cluj", 30))
+        self.assertEqual([Person("ana", "Cluj", 30)] + list(people), self.processor.read_csv(path))
+
+    def test_compute_stats_stream_matches_compute_stats(self):
+        """Test that streaming statistics equal the list-based ones without the people list"""
+        path = self.write_csv(ROWS)
+        streamed = self.processor.compute_stats_stream(self.processor.iter_people(path))
+        listed = self.processor.compute_stats(self.processor.read_csv(path))
+        self.assertEqual(len(listed.pop("people")), 5)
+        self.assertEqual(streamed, listed)
+
+    def test_missing_columns_and_file_yield_nothing(self):
+        """Test that a bad header or a missing file ends the stream with an error log"""
+        path = self.write_csv(["name,age", "a,1"])
+        with self.assertLogs(self.processor.logger, level="ERROR"):
+            self.assertEqual(list(self.processor.iter_people(path)), [])
+        with self.assertLogs(self.processor.logger, level="ERROR"):
+            self.assertEqual(list(self.processor.iter_people(path + ".lipsa")), [])
+
+    def test_choose_mode(self):
+        """Test that auto picks stream above the size threshold"""
+        path = self.write_csv(ROWS)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        self.assertEqual(choose_mode("auto", path, size_mb * 2), "list")
+        self.assertEqual(choose_mode("auto", path, size_mb / 2), "stream")
+        self.assertEqual(choose_mode("list", path, 0), "list")
+        self.assertEqual(choose_mode("auto", path + ".lipsa", 0), "list")
+
+class TestParallelSplit(CsvTestCase):
+    def chunked_read(self, path, parts):
+        fieldnames, ranges = split_csv(path, parts)
+        report = InvalidRowReport(None, None)
+        people = []
+        line_offset = 1  # header
+        for start, end in ranges:
+            chunk = parse_chunk(path, start, end, fieldnames, True, None)
+            report.merge(chunk.invalid, line_offset)
+            line_offset += chunk.lines
+            people.extend(chunk.people)
+        return ranges, people, report
+
+    def test_ranges_cover_data_on_line_boundaries(self):
+        """Test that the byte ranges are contiguous and start at line starts"""
+        path = self.write_csv(ROWS)
+        with open(path, "rb") as f:
+            data = f.read()
+        for parts in (1, 2, 3, 4, 20):
+            _, ranges = split_csv(path, parts)
+            self.assertEqual(ranges[0][0], len(ROWS[0]) + 1)
+            self.assertEqual(ranges[-1][1], len(data))
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+                self.assertEqual(data[start - 1:start], b"\n")
+
+    def test_chunk_line_numbers_match_single_process(self):
+        """Test that invalid-row line numbers remapped across chunks match a one-chunk read"""
+        path = self.write_csv(ROWS)
+        _, single_people, single = self.chunked_read(path, 1)
+        self.assertEqual([line for line, _, _ in single.samples], [3, 4, 6, 8])
+        for parts in (2, 3, 4, 9):
+            ranges, people, report = self.chunked_read(path, parts)
+            self.assertGreater(len(ranges), 1)
+            self.assertEqual(report.samples, single.samples)
+            self.assertEqual(dict(report.counts), dict(single.counts))
+            self.assertEqual(people, single_people)
+        self.assertEqual(single_people, self.processor.read_csv(path))
+
+    def test_read_csv_parallel_matches_sequential(self):
+        """Test that the process pool returns the people and stats of a sequential read"""
+        path = self.write_csv(ROWS)
+        people, acc = self.processor.read_csv_parallel(path, 3)
+        self.assertEqual(people, self.processor.read_csv(path))
+        self.assertEqual(acc.result(), self.processor.compute_stats_stream(people))
+
+
+class TestReportWriter(CsvTestCase):
+    PEOPLE = [
+        Person("ana", "Cluj-Napoca", 30),
+        Person('o"brien \\ ţepeş', "Târgu Mureş", 0),
+        Person("line\nbreak\t", "Iasi", 130),
+    ]
+    STATS = {"numar_total_persoane": 3, "varsta_medie": 53.33, "numar_persoane_pe_orase": {"Cluj-Napoca": 1, "Iaşi": 2}}
+
+    def expected(self, people):
+        data = dict(self.STATS)
+        if people is not None:
+            data["people"] = [{"name": p.name, "city": p.city, "age": p.age} for p in people]
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def test_write_json_matches_json_dump(self):
+        """Test that the streaming writer emits exactly json.dump(indent=2, ensure_ascii=False)"""
+        for people in (self.PEOPLE, self.PEOPLE[:1], [], None):
+            f = io.StringIO()
+            _write_json(f, self.STATS, people)
+            self.assertEqual(f.getvalue(), self.expected(people))
+
+    def test_write_report_stream_formats(self):
+        """Test JSON, gzip and NDJSON reports written from an iterator"""
+        path = os.path.join(self.tmpdir.name, "report.json")
+        self.assertTrue(self.processor.write_report_stream(path, self.STATS, iter(self.PEOPLE)))
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), self.expected(self.PEOPLE))
+
+        gz = os.path.join(self.tmpdir.name, "report.json.gz")
+        self.assertTrue(self.processor.write_report_stream(gz, self.STATS, iter(self.PEOPLE)))
+        with gzip.open(gz, "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), self.expected(self.PEOPLE))
+
+        nd = os.path.join(self.tmpdir.name, "report.ndjson")
+        self.assertTrue(self.processor.write_report_stream(nd, self.STATS, iter(self.PEOPLE), fmt="ndjson"))
+        with open(nd, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[0], self.STATS)
+        self.assertEqual([Person(**d) for d in lines[1:]], self.PEOPLE)
+
+
+class TestStatsAccumulator(unittest.TestCase):
+    PEOPLE = [Person(f"p{i}", ("Cluj", "Iasi", "Brasov")[i % 3], (i * 37) % 131) for i in range(200)]
+
+    def accumulate(self, people):
+        acc = StatsAccumulator()
+        for p in people:
+            acc.add(p)
+        return acc
+
+    def test_merge_equals_single_pass(self):
+        """Test that merging per-chunk accumulators gives the single-pass result"""
+        whole = self.accumulate(self.PEOPLE)
+        for cut in (0, 1, 77, 199, 200):
+            merged = self.accumulate(self.PEOPLE[:cut])
+            merged.merge(self.accumulate(self.PEOPLE[cut:]))
+            self.assertEqual(merged.result(), whole.result())
+
+    def test_median_min_max(self):
+        """Test the histogram-based median, min and max"""
+        result = self.accumulate([Person("a", "X", age) for age in (40, 10, 30, 20)]).result()
+        self.assertEqual((result["varsta_minima"], result["varsta_maxima"], result["varsta_mediana"]), (10, 40, 25))
+        self.assertEqual(self.accumulate([Person("a", "X", 7)]).median_age(), 7)
+        self.assertEqual(StatsAccumulator().result()["varsta_mediana"], 0)
+
+    def test_to_dict_round_trip(self):
+        """Test that to_dict/from_dict survives JSON and keeps merging"""
+        acc = self.accumulate(self.PEOPLE[:120])
+        restored = StatsAccumulator.from_dict(json.loads(json.dumps(acc.to_dict())))
+        self.assertEqual(restored.result(), acc.result())
+        restored.merge(self.accumulate(self.PEOPLE[120:]))
+        self.assertEqual(restored.result(), self.accumulate(self.PEOPLE).result())
+
+
+class TestIncremental(CsvTestCase):
+    def setUp(self):
+        super().setUp()
+        self.state = os.path.join(self.tmpdir.name, "state", "people.json")
+
+    def append(self, path, text):
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            f.write(text)
+
+    def test_only_new_rows_are_parsed(self):
+        """Test that appended rows are added to the saved state"""
+        path = self.write_csv(ROWS)
+        first = self.processor.update_incremental(path, self.state)
+        self.assertEqual(first.total, 5)
+        self.append(path, "Ion,Iasi,40\nMara,Cluj,22\n")
+        second = self.processor.update_incremental(path, self.state)
+        self.assertEqual(second.result(), self.processor.compute_stats_stream(self.processor.iter_people(path)))
+        self.assertEqual(IncrementalState.load(self.state).lines, len(ROWS) + 2)
+
+    def test_unterminated_last_line_is_counted_once(self):
+        """Test that a last line without newline is reported but parsed again once completed"""
+        path = self.write_csv(["name,city,age", "a,x,1", "b,y,2"], trailing_newline=False)
+        self.assertEqual(self.processor.update_incremental(path, self.state).total, 2)
+        self.assertEqual(self.processor.update_incremental(path, self.state).total, 2)
+        self.append(path, "0\nc,z,3\n")
+        acc = self.processor.update_incremental(path, self.state)
+        self.assertEqual((acc.total, acc.age_sum), (3, 24))
+
+    def test_mismatched_state_restarts(self):
+        """Test that a truncated file or another header discards the saved state"""
+        path = self.write_csv(ROWS)
+        self.processor.update_incremental(path, self.state)
+        path = self.write_csv(ROWS[:3])
+        self.assertEqual(self.processor.update_incremental(path, self.state).total, 1)
+
+    def test_regenerated_file_restarts(self):
+        """Test that a rewritten export with the same header is not taken as appended rows"""
+        path = self.write_csv(["name,city,age", "Ana,Cluj,30", "Ion,Iasi,40"])
+        self.processor.update_incremental(path, self.state)
+        # same size, other content
+        path = self.write_csv(["name,city,age", "Eva,Arad,31", "Dan,Alba,41"])
+        acc = self.processor.update_incremental(path, self.state)
+        self.assertEqual((acc.total, dict(acc.cities)), (2, {"Arad": 1, "Alba": 1}))
+        # larger than before, but not an append
+        path = self.write_csv(["name,city,age", "Ion,Iasi,50", "Mara,Cluj,22", "Alex,Cluj,23"])
+        acc = self.processor.update_incremental(path, self.state)
+        self.assertEqual((acc.total, acc.age_sum), (3, 95))
+
+    def test_state_without_fingerprint_restarts(self):
+        """Test that a state saved without identity or fingerprint is recomputed"""
+        path = self.write_csv(ROWS)
+        self.processor.update_incremental(path, self.state)
+        with open(self.state, encoding="utf-8") as f:
+            data = json.load(f)
+        del data["identity"], data["fingerprint"]
+        with open(self.state, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        self.assertEqual(self.processor.update_incremental(path, self.state).total, 5)
+
+
+class TestInvalidRowReport(unittest.TestCase):
+    def test_sampling_per_kind(self):
+        """Test that only `sample` rows per error kind are kept while all are counted"""
+        report = InvalidRowReport(None, sample=2)
+        for line in range(10):
+            report.record(line, f"age invalid: {line!r}", {})
+        report.record(11, "name lipsă", {})
+        self.assertEqual(dict(report.counts), {"age invalid": 10, "name lipsă": 1})
+        self.assertEqual([line for line, _, _ in report.samples], [0, 1, 11])
+        self.assertEqual(report.total, 11)
+
+    def test_merge_offsets_lines_and_logs(self):
+        """Test that merged worker samples are logged with absolute line numbers"""
+        worker = InvalidRowReport(None, sample=None)
+        worker.record(2, "city lipsă", {"name": "a"})
+        worker.record(5, "city lipsă", {"name": "b"})
+        logger = quiet_logger()
+        parent = InvalidRowReport(logger, sample=1)
+        with self.assertLogs(logger, level="WARNING") as logs:
+            parent.merge(worker, line_offset=100)
+            parent.log_summary()
+        self.assertIn("linia 102", logs.output[0])
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("1 nelogate individual", logs.output[1])
+
+
+class TestQueueLogging(unittest.TestCase):
+    def test_queue_listener_writes_to_file(self):
+        """Test that records sent through the queue reach the log file by shutdown"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "logs", "app.log")
+            logger = setup_logging(path, use_queue=True)
+            try:
+                for i in range(50):
+                    logger.info("mesaj %d", i)
+            finally:
+                shutdown_logging()
+                for handler in logger.handlers:
+                    handler.close()
+                logger.handlers.clear()
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 50)
+            self.assertTrue(lines[-1].endswith("| INFO | mesaj 49"))
+
+
+class PeopleTableTests:
+    """
+    Comparații PeopleTable vs. listă de Person; rulate o dată cu NumPy
+    (dacă e instalat) și o dată pe calea fără NumPy.
+    """
+
+    def setUp(self):
+        rnd = random.Random(7)
+        cities = ["Cluj", "Iaşi", "Braşov", "Timişoara", "Constanţa"]
+        self.people = [
+            Person(f"nume{i}ă", rnd.choice(cities[1:]) if i else cities[0], rnd.randrange(131))
+            for i in range(2000)
+        ]
+        self.table = PeopleTable.from_people(self.people)
+        self.processor = PeopleProcessor(quiet_logger())
+
+    def accumulate(self, people):
+        acc = StatsAccumulator()
+        for p in people:
+            acc.add(p)
+        return acc
+
+    def test_round_trip(self):
+        """Test that the table gives back the same people"""
+        self.assertEqual(len(self.table), len(self.people))
+        self.assertEqual(list(self.table), self.people)
+        self.assertEqual(self.table[1234], self.people[1234])
+
+    def test_stats_match_list(self):
+        """Test that column statistics equal row-by-row accumulation, city order included"""
+        expected = self.accumulate(self.people).result()
+        result = self.table.stats().result()
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result["numar_persoane_pe_orase"]), list(expected["numar_persoane_pe_orase"]))
+        self.assertEqual(self.processor.compute_stats(self.table), self.processor.compute_stats(self.people))
+        self.assertEqual(PeopleTable().stats().result(), StatsAccumulator().result())
+
+    def test_filter_matches_list(self):
+        """Test filters by city and age bounds, and stats on the filtered table"""
+        cases = [
+            ({"city": "Iaşi"}, lambda p: p.city == "Iaşi"),
+            ({"min_age": 18, "max_age": 65}, lambda p: 18 <= p.age <= 65),
+            ({"city": "Braşov", "min_age": 100}, lambda p: p.city == "Braşov" and p.age >= 100),
+            ({"max_age": 0}, lambda p: p.age <= 0),
+            ({}, lambda p: True),
+        ]
+        for kwargs, keep in cases:
+            expected = [p for p in self.people if keep(p)]
+            filtered = self.table.filter(**kwargs)
+            self.assertEqual(list(filtered), expected, kwargs)
+            self.assertEqual(filtered.stats().result(), self.accumulate(expected).result(), kwargs)
+        self.assertEqual(len(self.table.filter(city="Oradea")), 0)
+        self.assertEqual(len(PeopleTable().filter(min_age=1)), 0)
+
+
+@unittest.skipIf(app.np is None, "NumPy nu e instalat")
+class TestPeopleTableNumpy(PeopleTableTests, unittest.TestCase):
+    pass
+
+
+class TestPeopleTableNoNumpy(PeopleTableTests, unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(app, "np", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Synthetic, seeded data for the benchmarks: fleets, clients, rentals and
+people CSV files. The same seed always produces the same data.
+"""
+import csv
+import random
+from datetime import date, timedelta
+
+from vehicle_rental.models import Vehicle, Client, Rental, MaintenanceRecord
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+BRANDS = {
+    "Dacia": ["Logan", "Sandero", "Duster"],
+    "Toyota": ["Corolla", "Yaris", "Rav4"],
+    "Volkswagen": ["Golf", "Passat", "Polo"],
+    "Skoda": ["Octavia", "Fabia", "Superb"],
+    "Ford": ["Focus", "Fiesta", "Kuga"],
+}
+CITIES = ["Cluj", "Bucuresti", "Timisoara", "Iasi", "Arad", "Brasov", "Constanta", "Sibiu"]
+FIRST_NAMES = ["Ana", "Ion", "Maria", "George", "Elena", "Mihai", "Ioana", "Andrei", "Cristina", "Vlad"]
+LAST_NAMES = ["Popescu", "Ionescu", "Pop", "Radu", "Stan", "Dumitru", "Stoica", "Matei"]
+
+HISTORY_START = date(2020, 1, 1)
+HISTORY_DAYS = 4 * 365
+
+
+def parse_size(value):
+    """
+    Accept a preset name ("10k", "1m", ...) or a plain row count.
+    """
+    if value in SIZES:
+        return SIZES[value]
+    return int(value)
+
+
+def make_vehicles(n, seed=0):
+    rng = random.Random(seed)
+    brands = list(BRANDS)
+    for i in range(n):
+        brand = rng.choice(brands)
+        yield Vehicle(
+            license_plate=f"BN{i:08d}",
+            brand=brand,
+            model=rng.choice(BRANDS[brand]),
+            year=rng.randint(2010, 2024),
+            daily_rate=round(rng.uniform(20, 150), 2),
+        )
+
+
+def make_clients(n, seed=0):
+    rng = random.Random(seed + 1)
+    for i in range(n):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        yield Client(
+            first_name=first,
+            last_name=last,
+            email=f"{first}.{last}.{i}@example.com",
+            phone=f"07{rng.randint(0, 99999999):08d}",
+            license_number=f"DL{i:09d}",
+        )
+
+
+def make_rentals(n, vehicle_count, client_count, seed=0, open_ratio=0.05):
+    """
+    Completed rentals spread over four years, plus open rentals on the
+    first `open_ratio` share of vehicles (never more than one per vehicle).
+    Vehicle and client ids are assumed to be 1..count.
+    """
+    rng = random.Random(seed + 2)
+    open_count = min(int(n * open_ratio), vehicle_count)
+    for i in range(n):
+        client_id = rng.randint(1, client_count)
+        if i < open_count:
+            start = HISTORY_START + timedelta(days=HISTORY_DAYS + rng.randint(0, 30))
+            yield Rental(vehicle_id=i + 1, client_id=client_id, rental_date=start)
+            continue
+        start = HISTORY_START + timedelta(days=rng.randint(0, HISTORY_DAYS - 30))
+        yield Rental(
+            vehicle_id=rng.randint(1, vehicle_count),
+            client_id=client_id,
+            rental_date=start,
+            return_date=start + timedelta(days=rng.randint(1, 21)),
+            status="completed",
+        )
+
+
+def make_maintenance_records(n, vehicle_count, seed=0):
+    rng = random.Random(seed + 3)
+    for _ in range(n):
+        yield MaintenanceRecord(
+            vehicle_id=rng.randint(1, vehicle_count),
+            description=rng.choice(["Oil change", "Tyres", "Brakes", "Inspection"]),
+            cost=round(rng.uniform(50, 1500), 2),
+            maintenance_date=HISTORY_START + timedelta(days=rng.randint(0, HISTORY_DAYS)),
+            duration_days=rng.randint(1, 5),
+        )
+
+
+def write_people_csv(path, n, seed=0, invalid_ratio=0.01):
+    """
+    Write a people CSV (name,city,age) with about `invalid_ratio` bad rows.
+    """
+    rng = random.Random(seed + 4)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "city", "age"])
+        for i in range(n):
+            name = f"{rng.choice(FIRST_NAMES)} {i}"
+            city = rng.choice(CITIES)
+            age = str(rng.randint(0, 100))
+            if rng.random() < invalid_ratio:
+                age = rng.choice(["", "abc", "200"])
+            writer.writerow([name, city, age])
+    return path
@@ -0,0 +1,147 @@
+"""
+Timing, peak-memory and baseline comparison helpers shared by the suites.
+"""
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+
+class BenchmarkResult(dict):
+    """
+    One benchmark's measurements: rows, seconds, throughput (rows/s) and
+    either best/median of repeated runs or p50/p95 latency (ms), plus
+    optionally peak traced memory (MiB).
+    """
+
+
+# Timed samples per benchmark; run.py --repeat overrides it
+DEFAULT_REPEAT = 5
+# Shortest sample: fast functions are called in a loop until it is reached,
+# so millisecond benchmarks are not dominated by timer and scheduler noise
+MIN_SAMPLE_SECONDS = 0.1
+
+
+def _calls_per_sample(fn):
+    """
+    Like timeit.autorange: call counts 1, 2, 5, 10, ... until one batch
+    lasts MIN_SAMPLE_SECONDS. Returns (calls, seconds of that batch).
+    """
+    calls = 1
+    while True:
+        for factor in (1, 2, 5):
+            n = calls * factor
+            started = time.perf_counter()
+            for _ in range(n):
+                fn()
+            seconds = time.perf_counter() - started
+            if seconds >= MIN_SAMPLE_SECONDS:
+                return n, seconds
+        calls *= 10
+
+
+def measure(fn, rows, track_memory=False, repeat=None):
+    """
+    Time `fn()` over `repeat` samples (default DEFAULT_REPEAT), each one
+    calling it enough times to last at least MIN_SAMPLE_SECONDS.
+    `seconds` (per call) and `throughput` come from the fastest sample,
+    the one least disturbed by the rest of the machine, and
+    `median_seconds` shows the spread; a single short run is far too
+    noisy for a 10% regression check. Use repeat=1 for functions that
+    cannot run twice: they are called exactly once. With track_memory,
+    run it once more under tracemalloc (which slows it down) to get the
+    peak allocation.
+    """
+    repeat = max(repeat or DEFAULT_REPEAT, 1)
+    gc.collect()
+    if repeat == 1:
+        started = time.perf_counter()
+        fn()
+        calls, samples = 1, [time.perf_counter() - started]
+    else:
+        calls, first = _calls_per_sample(fn)
+        samples = [first / calls]
+        for _ in range(repeat - 1):
+            gc.collect()
+            started = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            samples.append((time.perf_counter() - started) / calls)
+    best = min(samples)
+    result = BenchmarkResult(
+        rows=rows,
+        seconds=round(best, 6),
+        median_seconds=round(statistics.median(samples), 6),
+        samples=len(samples),
+        calls_per_sample=calls,
+        throughput=round(rows / best, 1) if best else None,
+    )
+
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_mb"] = round(peak / (1024 * 1024), 2)
+    return result
+
+
+def measure_latency(fn, calls):
+    """
+    Call `fn(i)` for i in range(calls) and report per-call latency percentiles.
+    """
+    samples = []
+    for i in range(calls):
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+    total = sum(samples)
+    quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return BenchmarkResult(
+        rows=calls,
+        seconds=round(total, 4),
+        throughput=round(calls / total, 1) if total else None,
+        p50_ms=round(quantiles[49] * 1000, 4),
+        p95_ms=round(quantiles[94] * 1000, 4),
+    )
+
+
+def metadata(size):
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": size,
+    }
+
+
+def save_results(path, meta, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def compare(results, baseline_path, threshold=0.10):
+    """
+    Compare throughput (fastest sample) against a stored results file. A
+    benchmark regresses when its throughput drops by more than `threshold`
+    (0.10 = 10%).
+    Returns a list of (name, baseline, current, change) for regressions.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("throughput") or not current.get("throughput"):
+            continue
+        change = current["throughput"] / previous["throughput"] - 1
+        if change < -threshold:
+            regressions.append((name, previous["throughput"], current["throughput"], change))
+    return regressions
@@ -0,0 +1,52 @@
+"""
+Benchmarks for the people report pipeline in Mini-project/app.py:
+CSV parse, statistics and report writing.
+"""
+import logging
+import os
+import tempfile
+
+from app import PeopleProcessor
+
+from generators import write_people_csv
+from harness import measure
+
+
+def run(rows, track_memory=False, seed=0):
+    results = {}
+    logger = logging.getLogger("people_app.bench")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    processor = PeopleProcessor(logger)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = write_people_csv(os.path.join(tmpdir, "people.csv"), rows, seed)
+
+        results["people.csv_parse"] = measure(lambda: processor.read_csv(csv_path), rows, track_memory)
+        results["people.csv_parse_stream"] = measure(
+            lambda: processor.compute_stats_stream(processor.iter_people(csv_path)), rows, track_memory
+        )
+        workers = min(os.cpu_count() or 1, 4)
+        if workers > 1:
+            results["people.csv_parse_parallel"] = measure(
+                lambda: processor.read_csv_parallel(csv_path, workers, keep_people=False), rows
+            )
+
+        results["people.csv_parse_table"] = measure(lambda: processor.read_table(csv_path), rows, track_memory)
+
+        people = processor.read_csv(csv_path)
+        results["people.stats"] = measure(lambda: processor.compute_stats_stream(people), len(people), track_memory)
+        table = processor.read_table(csv_path)
+        results["people.stats_table"] = measure(lambda: table.stats().result(), len(table), track_memory)
+        results["people.filter_table"] = measure(lambda: table.filter(min_age=18, max_age=65), len(table), track_memory)
+
+        stats = processor.compute_stats_stream(people)
+        json_path = os.path.join(tmpdir, "report.json")
+        results["people.json_write"] = measure(
+            lambda: processor.write_report_stream(json_path, stats, people), len(people), track_memory
+        )
+        results["people.json_write_legacy"] = measure(
+            lambda: processor.write_json(json_path, processor.compute_stats(people)), len(people), track_memory
+        )
+
+    return results
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the vehicle rental backend, its CLI start-up time and
+the people report pipeline.
+
+    python benchmarks/run.py --size 10k --output results.json
+    python benchmarks/run.py --size 1m --baseline results.json --memory
+
+Results (throughput, latency, peak memory) are written as JSON; with
+--baseline the run is compared against a previous results file and the
+exit code is 1 when any benchmark regressed beyond --threshold.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "vehicle-rental", "backend", "src"))
+sys.path.insert(0, os.path.join(ROOT, "Mini-project"))
+
+from generators import parse_size  # noqa: E402
+import harness  # noqa: E402
+from harness import metadata, save_results, compare  # noqa: E402
+
+SUITES = ("vehicle", "people", "startup")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks")
+    parser.add_argument("--size", default="10k", help="Rows per dataset: 10k, 100k, 1m, 10m or a number (default: 10k)")
+    parser.add_argument("--suite", choices=("all",) + SUITES, default="all", help="Which suite to run (default: all)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed throughput drop before flagging (default: 0.10)")
+    parser.add_argument("--memory", action="store_true", help="Also measure peak memory (one extra run per benchmark)")
+    parser.add_argument("--repeat", type=int, default=harness.DEFAULT_REPEAT,
+                        help=f"Timed samples per benchmark; the fastest is compared (default: {harness.DEFAULT_REPEAT})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data (default: 0)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rows = parse_size(args.size)
+    suites = SUITES if args.suite == "all" else (args.suite,)
+    harness.DEFAULT_REPEAT = args.repeat
+
+    results = {}
+    if "vehicle" in suites:
+        import vehicle_rental_bench
+        results.update(vehicle_rental_bench.run(rows, args.memory, args.seed))
+    if "people" in suites:
+        import people_bench
+        results.update(people_bench.run(rows, args.memory, args.seed))
+    if "startup" in suites:
+        import startup_bench
+        results.update(startup_bench.run(rows, args.memory, args.seed))
+
+    for name, r in results.items():
+        extra = "".join(f" {k}={r[k]}" for k in ("median_seconds", "p50_ms", "p95_ms", "vs_pre_series", "peak_mb") if k in r)
+        print(f"{name:32} {r['seconds']:>10.6f}s {r['throughput'] or 0:>14,.1f}/s{extra}")
+
+    save_results(args.output, metadata(args.size), results)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:,.1f}/s -> {after:,.1f}/s ({change:+.1%})")
+        if regressions:
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
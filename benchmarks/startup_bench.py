@@ -0,0 +1,89 @@
+"""
+Start-up benchmarks for the vehicle rental CLI: fresh interpreter import
+of vehicle_rental.main and a full `python -m vehicle_rental.main` against
+a database whose schema is already current (the common case for short-lived
+CLI calls and worker processes). Bytecode is cached in a scratch directory,
+as it is for an installed package, so the numbers are not dominated by
+compiling sources (`python -m` still compiles vehicle_rental/main.py itself).
+
+Both are also run against the tree as it was before the start-up work
+(PRE_SERIES_REV, exported with `git archive`), so the numbers are compared
+with the original CLI rather than with an intermediate commit.
+"""
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+from harness import measure_latency
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, "vehicle-rental", "backend", "src")
+SRC_PATH = "vehicle-rental/backend/src"
+
+STARTUP_CALLS = 20
+# Last commit before the connection pool, migrations and lazy imports landed
+PRE_SERIES_REV = os.environ.get("VEHICLE_RENTAL_STARTUP_BASELINE_REV", "2fa4c9b")
+
+
+def _runner(args, env):
+    def run(_):
+        subprocess.run([sys.executable, *args], env=env, check=True, stdout=subprocess.DEVNULL)
+    return run
+
+
+def _export_pre_series(directory):
+    """
+    Extract the backend sources at PRE_SERIES_REV into `directory`.
+    Returns the src path, or None when git or the revision is unavailable.
+    """
+    try:
+        archive = subprocess.run(
+            ["git", "-C", ROOT, "archive", "--format=tar", PRE_SERIES_REV, SRC_PATH],
+            check=True, capture_output=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+    return os.path.join(directory, SRC_PATH)
+
+
+def _measure(src_dir, scratch, prefix, results):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPYCACHEPREFIX"] = os.path.join(scratch, "pycache")
+    env["PYTHONPATH"] = src_dir + os.pathsep + env.get("PYTHONPATH", "")
+    # Ignored by the pre-series tree, which keeps its database in its own data dir
+    env["VEHICLE_RENTAL_DB_PATH"] = os.path.join(scratch, "startup.db")
+
+    # The first run compiles the bytecode and creates the schema; the
+    # measured runs find both current
+    _runner(["-m", "vehicle_rental.main"], env)(0)
+    results[f"{prefix}.import_main"] = measure_latency(
+        _runner(["-c", "import vehicle_rental.main"], env), STARTUP_CALLS
+    )
+    results[f"{prefix}.cli_init_current_schema"] = measure_latency(
+        _runner(["-m", "vehicle_rental.main"], env), STARTUP_CALLS
+    )
+    return env
+
+
+def run(rows, track_memory=False, seed=0):
+    # Start-up cost does not depend on the dataset size; rows/memory/seed are unused
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = _measure(SRC_DIR, os.path.join(tmpdir, "current"), "startup", results)
+        results["startup.python_baseline"] = measure_latency(_runner(["-c", "pass"], env), STARTUP_CALLS)
+
+        pre_series = _export_pre_series(os.path.join(tmpdir, "pre_series", "tree"))
+        if pre_series is None:
+            print(f"startup: revision {PRE_SERIES_REV} not available, skipping the pre-series comparison")
+            return results
+        _measure(pre_series, os.path.join(tmpdir, "pre_series"), "startup.pre_series", results)
+        for name in ("import_main", "cli_init_current_schema"):
+            current, before = results[f"startup.{name}"], results[f"startup.pre_series.{name}"]
+            current["vs_pre_series"] = round(current["p50_ms"] / before["p50_ms"], 3)
+    return results
@@ -0,0 +1,90 @@
+"""
+Benchmarks for the vehicle rental backend: model construction, bulk load
+into SQLite and the common lookups.
+"""
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+from vehicle_rental.db import connection
+from vehicle_rental.repositories import (
+    VehicleRepository, ClientRepository, RentalRepository, MaintenanceRecordRepository
+)
+from vehicle_rental.services import AvailabilityService
+
+from generators import make_vehicles, make_clients, make_rentals, make_maintenance_records
+from harness import measure, measure_latency
+
+QUERY_CALLS = 2000
+
+
+def run(rows, track_memory=False, seed=0):
+    results = {}
+    vehicle_count = rows
+    client_count = max(rows // 2, 1)
+    maintenance_count = max(rows // 5, 1)
+
+    results["vehicle.model_construction"] = measure(
+        lambda: sum(1 for _ in make_vehicles(vehicle_count, seed)), vehicle_count, track_memory
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "bench.db")
+        connection.configure_pool(db_path=db_path, size=4)
+        connection.initialize_database()
+
+        def load():
+            with connection.get_db_connection() as conn:
+                VehicleRepository(conn).bulk_insert(make_vehicles(vehicle_count, seed))
+                ClientRepository(conn).bulk_insert(make_clients(client_count, seed))
+                RentalRepository(conn).bulk_insert(make_rentals(rows, vehicle_count, client_count, seed))
+                MaintenanceRecordRepository(conn).bulk_insert(
+                    make_maintenance_records(maintenance_count, vehicle_count, seed)
+                )
+
+        total_rows = vehicle_count + client_count + rows + maintenance_count
+        # Loaded once: a second run would hit the unique constraints
+        results["vehicle.db_bulk_load"] = measure(load, total_rows, repeat=1)
+
+        rng = random.Random(seed)
+        plates = [f"BN{rng.randint(0, vehicle_count - 1):08d}" for _ in range(QUERY_CALLS)]
+        emails_ids = [rng.randint(1, client_count) for _ in range(QUERY_CALLS)]
+
+        with connection.get_db_connection() as conn:
+            vehicles = VehicleRepository(conn)
+            clients = ClientRepository(conn)
+            results["vehicle.query_by_plate"] = measure_latency(
+                lambda i: vehicles.get_by_license_plate(plates[i]), QUERY_CALLS
+            )
+            results["client.query_by_id"] = measure_latency(
+                lambda i: clients.get(emails_ids[i]), QUERY_CALLS
+            )
+            results["rental.query_by_client"] = measure_latency(
+                lambda i: conn.execute(
+                    "SELECT * FROM rental WHERE client_id = ? AND return_date IS NULL", (emails_ids[i],)
+                ).fetchall(),
+                QUERY_CALLS,
+            )
+
+        service = AvailabilityService()
+        results["availability.load"] = measure(service.load, rows + maintenance_count)
+
+        starts = [date(2020, 1, 1) + timedelta(days=rng.randint(0, 4 * 365)) for _ in range(QUERY_CALLS)]
+        vehicle_ids = [rng.randint(1, vehicle_count) for _ in range(QUERY_CALLS)]
+        results["availability.is_available"] = measure_latency(
+            lambda i: service.is_available(vehicle_ids[i], starts[i], starts[i] + timedelta(days=3)),
+            QUERY_CALLS,
+        )
+        results["availability.fleet_query"] = measure_latency(
+            lambda i: service.available_vehicles(starts[i], starts[i] + timedelta(days=3)),
+            min(QUERY_CALLS, 200),
+        )
+        service.use_index = False
+        results["availability.fleet_query_sql"] = measure_latency(
+            lambda i: service.available_vehicles(starts[i], starts[i] + timedelta(days=3)),
+            min(QUERY_CALLS, 20),
+        )
+        connection.close_pool()
+
+    return results
@@ -0,0 +1,84 @@
+"""
+Argument parsing and the import / export commands of the CLI. Kept out of
+main.py, which `python -m` compiles from source on every start-up.
+"""
+import sys
+
+from vehicle_rental.db.connection import initialize_database
+
+
+def _import_progress(result):
+    sys.stderr.write(
+        f"\r{result.table}: {result.rows:,} rows read, {result.imported:,} imported, "
+        f"{result.invalid:,} invalid ({result.rows_per_second:,.0f} rows/s)"
+    )
+    sys.stderr.flush()
+
+
+def _export_progress(written):
+    sys.stderr.write(f"\r{written:,} rows written")
+    sys.stderr.flush()
+
+
+def build_parser():
+    import argparse
+    from vehicle_rental.repositories.base import DEFAULT_CHUNK_SIZE, DEFAULT_PAGE_SIZE
+    from vehicle_rental.services.transfer import FORMATS, TABLES
+
+    parser = argparse.ArgumentParser(description="Vehicle Rental System")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("init", help="Create or migrate the database (default)")
+
+    p = commands.add_parser("import", help="Load rows from a CSV or NDJSON file")
+    p.add_argument("table", choices=sorted(TABLES))
+    p.add_argument("path")
+    p.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per transaction")
+    p.add_argument("--upsert", action="store_true", help="Update rows that already exist instead of failing")
+    p.add_argument("--no-defer-indexes", action="store_true", help="Keep secondary indexes during the load")
+    p.add_argument("--quiet", action="store_true", help="No progress output")
+
+    p = commands.add_parser("export", help="Write a table to a CSV or NDJSON file")
+    p.add_argument("table", choices=sorted(TABLES))
+    p.add_argument("path")
+    p.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+    p.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Rows fetched per query")
+    p.add_argument("--quiet", action="store_true", help="No progress output")
+    return parser
+
+
+def run_command(args):
+    """
+    Run a parsed import or export command. Returns the exit code.
+    """
+    from vehicle_rental.services.transfer import export_file, import_file
+
+    initialize_database()
+    if args.command == "import":
+        result = import_file(
+            args.table, args.path, args.format,
+            chunk_size=args.chunk_size, upsert=args.upsert,
+            defer_indexes=not args.no_defer_indexes,
+            progress=None if args.quiet else _import_progress,
+        )
+        if not args.quiet:
+            sys.stderr.write("\n")
+        print(f"Imported {result.imported:,} of {result.rows:,} {result.table} rows "
+              f"in {result.elapsed:.1f}s ({result.rows_per_second:,.0f} rows/s)")
+        if result.unparseable:
+            print(f"  unparseable: {result.unparseable:,}")
+        for code, count in result.errors.most_common():
+            print(f"  {code.lower()}: {count:,}")
+        for reason, count in result.rejected.most_common():
+            print(f"  rejected ({reason}): {count:,}")
+        return 0
+
+    written = export_file(
+        args.table, args.path, args.format, page_size=args.page_size,
+        progress=None if args.quiet else _export_progress,
+    )
+    if not args.quiet:
+        sys.stderr.write("\n")
+    print(f"Exported {written:,} {args.table} rows to {args.path}")
+    return 0
@@ -0,0 +1,262 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from ..repositories import (
+    VehicleRepository, ClientRepository, RentalRepository, MaintenanceRecordRepository
+)
+from ..repositories.base import DEFAULT_PAGE_SIZE
+from ..services.availability import AvailabilityService
+from ..services.rollups import RollupService
+from ..services.writer import RentalWriter
+from .connection import POOL_SIZE, POOL_TIMEOUT, build_pool
+from .paths import DB_PATH
+
+
+def _with_conn(fn, args, kwargs, conn):
+    return fn(conn, *args, **kwargs)
+
+
+class _Call:
+    """
+    Shared state between an awaiting task and the worker thread running
+    its query, so a cancelled task can interrupt the statement in flight.
+    """
+
+    def __init__(self):
+        self.conn = None
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def attach(self, conn):
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.conn = conn
+            return True
+
+    def detach(self):
+        with self._lock:
+            self.conn = None
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self.conn is not None:
+                self.conn.interrupt()
+
+
+class AsyncRepository:
+    """
+    Awaitable view of a repository class: every public method of the sync
+    repository is available as a coroutine with the same arguments, run
+    on one of the database worker threads with its own connection.
+    Streaming `iter_*` methods become async iterators (see AsyncDatabase.stream).
+    """
+
+    def __init__(self, db, repository_cls):
+        self._db = db
+        self._repository_cls = repository_cls
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not callable(getattr(self._repository_cls, name, None)):
+            raise AttributeError(name)
+
+        if name.startswith("iter_"):
+            return partial(self._db.stream, self._repository_cls, name)
+
+        async def method(*args, **kwargs):
+            return await self._db.run(
+                lambda conn: getattr(self._repository_cls(conn), name)(*args, **kwargs)
+            )
+
+        method.__name__ = name
+        return method
+
+
+class AsyncService:
+    """
+    Awaitable view of a service instance (availability, rollups): every
+    public method runs on a database worker thread. The service draws its
+    own connections from the AsyncDatabase pool, so a cancelled call is
+    left to finish rather than interrupted.
+    """
+
+    def __init__(self, db, service):
+        self._db = db
+        self.service = service
+
+    def __getattr__(self, name):
+        attr = getattr(self.service, name) if not name.startswith("_") else None
+        if not callable(attr):
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            return await self._db._offload(partial(attr, *args, **kwargs))
+
+        method.__name__ = name
+        return method
+
+
+class AsyncWriter:
+    """
+    Awaitable front end for a RentalWriter: each write is queued on the
+    writer thread and awaited without blocking the event loop.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    async def checkout(self, rental):
+        return await asyncio.wrap_future(self.writer.checkout(rental))
+
+    async def return_rental(self, rental_id, return_date, status='completed'):
+        return await asyncio.wrap_future(self.writer.return_rental(rental_id, return_date, status))
+
+    async def add_maintenance(self, record):
+        return await asyncio.wrap_future(self.writer.add_maintenance(record))
+
+
+class AsyncDatabase:
+    """
+    asyncio front end for the SQLite data layer.
+
+    Blocking sqlite3 calls run on a dedicated thread pool with its own
+    connection pool (one connection per worker thread), so the event loop
+    never waits on the database. At most `max_concurrency` operations are
+    in flight; further callers wait on a semaphore without tying up a
+    thread. Cancelling an awaiting task interrupts its running statement
+    and rolls back its uncommitted work; its slot is only freed once the
+    worker thread is done with the connection.
+
+    `availability`, `rollups` and `writer` wrap the services over the same
+    pool. The availability index is not loaded until `availability.load()`.
+    """
+
+    def __init__(self, db_path=DB_PATH, size=POOL_SIZE, max_concurrency=None, profile=None, timeout=POOL_TIMEOUT):
+        self.pool = build_pool(db_path, size, timeout, profile)
+        self.max_concurrency = max_concurrency or size
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="vehicle-rental-db")
+        self._semaphore = None
+        self.vehicles = AsyncRepository(self, VehicleRepository)
+        self.clients = AsyncRepository(self, ClientRepository)
+        self.rentals = AsyncRepository(self, RentalRepository)
+        self.maintenance_records = AsyncRepository(self, MaintenanceRecordRepository)
+        rollups = RollupService(self.pool.connection)
+        availability = AvailabilityService(self.pool.connection, rollups=rollups)
+        self.rollups = AsyncService(self, rollups)
+        self.availability = AsyncService(self, availability)
+        self.writer = AsyncWriter(RentalWriter(self.pool.connection, availability=availability, rollups=rollups))
+
+    def _get_semaphore(self):
+        # Created lazily so it binds to the running loop, not the constructor's
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _call(self, call, fn):
+        conn = self.pool.acquire()
+        try:
+            if not call.attach(conn):
+                raise asyncio.CancelledError()
+            try:
+                return fn(conn)
+            except sqlite3.OperationalError:
+                if call.cancelled:
+                    raise asyncio.CancelledError()
+                raise
+            finally:
+                call.detach()
+        finally:
+            self.pool.release(conn)
+
+    async def _offload(self, fn, on_cancel=None):
+        """
+        Run `fn()` on a worker thread under the concurrency semaphore. The
+        semaphore is released when the worker finishes, not when the caller
+        stops waiting, so cancelled calls still count against the limit.
+        """
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, fn)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda f: semaphore.release())
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if on_cancel is not None:
+                on_cancel()
+            # Nobody awaits the worker any more; retrieve its outcome so it is not logged
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run `fn(conn, *args, **kwargs)` on a worker thread and return its result.
+        Work not committed by `fn` is rolled back when the connection is released.
+        """
+        if args or kwargs:
+            fn = partial(_with_conn, fn, args, kwargs)
+        call = _Call()
+        return await self._offload(partial(self._call, call, fn), on_cancel=call.cancel)
+
+    async def stream(self, repository_cls, method, *args, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+        """
+        Async-iterate a keyset-paginated repository generator such as
+        iter_all(). Each page is one worker round trip; no connection is
+        held between pages because the generator only needs one per query.
+        """
+        repository = repository_cls(None)
+        items = None
+
+        def next_page(conn):
+            nonlocal items
+            repository.conn = conn
+            if items is None:
+                items = getattr(repository, method)(*args, page_size=page_size, **kwargs)
+            return list(islice(items, page_size))
+
+        while True:
+            page = await self.run(next_page)
+            for obj in page:
+                yield obj
+            if len(page) < page_size:
+                return
+
+    async def transaction(self, fn, *args, **kwargs):
+        """
+        Like run(), but commits if `fn` returns and rolls back if it raises.
+        """
+        def in_transaction(conn):
+            with conn:
+                return fn(conn, *args, **kwargs)
+
+        return await self.run(in_transaction)
+
+    async def execute(self, sql, params=()):
+        """
+        Run one statement and return all rows (committing if it wrote any).
+        """
+        def execute(conn):
+            with conn:
+                return conn.execute(sql, params).fetchall()
+
+        return await self.run(execute)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.writer.writer.close)
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
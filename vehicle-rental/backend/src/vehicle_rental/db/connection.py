@@ -1,33 +1,120 @@
-import sqlite3
 import os
+import threading
 from contextlib import contextmanager
-from .paths import DB_PATH, DATA_DIR
-from .schema import create_tables
+from .paths import DB_PATH
+
+# Default pool size, overridable per deployment
+POOL_SIZE = int(os.environ.get("VEHICLE_RENTAL_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.environ.get("VEHICLE_RENTAL_POOL_TIMEOUT", "30"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def checkpoint(conn, mode="PASSIVE"):
+    """
+    Run a WAL checkpoint on `conn`. Returns (busy, log_pages, checkpointed_pages).
+    PASSIVE never blocks readers or writers; TRUNCATE also resets the WAL file.
+    """
+    mode = mode.upper()
+    if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+        raise ValueError(f"Invalid checkpoint mode: {mode}")
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone())
+
+
+def _recorder_from_env():
+    # The instrumentation module is only imported when it is switched on
+    if os.environ.get("VEHICLE_RENTAL_QUERY_STATS", "").lower() in ("", "0", "false", "no"):
+        return None
+    from .instrumentation import recorder_from_env
+    return recorder_from_env()
+
+
+def build_pool(db_path=DB_PATH, size=POOL_SIZE, timeout=POOL_TIMEOUT, profile=None, recorder=None):
+    """
+    Build a standalone ConnectionPool configured like the shared one
+    (pragma profile, idle checkpoints, optional QueryRecorder). The caller
+    owns it and must close it; use configure_pool() to replace the shared pool.
+    """
+    # Imported on first use so `import vehicle_rental.main` stays cheap
+    from .pool import ConnectionPool
+    from .profiles import get_profile
+
+    if profile is None or isinstance(profile, str):
+        profile = get_profile(profile)
+    on_idle = checkpoint if profile.uses_wal and profile.checkpoint_interval else None
+    pool = ConnectionPool(
+        db_path, size=size, timeout=timeout, on_connect=profile.apply,
+        on_idle=on_idle, idle_interval=profile.checkpoint_interval or 0.0,
+        factory=recorder.connection_class if recorder is not None else None,
+    )
+    pool.profile = profile
+    pool.recorder = recorder
+    return pool
+
+
+def configure_pool(db_path=DB_PATH, size=POOL_SIZE, timeout=POOL_TIMEOUT, profile=None, recorder=None):
+    """
+    Replace the shared connection pool, closing the previous one.
+    `profile` is a PragmaProfile or a name from profiles.PROFILES
+    (defaults to VEHICLE_RENTAL_DB_PROFILE). A QueryRecorder given as
+    `recorder` sees every statement run on the pool. Returns the new pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = build_pool(db_path, size, timeout, profile, recorder)
+        return _pool
+
+
+def get_pool():
+    """
+    Return the shared connection pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = build_pool(DB_PATH, POOL_SIZE, POOL_TIMEOUT, None, _recorder_from_env())
+    return _pool
+
+
+def close_pool():
+    """
+    Close every idle pooled connection (e.g. at process shutdown).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
 
 @contextmanager
 def get_db_connection():
     """
-    Context manager for SQLite database connection.
-    Automatically commits or rolls back on exit.
+    Context manager for a pooled SQLite database connection.
+    Rolls back on error; uncommitted work is discarded when the
+    connection goes back to the pool.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")  # Enable foreign key constraints
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    try:
-        yield conn
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
+    with get_pool().connection() as conn:
+        try:
+            yield conn
+        except Exception as e:
+            conn.rollback()
+            raise e
 
 def initialize_database():
     """
-    Initialize the database with tables if they don't exist.
+    Create the database or bring its schema up to the latest migration.
+    A database already at the latest version costs one PRAGMA and one
+    lookup for indexes an interrupted bulk load left dropped, no DDL.
     """
+    from .migrations import LATEST_VERSION, current_version, migrate, restore_deferred_indexes
+
     with get_db_connection() as conn:
-        create_tables(conn)
-        print("Database initialized successfully.")
\ No newline at end of file
+        if current_version(conn) != LATEST_VERSION:
+            migrate(conn)
+        restore_deferred_indexes(conn)
+        print("Database initialized successfully.")
@@ -0,0 +1,309 @@
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .paths import LOGS_DIR, PACKAGE_DIR
+
+# Upper bounds (seconds) of the duration histogram buckets; the last bucket is open
+HISTOGRAM_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+SLOW_QUERY_LOG = os.path.join(LOGS_DIR, "slow_queries.log")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+def normalize_sql(sql):
+    """
+    Collapse a statement to its shape: literals become ?, IN lists become
+    (?...), whitespace is squeezed, so the same query with different values
+    aggregates together.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (?...)", sql)
+    return _SPACE.sub(" ", sql).strip().rstrip(";")
+
+
+def _caller():
+    """
+    First stack frame outside sqlite3 plumbing: 'module.py:line in function'.
+    """
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename in _SKIP_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{frame.f_lineno} in {code.co_name}"
+
+
+@dataclass
+class StatementStats:
+    sql: str
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS) + 1))
+    callers: dict = field(default_factory=dict)
+    sample: Optional[tuple] = None   # (raw sql, params) of the slowest call, for EXPLAIN
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def percentile(self, q):
+        """
+        Upper bound of the histogram bucket holding the q-th quantile (0-1).
+        """
+        target = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                return HISTOGRAM_BOUNDS[i] if i < len(HISTOGRAM_BOUNDS) else self.max_time
+        return 0.0
+
+    def as_dict(self):
+        return {
+            "sql": self.sql,
+            "calls": self.calls,
+            "total_ms": round(self.total_time * 1000, 3),
+            "mean_ms": round(self.mean_time * 1000, 3),
+            "max_ms": round(self.max_time * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "rows": self.rows,
+            "histogram": dict(zip([f"<={b * 1000:g}ms" for b in HISTOGRAM_BOUNDS] + ["slower"], self.buckets)),
+            "callers": dict(self.callers),
+        }
+
+
+class QueryRecorder:
+    """
+    Aggregates every statement run on instrumented connections.
+
+    Per normalized statement it keeps call count, total / max time, rows,
+    a latency histogram and the calling sites. Statements at or above
+    `slow_threshold` seconds are also written to the slow-query log
+    (backend/logs/slow_queries.log unless `slow_log_path` says otherwise).
+
+    Pass `recorder.connection_class` as the sqlite3 connection factory
+    (configure_pool(recorder=...) does this) to start recording.
+    """
+
+    def __init__(self, slow_threshold=0.1, slow_log_path=SLOW_QUERY_LOG, capture_caller=True):
+        self.slow_threshold = slow_threshold
+        self.slow_log_path = slow_log_path
+        self.capture_caller = capture_caller
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._slow_logger = None
+        self.connection_class = _connection_class(self)
+
+    # ---------- recording ----------
+    def record(self, sql, params, seconds, rows, caller=None):
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats(key)
+            stats.calls += 1
+            stats.total_time += seconds
+            stats.rows += max(rows, 0)
+            stats.buckets[bisect_left(HISTOGRAM_BOUNDS, seconds)] += 1
+            if seconds >= stats.max_time:
+                stats.max_time = seconds
+                stats.sample = (sql, params)
+            if caller is not None:
+                stats.callers[caller] = stats.callers.get(caller, 0) + 1
+        if self.slow_threshold is not None and seconds >= self.slow_threshold:
+            self._log_slow(key, seconds, rows, caller)
+
+    def _log_slow(self, sql, seconds, rows, caller):
+        if self._slow_logger is None:
+            logger = logging.getLogger(f"vehicle_rental.slow_query.{id(self)}")
+            logger.propagate = False
+            logger.setLevel(logging.WARNING)
+            if self.slow_log_path:
+                os.makedirs(os.path.dirname(self.slow_log_path), exist_ok=True)
+                handler = logging.FileHandler(self.slow_log_path, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                logger.addHandler(handler)
+            self._slow_logger = logger
+        self._slow_logger.warning("%.1fms rows=%d caller=%s sql=%s", seconds * 1000, rows, caller or "?", sql)
+
+    # ---------- reporting ----------
+    def stats(self):
+        with self._lock:
+            return list(self._stats.values())
+
+    def top(self, n=10, by="total_time"):
+        return sorted(self.stats(), key=lambda s: getattr(s, by), reverse=True)[:n]
+
+    def explain_top(self, conn, n=5, by="total_time"):
+        """
+        [(StatementStats, plan lines)] for the `n` most expensive statements,
+        using EXPLAIN QUERY PLAN on the slowest recorded call of each.
+        A 'SCAN table' line without an index usually means one is missing.
+        """
+        plans = []
+        for stats in self.top(len(self._stats), by):
+            if len(plans) >= n:
+                break
+            if stats.sample is None or stats.sample[1] is None or not stats.sql.upper().startswith(_EXPLAINABLE):
+                continue
+            sql, params = stats.sample
+            try:
+                rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            except sqlite3.Error as e:
+                plans.append((stats, [f"(could not explain: {e})"]))
+                continue
+            plans.append((stats, [row[-1] for row in rows]))
+        return plans
+
+    def report(self, n=10, by="total_time"):
+        lines = [f"{'calls':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>8} {'rows':>8}  statement"]
+        for s in self.top(n, by):
+            lines.append(
+                f"{s.calls:>7} {s.total_time * 1000:>10.1f} {s.mean_time * 1000:>9.3f} "
+                f"{s.percentile(0.95) * 1000:>8.3f} {s.rows:>8}  {s.sql[:120]}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def close(self):
+        if self._slow_logger is not None:
+            for handler in list(self._slow_logger.handlers):
+                self._slow_logger.removeHandler(handler)
+                handler.close()
+            self._slow_logger = None
+
+
+def _connection_class(recorder):
+    """
+    sqlite3.Connection subclass whose cursors report to `recorder`.
+    """
+
+    class InstrumentedCursor(sqlite3.Cursor):
+        _pending = None
+        _fetched = 0
+
+        def _finish(self):
+            pending = self._pending
+            if pending is not None:
+                self._pending = None
+                sql, params, seconds, rows, caller = pending
+                if rows < 0 or self.description is not None:
+                    rows = self._fetched
+                recorder.record(sql, params, seconds, rows, caller)
+
+        def _timed(self, method, sql, params):
+            self._finish()
+            caller = _caller() if recorder.capture_caller else None
+            started = time.perf_counter()
+            try:
+                return method(self, sql, params)
+            finally:
+                self._fetched = 0
+                self._pending = [sql, params, time.perf_counter() - started, self.rowcount, caller]
+                if self.description is None:
+                    self._finish()
+
+        def execute(self, sql, params=()):
+            return self._timed(sqlite3.Cursor.execute, sql, params)
+
+        def executemany(self, sql, seq_of_params):
+            # The parameter sequence may be a one-shot iterator and is not kept
+            return self._timed(lambda cur, sql, _: sqlite3.Cursor.executemany(cur, sql, seq_of_params), sql, None)
+
+        def _fetch(self, method, *args):
+            if self._pending is None:
+                return method(self, *args)
+            started = time.perf_counter()
+            result = method(self, *args)
+            pending = self._pending
+            if pending is not None:
+                pending[2] += time.perf_counter() - started
+            return result
+
+        def fetchone(self):
+            row = self._fetch(sqlite3.Cursor.fetchone)
+            if row is None:
+                self._finish()
+            else:
+                self._fetched += 1
+            return row
+
+        def fetchmany(self, size=None):
+            rows = self._fetch(sqlite3.Cursor.fetchmany, self.arraysize if size is None else size)
+            self._fetched += len(rows)
+            if not rows:
+                self._finish()
+            return rows
+
+        def fetchall(self):
+            rows = self._fetch(sqlite3.Cursor.fetchall)
+            self._fetched += len(rows)
+            self._finish()
+            return rows
+
+        def __next__(self):
+            try:
+                row = self._fetch(sqlite3.Cursor.__next__)
+            except StopIteration:
+                self._finish()
+                raise
+            self._fetched += 1
+            return row
+
+        def close(self):
+            self._finish()
+            super().close()
+
+        def __del__(self):
+            self._finish()
+
+    class InstrumentedConnection(sqlite3.Connection):
+        def cursor(self, factory=InstrumentedCursor):
+            return super().cursor(factory)
+
+        # The C shortcuts use a plain sqlite3.Cursor, so route them through ours
+        def execute(self, sql, params=()):
+            return self.cursor().execute(sql, params)
+
+        def executemany(self, sql, seq_of_params):
+            return self.cursor().executemany(sql, seq_of_params)
+
+    return InstrumentedConnection
+
+
+# Generic plumbing never names the real caller
+_SKIP_FILES = {
+    __file__, sqlite3.__file__, sqlite3.dbapi2.__file__,
+    os.path.join(PACKAGE_DIR, "repositories", "base.py"),
+}
+
+
+def recorder_from_env():
+    """
+    QueryRecorder when VEHICLE_RENTAL_QUERY_STATS is set, else None.
+    VEHICLE_RENTAL_SLOW_QUERY_MS sets the slow-query threshold (default 100).
+    """
+    if os.environ.get("VEHICLE_RENTAL_QUERY_STATS", "").lower() in ("", "0", "false", "no"):
+        return None
+    return QueryRecorder(slow_threshold=float(os.environ.get("VEHICLE_RENTAL_SLOW_QUERY_MS", "100")) / 1000)
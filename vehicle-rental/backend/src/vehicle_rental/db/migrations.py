@@ -0,0 +1,180 @@
+from collections import namedtuple
+
+class MigrationError(RuntimeError):
+    """Raised when a migration step fails; the schema stays at the last good version."""
+
+
+def _run_in_transaction(conn, fn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        fn(conn)
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+# Named tuples rather than dataclasses: this module is imported on every
+# CLI start-up and dataclasses (with inspect and typing) would dominate it
+class Step(namedtuple("Step", ["description", "run", "tables"], defaults=((),))):
+    """
+    One unit of a migration. Runs in its own short transaction and must be
+    idempotent, so an interrupted migration can simply be re-run.
+    `tables` lists the tables to ANALYZE once the migration completes.
+    """
+    __slots__ = ()
+
+
+def sql(statement, tables=()):
+    return Step(statement.strip().splitlines()[0], lambda conn: _run_in_transaction(conn, lambda c: c.execute(statement)), tuple(tables))
+
+
+def create_index(name, table, columns, unique=False, where=None):
+    """
+    Step building one index. Each index gets its own transaction so the
+    write lock is held for a single build, never for the whole migration.
+    """
+    statement = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} "
+        f"ON {table}({', '.join(columns)})"
+    )
+    if where:
+        statement += f" WHERE {where}"
+    return Step(f"index {name} on {table}", lambda conn: _run_in_transaction(conn, lambda c: c.execute(statement)), (table,))
+
+
+Migration = namedtuple("Migration", ["version", "description", "steps"], defaults=((),))
+
+
+def _baseline(conn):
+    from .schema import create_tables  # only needed for a new or pre-migration database
+    create_tables(conn)
+
+
+MIGRATIONS = [
+    Migration(1, "Baseline schema", [Step("create tables", _baseline)]),
+    Migration(2, "Indexes for maintenance history, rental date and client name lookups", [
+        create_index("ix_maintenance_vehicle_date", "maintenance_record", ["vehicle_id", "maintenance_date"]),
+        create_index("ix_rental_rental_date", "rental", ["rental_date"]),
+        create_index("ix_client_last_name", "client", ["last_name"]),
+    ]),
+    Migration(3, "Record of indexes dropped by bulk loads", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS deferred_index (
+                name TEXT PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                sql TEXT NOT NULL
+            )
+        """),
+    ]),
+    Migration(4, "Completion log so rollup catch-up reads only newly completed rentals", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS rental_completion (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                rental_id INTEGER NOT NULL
+            )
+        """),
+        # Every path that completes a rental (service, writer, bulk import, plain SQL) goes through these
+        sql("""
+            CREATE TRIGGER IF NOT EXISTS tr_rental_completed_insert AFTER INSERT ON rental
+            WHEN NEW.status = 'completed'
+            BEGIN
+                INSERT INTO rental_completion (rental_id) VALUES (NEW.id);
+            END
+        """),
+        sql("""
+            CREATE TRIGGER IF NOT EXISTS tr_rental_completed_update AFTER UPDATE OF status ON rental
+            WHEN NEW.status = 'completed' AND OLD.status IS NOT 'completed'
+            BEGIN
+                INSERT INTO rental_completion (rental_id) VALUES (NEW.id);
+            END
+        """),
+        sql("""
+            INSERT INTO rental_completion (rental_id)
+            SELECT id FROM rental
+            WHERE status = 'completed' AND NOT EXISTS (SELECT 1 FROM rental_completion)
+            ORDER BY id
+        """, tables=("rental_completion",)),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _set_version(conn, version):
+    # PRAGMA does not take bound parameters; version is always an int
+    _run_in_transaction(conn, lambda c: c.execute(f"PRAGMA user_version = {int(version)}"))
+
+
+def pending_migrations(conn, target=None):
+    version = current_version(conn)
+    target = LATEST_VERSION if target is None else target
+    return [m for m in MIGRATIONS if version < m.version <= target]
+
+
+def optimize(conn, tables=()):
+    """
+    Refresh planner statistics: ANALYZE the given tables (all tables if
+    none are given), then let PRAGMA optimize handle anything else stale.
+    """
+    if tables:
+        for table in sorted(set(tables)):
+            conn.execute(f"ANALYZE {table}")
+    else:
+        conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
+def migrate(conn, target=None, analyze=True, log=None):
+    """
+    Bring the database up to `target` (default: latest) one migration at a
+    time, recording progress in PRAGMA user_version after each migration.
+    Returns the list of applied versions.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    applied = []
+    touched = set()
+    for migration in pending_migrations(conn, target):
+        for step in migration.steps:
+            if log is not None:
+                log(f"[{migration.version}] {step.description}")
+            try:
+                step.run(conn)
+            except Exception as e:
+                raise MigrationError(
+                    f"Migration {migration.version} ({migration.description}) failed at '{step.description}': {e}"
+                ) from e
+            touched.update(step.tables)
+        _set_version(conn, migration.version)
+        applied.append(migration.version)
+    # The baseline creates every table, so it needs full statistics
+    if applied and analyze:
+        optimize(conn, () if 1 in applied else touched)
+    return applied
+
+
+def restore_deferred_indexes(conn, table=None):
+    """
+    Rebuild indexes a bulk load dropped and recorded in deferred_index but
+    never restored (e.g. the process died mid-load), optionally only those
+    of `table`. Returns the names of the indexes rebuilt.
+    """
+    where, params = ("", ()) if table is None else (" WHERE table_name = ?", (table,))
+    pending = conn.execute("SELECT name, sql FROM deferred_index" + where, params).fetchall()
+    if not pending:
+        return []
+
+    def run(c):
+        for name, statement in pending:
+            if c.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone() is None:
+                c.execute(statement)
+            c.execute("DELETE FROM deferred_index WHERE name = ?", (name,))
+
+    _run_in_transaction(conn, run)
+    return [name for name, _ in pending]
@@ -22,5 +22,5 @@ BACKEND_DIR = os.path.dirname(SRC_DIR)
 DATA_DIR = os.path.join(BACKEND_DIR, "data")
 LOGS_DIR = os.path.join(BACKEND_DIR, "logs")
 
-# DB path
-DB_PATH = os.path.join(DATA_DIR, "vehicle_rental.db")
+# DB path (poate fi suprascris cu VEHICLE_RENTAL_DB_PATH, ex. pentru benchmark-uri)
+DB_PATH = os.environ.get("VEHICLE_RENTAL_DB_PATH", os.path.join(DATA_DIR, "vehicle_rental.db"))
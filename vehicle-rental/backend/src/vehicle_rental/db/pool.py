@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class PoolStats:
+    # A plain class rather than a dataclass, which would pull inspect onto
+    # the CLI start-up path
+    __slots__ = ("hits", "misses", "waits", "wait_time", "discarded")
+
+    def __init__(self):
+        self.hits = 0          # checkout served by an idle pooled connection
+        self.misses = 0        # checkout that had to open a new connection
+        self.waits = 0         # checkout that blocked because the pool was exhausted
+        self.wait_time = 0.0   # total seconds spent blocked
+        self.discarded = 0     # connections dropped after a failed health check
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections with checkout/checkin semantics.
+
+    At most `size` connections are open at any time. Idle connections are
+    reused LIFO so the hottest connection (and its page cache) is handed out
+    first. Every reused connection is health-checked before being returned.
+
+    `on_connect(conn)` runs once per new connection; `on_idle(conn)` runs
+    with the last connection to be released when the pool goes idle, at most
+    once every `idle_interval` seconds, on a background thread so the
+    releasing caller does not wait for it.
+    `factory` is an optional sqlite3.Connection subclass (see instrumentation).
+    """
+
+    def __init__(self, db_path, size=5, timeout=30.0, on_connect=None, on_idle=None, idle_interval=0.0,
+                 factory=None):
+        if size <= 0:
+            raise ValueError(f"Pool size must be positive: {size}")
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.on_connect = on_connect
+        self.on_idle = on_idle
+        self.idle_interval = idle_interval
+        self.factory = factory or sqlite3.Connection
+        self.stats = PoolStats()
+        self._idle = []
+        self._opened = 0
+        self._lock = threading.Lock()
+        # Signalled whenever a connection is returned or a slot is freed
+        self._available = threading.Condition(threading.Lock())
+        self._idle_thread = None
+        self._last_idle_hook = time.monotonic()
+        self._closed = False
+
+    def _count(self, field, amount=1):
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
+
+    def _connect(self):
+        # Created on first connect rather than at import time
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=self.factory)
+        conn.execute("PRAGMA foreign_keys = ON;")  # Enable foreign key constraints
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._available:
+            self._opened -= 1
+            self._available.notify()
+
+    def _checkout(self):
+        """
+        Pop an idle connection or reserve a slot for a new one (returns None),
+        waiting up to `timeout` seconds while the pool is exhausted.
+        """
+        with self._available:
+            if self._idle:
+                return self._idle.pop()
+            if self._opened < self.size:
+                self._opened += 1
+                return None
+
+            self._count("waits")
+            started = time.perf_counter()
+            deadline = started + self.timeout
+            try:
+                while not self._idle and self._opened >= self.size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.timeout}s (pool size {self.size})"
+                        )
+                    self._available.wait(remaining)
+            finally:
+                self._count("wait_time", time.perf_counter() - started)
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+            return None
+
+    def acquire(self):
+        """
+        Check out a connection, opening a new one while under `size`,
+        otherwise waiting up to `timeout` seconds for one to be released.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        while True:
+            conn = self._checkout()
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._available:
+                        self._opened -= 1
+                        self._available.notify()
+                    raise
+                self._count("misses")
+                return conn
+
+            if self._is_healthy(conn):
+                self._count("hits")
+                return conn
+
+            self._count("discarded")
+            self._discard(conn)
+
+    def release(self, conn):
+        """
+        Return a connection to the pool. Uncommitted work is rolled back,
+        matching what closing the connection used to do.
+        """
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._count("discarded")
+            self._discard(conn)
+            return
+        with self._available:
+            if not self._closed:
+                if self._idle_hook_due():
+                    self._idle_thread = threading.Thread(
+                        target=self._run_idle_hook, args=(conn,), name="pool-idle", daemon=True,
+                    )
+                    self._idle_thread.start()
+                else:
+                    self._checkin(conn)
+                return
+        self._discard(conn)
+
+    def _idle_hook_due(self):
+        # Caller holds self._available. The interval is checked here so a
+        # thread is only started when the hook will actually do its work.
+        if self.on_idle is None or self._idle_thread is not None:
+            return False
+        if self._opened - len(self._idle) != 1:
+            return False
+        now = time.monotonic()
+        if now - self._last_idle_hook < self.idle_interval:
+            return False
+        self._last_idle_hook = now
+        return True
+
+    def _checkin(self, conn):
+        # Caller holds self._available
+        self._idle.append(conn)
+        self._available.notify()
+
+    def _run_idle_hook(self, conn):
+        """
+        Run on_idle off the releasing caller's path. The connection stays
+        checked out while the hook runs, so a concurrent acquire either opens
+        another connection or waits for this one to come back.
+        """
+        try:
+            self.on_idle(conn)
+        except sqlite3.Error:
+            pass
+        finally:
+            with self._available:
+                self._idle_thread = None
+                if not self._closed:
+                    self._checkin(conn)
+                    return
+            self._discard(conn)
+
+    def wait_idle_hook(self, timeout=None):
+        """
+        Wait for a running on_idle hook to finish. Returns False on timeout.
+        """
+        thread = self._idle_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    @property
+    def open_count(self):
+        return self._opened
+
+    def close(self):
+        """
+        Close all idle connections. Connections still checked out are
+        closed when they are released.
+        """
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+        self.wait_idle_hook()
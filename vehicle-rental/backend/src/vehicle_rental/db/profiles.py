@@ -0,0 +1,99 @@
+import os
+from collections import namedtuple
+
+# A namedtuple rather than a dataclass: this module is on the CLI start-up
+# path, and dataclasses (with inspect and typing) would double its import time
+_PragmaFields = namedtuple("_PragmaFields", [
+    "name",
+    "journal_mode",         # 'DELETE', 'WAL', ...
+    "synchronous",          # 'OFF', 'NORMAL', 'FULL'
+    "cache_size",           # pages if > 0, KiB if < 0
+    "mmap_size",            # bytes
+    "temp_store",           # 'DEFAULT', 'FILE', 'MEMORY'
+    "busy_timeout",         # milliseconds
+    "checkpoint_interval",  # seconds between idle WAL checkpoints
+], defaults=(None,) * 7)
+
+
+class PragmaProfile(_PragmaFields):
+    """
+    Set of PRAGMAs applied to every new connection.
+    A value of None leaves SQLite's default in place.
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, **pragmas):
+        self = super().__new__(cls, name, **pragmas)
+        if self.journal_mode and self.journal_mode.upper() not in ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'):
+            raise ValueError(f"Invalid journal mode: {self.journal_mode}")
+        if self.synchronous and self.synchronous.upper() not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f"Invalid synchronous level: {self.synchronous}")
+        if self.temp_store and self.temp_store.upper() not in ('DEFAULT', 'FILE', 'MEMORY'):
+            raise ValueError(f"Invalid temp store: {self.temp_store}")
+        if self.busy_timeout is not None and self.busy_timeout < 0:
+            raise ValueError(f"Busy timeout cannot be negative: {self.busy_timeout}")
+        return self
+
+    @property
+    def uses_wal(self):
+        return bool(self.journal_mode) and self.journal_mode.upper() == 'WAL'
+
+    def apply(self, conn):
+        """
+        Apply this profile to a freshly opened connection.
+        """
+        # busy_timeout first so the journal_mode switch can wait on other writers
+        if self.busy_timeout is not None:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)};")
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode.upper()};")
+        if self.synchronous:
+            conn.execute(f"PRAGMA synchronous = {self.synchronous.upper()};")
+        if self.cache_size is not None:
+            conn.execute(f"PRAGMA cache_size = {int(self.cache_size)};")
+        if self.mmap_size is not None:
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)};")
+        if self.temp_store:
+            conn.execute(f"PRAGMA temp_store = {self.temp_store.upper()};")
+
+    def with_overrides(self, **changes):
+        # Not _replace(): that skips the validation in __new__
+        return PragmaProfile(**{**self._asdict(), **changes})
+
+
+PROFILES = {
+    # SQLite defaults (rollback journal, full sync)
+    "default": PragmaProfile(name="default", busy_timeout=5000),
+    # Concurrent readers never block behind a writer
+    "performance": PragmaProfile(
+        name="performance",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64000,          # ~64 MiB
+        mmap_size=268435456,        # 256 MiB
+        temp_store="MEMORY",
+        busy_timeout=5000,
+        checkpoint_interval=60.0,
+    ),
+    # WAL for concurrency but fsync on every commit
+    "durable": PragmaProfile(
+        name="durable",
+        journal_mode="WAL",
+        synchronous="FULL",
+        busy_timeout=10000,
+        checkpoint_interval=30.0,
+    ),
+}
+
+DEFAULT_PROFILE = os.environ.get("VEHICLE_RENTAL_DB_PROFILE", "performance")
+
+
+def get_profile(name=None):
+    """
+    Look up a profile by name (defaults to VEHICLE_RENTAL_DB_PROFILE).
+    """
+    name = name or DEFAULT_PROFILE
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown database profile: {name}. Expected one of {sorted(PROFILES)}")
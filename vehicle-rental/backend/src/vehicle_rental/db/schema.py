@@ -1,3 +1,8 @@
+# Values allowed by the CHECK constraint on vehicle.status (NULL means bookable).
+# The Vehicle model keeps its own, older list; bulk loads must follow the table.
+VEHICLE_STATUSES = ('maintenance', 'sold')
+
+
 def create_tables(conn):
     """
     Create all necessary tables for the vehicle rental system.
@@ -77,4 +82,50 @@ def create_tables(conn):
         ON rental(vehicle_id, return_date);
     """)
 
-    conn.commit()
\ No newline at end of file
+    create_rollup_tables(cursor)
+
+    conn.commit()
+
+
+def create_rollup_tables(cursor):
+    """
+    Summary tables maintained by services.rollups (derived data, safe to rebuild).
+    """
+    # Per brand and calendar day: rented vehicle-days, revenue, maintenance cost
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_brand_daily (
+            day DATE NOT NULL,
+            brand TEXT NOT NULL,
+            rented_days INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            maintenance_cost REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, brand)
+        ) WITHOUT ROWID
+    ''')
+
+    # Per vehicle and month ('YYYY-MM')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_vehicle_monthly (
+            vehicle_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            rented_days INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            maintenance_cost REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (vehicle_id, month)
+        ) WITHOUT ROWID
+    ''')
+
+    # Completed rentals already folded into the rollups
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_applied_rental (
+            rental_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Watermarks, e.g. the last maintenance_record id folded in
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    ''')
\ No newline at end of file
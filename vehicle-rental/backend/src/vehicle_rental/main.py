@@ -1,14 +1,37 @@
 #!/usr/bin/env python3
 """
 Main entry point for the Vehicle Rental System.
+
+    python -m vehicle_rental.main                      initialize the database
+    python -m vehicle_rental.main import TABLE FILE    bulk load CSV / NDJSON
+    python -m vehicle_rental.main export TABLE FILE    dump a table to CSV / NDJSON
 """
 
+import sys
+
 from vehicle_rental.db.connection import initialize_database
 
-def main():
+
+def _init():
     print("Initializing Vehicle Rental Database...")
     initialize_database()
     print("Application started successfully.")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Plain start-up skips argparse and the import/export machinery entirely
+    if not argv:
+        return _init()
+
+    from vehicle_rental.cli import build_parser, run_command
+
+    args = build_parser().parse_args(argv)
+    if args.command in (None, "init"):
+        return _init()
+    return run_command(args)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
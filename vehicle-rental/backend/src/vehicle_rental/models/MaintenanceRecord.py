@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 from typing import Optional
 from datetime import date, datetime
+from .fields import parse_date, parse_datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class MaintenanceRecord:
     vehicle_id: int
     description: str
@@ -29,4 +30,19 @@ class MaintenanceRecord:
             raise ValueError("Maintenance date cannot be in the future")
 
         if self.duration_days is not None and self.duration_days <= 0:
-            raise ValueError(f"Duration days must be positive: {self.duration_days}")
\ No newline at end of file
+            raise ValueError(f"Duration days must be positive: {self.duration_days}")
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a MaintenanceRecord from a trusted database row without revalidating it.
+        """
+        m = object.__new__(cls)
+        m.id = row["id"]
+        m.vehicle_id = row["vehicle_id"]
+        m.description = row["description"]
+        m.cost = row["cost"]
+        m.maintenance_date = parse_date(row["maintenance_date"])
+        m.duration_days = row["duration_days"]
+        m.created_at = parse_datetime(row["created_at"])
+        return m
@@ -1,9 +1,31 @@
-from .vehicle import Vehicle
-from .client import Client
-from .rental import Rental
-from .MaintenanceRecord import MaintenanceRecord
-
-__all__ = [
-    "Vehicle", "Client", "Rental",
-    "MaintenanceRecord"
-]
\ No newline at end of file
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# one model does not pay for the others or for the validation helpers
+_EXPORTS = {
+    "Vehicle": ".vehicle",
+    "Client": ".client",
+    "Rental": ".rental",
+    "MaintenanceRecord": ".MaintenanceRecord",
+    "ErrorCode": ".validation",
+    "BatchValidation": ".validation",
+    "validate_vehicles": ".validation",
+    "validate_clients": ".validation",
+    "validate_rentals": ".validation",
+    "validate_maintenance_records": ".validation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
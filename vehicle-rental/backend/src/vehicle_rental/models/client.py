@@ -2,8 +2,11 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 import re
+from .fields import parse_datetime
 
-@dataclass
+EMAIL_PATTERN = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+
+@dataclass(slots=True)
 class Client:
     first_name: str
     last_name: str
@@ -26,5 +29,21 @@ class Client:
             raise ValueError("Last name cannot be empty")
         if not self.email:
             raise ValueError("Email cannot be empty")
-        if not re.match(r'^[^@]+@[^@]+\.[^@]+$', self.email):
+        if not EMAIL_PATTERN.match(self.email):
             raise ValueError(f"Invalid email format: {self.email}. Expected format: something@something.com")
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a Client from a trusted database row without revalidating it.
+        """
+        c = object.__new__(cls)
+        c.id = row["id"]
+        c.first_name = row["first_name"]
+        c.last_name = row["last_name"]
+        c.email = row["email"]
+        c.status = row["status"]
+        c.phone = row["phone"]
+        c.license_number = row["license_number"]
+        c.created_at = parse_datetime(row["created_at"])
+        return c
@@ -0,0 +1,19 @@
+from datetime import date, datetime
+
+
+def parse_date(value):
+    """
+    Convert an ISO-8601 date read from SQLite (text) into a date.
+    """
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def parse_datetime(value):
+    """
+    Convert an SQLite timestamp ('YYYY-MM-DD HH:MM:SS') into a datetime.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
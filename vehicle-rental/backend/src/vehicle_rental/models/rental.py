@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from typing import Optional
 from datetime import date, datetime
+from .fields import parse_date, parse_datetime
 
-@dataclass
+VALID_STATUSES = ('active', 'completed', 'cancelled')
+
+@dataclass(slots=True)
 class Rental:
     vehicle_id: int
     client_id: int
@@ -13,7 +16,7 @@ class Rental:
     created_at: Optional[datetime] = None
 
     def __post_init__(self):
-        if self.status not in ['active', 'completed', 'cancelled']:
+        if self.status not in VALID_STATUSES:
             raise ValueError(f"Invalid status: {self.status}")
         if self.rental_date > date.today():
             raise ValueError("Rental date cannot be in the future")
@@ -26,4 +29,19 @@ class Rental:
         if self.status == 'active' and self.return_date:
                 raise ValueError("Return date must be None when status is active")
         if self.status in ['completed', 'cancelled'] and not self.return_date:
-            raise ValueError(f"Return date must be set when status is {self.status}")
\ No newline at end of file
+            raise ValueError(f"Return date must be set when status is {self.status}")
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a Rental from a trusted database row without revalidating it.
+        """
+        r = object.__new__(cls)
+        r.id = row["id"]
+        r.vehicle_id = row["vehicle_id"]
+        r.client_id = row["client_id"]
+        r.rental_date = parse_date(row["rental_date"])
+        r.return_date = parse_date(row["return_date"])
+        r.status = row["status"]
+        r.created_at = parse_datetime(row["created_at"])
+        return r
@@ -0,0 +1,169 @@
+"""
+Column-oriented validation for bulk imports.
+
+Each validate_* function mirrors the checks of the model's __post_init__
+but takes whole columns (lists, tuples or NumPy arrays) and returns a
+BatchValidation with a per-row error code instead of raising, so a file
+of a million rows is validated without constructing objects or paying for
+exceptions. When a row fails several checks, the code of the first check
+__post_init__ would have raised is reported.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import IntEnum
+
+from .client import EMAIL_PATTERN
+from .vehicle import VALID_STATUSES as VEHICLE_STATUSES
+from .rental import VALID_STATUSES as RENTAL_STATUSES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; plain sequences work without it
+    np = None
+
+
+class ErrorCode(IntEnum):
+    OK = 0
+    INVALID_STATUS = 1
+    EMPTY_FIRST_NAME = 2
+    EMPTY_LAST_NAME = 3
+    EMPTY_EMAIL = 4
+    INVALID_EMAIL = 5
+    INVALID_YEAR = 6
+    INVALID_DAILY_RATE = 7
+    EMPTY_LICENSE_PLATE = 8
+    FUTURE_DATE = 9
+    RETURN_BEFORE_RENTAL = 10
+    INVALID_VEHICLE_ID = 11
+    INVALID_CLIENT_ID = 12
+    RETURN_DATE_ON_ACTIVE = 13
+    MISSING_RETURN_DATE = 14
+    EMPTY_DESCRIPTION = 15
+    NEGATIVE_COST = 16
+    INVALID_DURATION = 17
+
+
+@dataclass
+class BatchValidation:
+    """
+    codes[i] is ErrorCode.OK for a valid row, otherwise the first failing check.
+    """
+    codes: list
+
+    @property
+    def mask(self):
+        return [code == 0 for code in self.codes]
+
+    @property
+    def valid_count(self):
+        return self.codes.count(0)
+
+    def invalid_rows(self):
+        return [i for i, code in enumerate(self.codes) if code]
+
+    def error_counts(self):
+        counts = {}
+        for code in self.codes:
+            if code:
+                counts[ErrorCode(code)] = counts.get(ErrorCode(code), 0) + 1
+        return counts
+
+    def as_arrays(self):
+        """
+        (mask, codes) as NumPy arrays; requires NumPy.
+        """
+        if np is None:
+            raise ImportError("NumPy is required for as_arrays()")
+        codes = np.asarray(self.codes, dtype=np.int8)
+        return codes == 0, codes
+
+
+def _length(columns):
+    lengths = {len(c) for c in columns}
+    if len(lengths) != 1:
+        raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+    return lengths.pop()
+
+
+def _flag(codes, failed, code):
+    """
+    Set `code` on the rows where `failed` is true and no earlier check failed.
+    """
+    code = int(code)
+    for i, bad in enumerate(failed):
+        if bad and not codes[i]:
+            codes[i] = code
+
+
+def _compare(column, predicate, vectorized):
+    """
+    Evaluate a numeric check, using NumPy when the column is an ndarray.
+    """
+    if np is not None and isinstance(column, np.ndarray):
+        return vectorized(column).tolist()
+    return [predicate(x) for x in column]
+
+
+def _blank(column):
+    return [not (x and x.strip()) for x in column]
+
+
+def _default(column, n, value):
+    return [value] * n if column is None else column
+
+
+def validate_vehicles(license_plate, brand, model, year, daily_rate, status=None, statuses=VEHICLE_STATUSES):
+    n = _length([license_plate, brand, model, year, daily_rate])
+    status = _default(status, n, None)
+    codes = [0] * n
+    max_year = datetime.now().year + 1
+    _flag(codes, _compare(year, lambda y: y < 1900 or y > max_year,
+                          lambda a: (a < 1900) | (a > max_year)), ErrorCode.INVALID_YEAR)
+    _flag(codes, _compare(daily_rate, lambda r: r <= 0, lambda a: a <= 0), ErrorCode.INVALID_DAILY_RATE)
+    _flag(codes, [bool(s) and s not in statuses for s in status], ErrorCode.INVALID_STATUS)
+    _flag(codes, _blank(license_plate), ErrorCode.EMPTY_LICENSE_PLATE)
+    return BatchValidation(codes)
+
+
+def validate_clients(first_name, last_name, email, status=None):
+    n = _length([first_name, last_name, email])
+    status = _default(status, n, 1)
+    codes = [0] * n
+    _flag(codes, _compare(status, lambda s: s not in (0, 1), lambda a: (a != 0) & (a != 1)), ErrorCode.INVALID_STATUS)
+    _flag(codes, _blank(first_name), ErrorCode.EMPTY_FIRST_NAME)
+    _flag(codes, _blank(last_name), ErrorCode.EMPTY_LAST_NAME)
+    emails = [(e or "").strip().lower() for e in email]
+    _flag(codes, [not e for e in emails], ErrorCode.EMPTY_EMAIL)
+    match = EMAIL_PATTERN.match
+    _flag(codes, [not codes[i] and match(e) is None for i, e in enumerate(emails)], ErrorCode.INVALID_EMAIL)
+    return BatchValidation(codes)
+
+
+def validate_rentals(vehicle_id, client_id, rental_date, return_date=None, status=None, today=None):
+    n = _length([vehicle_id, client_id, rental_date])
+    return_date = _default(return_date, n, None)
+    status = _default(status, n, 'active')
+    today = today or date.today()
+    codes = [0] * n
+    _flag(codes, [s not in RENTAL_STATUSES for s in status], ErrorCode.INVALID_STATUS)
+    _flag(codes, [d > today for d in rental_date], ErrorCode.FUTURE_DATE)
+    _flag(codes, [bool(r) and r < d for r, d in zip(return_date, rental_date)], ErrorCode.RETURN_BEFORE_RENTAL)
+    _flag(codes, _compare(vehicle_id, lambda v: v <= 0, lambda a: a <= 0), ErrorCode.INVALID_VEHICLE_ID)
+    _flag(codes, _compare(client_id, lambda c: c <= 0, lambda a: a <= 0), ErrorCode.INVALID_CLIENT_ID)
+    _flag(codes, [s == 'active' and bool(r) for s, r in zip(status, return_date)], ErrorCode.RETURN_DATE_ON_ACTIVE)
+    _flag(codes, [s in ('completed', 'cancelled') and not r for s, r in zip(status, return_date)],
+          ErrorCode.MISSING_RETURN_DATE)
+    return BatchValidation(codes)
+
+
+def validate_maintenance_records(vehicle_id, description, cost, maintenance_date, duration_days=None, today=None):
+    n = _length([vehicle_id, description, cost, maintenance_date])
+    duration_days = _default(duration_days, n, None)
+    today = today or date.today()
+    codes = [0] * n
+    _flag(codes, _compare(vehicle_id, lambda v: v <= 0, lambda a: a <= 0), ErrorCode.INVALID_VEHICLE_ID)
+    _flag(codes, _blank(description), ErrorCode.EMPTY_DESCRIPTION)
+    _flag(codes, _compare(cost, lambda c: c < 0, lambda a: a < 0), ErrorCode.NEGATIVE_COST)
+    _flag(codes, [d > today for d in maintenance_date], ErrorCode.FUTURE_DATE)
+    _flag(codes, [d is not None and d <= 0 for d in duration_days], ErrorCode.INVALID_DURATION)
+    return BatchValidation(codes)
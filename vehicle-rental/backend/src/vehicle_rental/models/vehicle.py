@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
+from .fields import parse_datetime
 
-@dataclass
+VALID_STATUSES = ('none', 'rented', 'maintenance')
+
+@dataclass(slots=True)
 class Vehicle:
     license_plate: str
     brand: str
@@ -21,7 +24,23 @@ class Vehicle:
             raise ValueError(f"Invalid year: {self.year}")
         if self.daily_rate <= 0:
             raise ValueError(f"Daily rate must be greater than zero: {self.daily_rate}")
-        if self.status and self.status not in ['none','rented', 'maintenance']:
+        if self.status and self.status not in VALID_STATUSES:
             raise ValueError(f"Invalid status: {self.status}")
         if not self.license_plate or self.license_plate == "":
-            raise ValueError("License plate cannot be empty")
\ No newline at end of file
+            raise ValueError("License plate cannot be empty")
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a Vehicle from a trusted database row without revalidating it.
+        """
+        v = object.__new__(cls)
+        v.id = row["id"]
+        v.license_plate = row["license_plate"]
+        v.brand = row["brand"]
+        v.model = row["model"]
+        v.year = row["year"]
+        v.daily_rate = row["daily_rate"]
+        v.status = row["status"]
+        v.created_at = parse_datetime(row["created_at"])
+        return v
@@ -0,0 +1,9 @@
+from .vehicle import VehicleRepository
+from .client import ClientRepository
+from .rental import RentalRepository
+from .maintenance_record import MaintenanceRecordRepository
+
+__all__ = [
+    "VehicleRepository", "ClientRepository", "RentalRepository",
+    "MaintenanceRecordRepository"
+]
@@ -0,0 +1,213 @@
+from datetime import date, datetime
+from itertools import islice
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_PAGE_SIZE = 1000
+
+
+def to_db_date(value):
+    """
+    Serialize a date/datetime for SQLite (ISO-8601 text).
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of at most `size` items from `iterable`.
+    """
+    if size <= 0:
+        raise ValueError(f"Chunk size must be positive: {size}")
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Callbacks notified after a commit that changed existing rows:
+# listener(table, ids, keys) where keys is a list of (column, value) pairs
+_change_listeners = []
+
+
+def add_change_listener(listener):
+    _change_listeners.append(listener)
+
+
+def remove_change_listener(listener):
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+
+def notify_change(table, ids=(), keys=()):
+    for listener in list(_change_listeners):
+        listener(table, list(ids), list(keys))
+
+
+class BaseRepository:
+    """
+    Maps a model dataclass to its table.
+
+    Subclasses define `table`, `columns` (writable columns, in the order
+    returned by `to_params`), `conflict_keys` (columns usable for upsert)
+    and the `to_params` / `from_row` conversions. `created_at` is always
+    the last parameter and falls back to CURRENT_TIMESTAMP when None.
+    """
+    table = None
+    columns = ()
+    conflict_keys = ()
+    default_conflict_key = None
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # ---------- conversions ----------
+    def to_params(self, obj):
+        raise NotImplementedError
+
+    def from_row(self, row):
+        raise NotImplementedError
+
+    # ---------- SQL builders ----------
+    def _insert_sql(self):
+        cols = ", ".join(self.columns)
+        placeholders = ", ".join(
+            "COALESCE(?, CURRENT_TIMESTAMP)" if c == "created_at" else "?" for c in self.columns
+        )
+        return f"INSERT INTO {self.table} ({cols}) VALUES ({placeholders})"
+
+    def _upsert_sql(self, key):
+        if key not in self.conflict_keys:
+            raise ValueError(f"Invalid conflict key for {self.table}: {key}. Expected one of {list(self.conflict_keys)}")
+        updates = ", ".join(
+            f"{c} = excluded.{c}" for c in self.columns if c not in ("id", "created_at", key)
+        )
+        return f"{self._insert_sql()} ON CONFLICT({key}) DO UPDATE SET {updates}"
+
+    # ---------- single row ----------
+    def insert(self, obj, commit=True):
+        """
+        Insert one object, commit, and set its id. Returns the new id.
+        With commit=False the row joins the caller's open transaction.
+        """
+        if commit:
+            with self.conn:
+                cursor = self.conn.execute(self._insert_sql(), self.to_params(obj))
+        else:
+            cursor = self.conn.execute(self._insert_sql(), self.to_params(obj))
+        obj.id = cursor.lastrowid
+        return obj.id
+
+    def upsert(self, obj, key=None):
+        """
+        Insert one object or update the existing row with the same `key`.
+        """
+        key = key or self.default_conflict_key
+        with self.conn:
+            self.conn.execute(self._upsert_sql(key), self.to_params(obj))
+        notify_change(self.table, keys=[(key, getattr(obj, key))])
+
+    def update(self, obj):
+        """
+        Overwrite the row with obj.id. Returns True if a row was updated.
+        """
+        if obj.id is None:
+            raise ValueError(f"Cannot update {self.table} without an id")
+        values = dict(zip(self.columns, self.to_params(obj)))
+        cols = [c for c in self.columns if c not in ("id", "created_at")]
+        assignments = ", ".join(f"{c} = ?" for c in cols)
+        with self.conn:
+            cursor = self.conn.execute(
+                f"UPDATE {self.table} SET {assignments} WHERE id = ?",
+                [values[c] for c in cols] + [obj.id],
+            )
+        notify_change(self.table, ids=[obj.id])
+        return cursor.rowcount > 0
+
+    def delete(self, id):
+        """
+        Delete the row with `id`. Returns True if a row was deleted.
+        """
+        with self.conn:
+            cursor = self.conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (id,))
+        notify_change(self.table, ids=[id])
+        return cursor.rowcount > 0
+
+    def get(self, id):
+        row = self.conn.execute(f"SELECT * FROM {self.table} WHERE id = ?", (id,)).fetchone()
+        return self.from_row(row) if row is not None else None
+
+    def count(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    # ---------- streaming ----------
+    def _iter_keyset(self, where="", params=(), key=("id",), page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield objects ordered by `key` (unique, non-NULL columns ending in id),
+        one page of at most `page_size` rows per query. Each page resumes
+        after the last key seen instead of using OFFSET, so every page costs
+        an index seek and no statement stays open between pages.
+        """
+        if page_size <= 0:
+            raise ValueError(f"Page size must be positive: {page_size}")
+        columns = ", ".join(key)
+        resume = f"({columns}) > ({', '.join('?' * len(key))})"
+        last = None
+        while True:
+            clauses = [f"({where})"] if where else []
+            args = list(params)
+            if last is not None:
+                clauses.append(resume)
+                args.extend(last)
+            sql = f"SELECT * FROM {self.table}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += f" ORDER BY {columns} LIMIT ?"
+            rows = self.conn.execute(sql, args + [page_size]).fetchall()
+            for row in rows:
+                yield self.from_row(row)
+            if len(rows) < page_size:
+                return
+            last = tuple(rows[-1][c] for c in key)
+
+    def iter_all(self, page_size=DEFAULT_PAGE_SIZE, after_id=None):
+        """
+        Lazily yield every row by ascending id (optionally starting after `after_id`).
+        """
+        if after_id is None:
+            return self._iter_keyset(page_size=page_size)
+        return self._iter_keyset("id > ?", (after_id,), page_size=page_size)
+
+    # ---------- bulk ----------
+    def _bulk(self, sql, objs, chunk_size, key=None):
+        total = 0
+        for chunk in chunked(objs, chunk_size):
+            # One transaction per chunk: a failing row rolls back only its chunk
+            with self.conn:
+                self.conn.executemany(sql, map(self.to_params, chunk))
+            if key is not None and _change_listeners:
+                notify_change(self.table, keys=[(key, getattr(obj, key)) for obj in chunk])
+            total += len(chunk)
+        return total
+
+    def bulk_insert(self, objs, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Insert many objects with executemany, one transaction per chunk.
+        Ids are not written back to the objects. Returns the number of rows.
+        """
+        return self._bulk(self._insert_sql(), objs, chunk_size)
+
+    def bulk_upsert(self, objs, key=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Insert or update many objects on `key`, one transaction per chunk.
+        Returns the number of rows processed.
+        """
+        key = key or self.default_conflict_key
+        return self._bulk(self._upsert_sql(key), objs, chunk_size, key)
@@ -0,0 +1,33 @@
+from ..models import Client
+from .base import BaseRepository, DEFAULT_PAGE_SIZE, to_db_date
+
+
+class ClientRepository(BaseRepository):
+    table = "client"
+    columns = ("id", "first_name", "last_name", "email", "phone", "license_number", "status", "created_at")
+    conflict_keys = ("email", "license_number", "id")
+    default_conflict_key = "email"
+
+    def to_params(self, c):
+        return (c.id, c.first_name, c.last_name, c.email, c.phone, c.license_number, c.status, to_db_date(c.created_at))
+
+    def from_row(self, row):
+        return Client.from_row(row)
+
+    def get_by_email(self, email):
+        row = self.conn.execute(
+            "SELECT * FROM client WHERE email = ?", (email.strip().lower(),)
+        ).fetchone()
+        return self.from_row(row) if row is not None else None
+
+    def get_by_license_number(self, license_number):
+        row = self.conn.execute(
+            "SELECT * FROM client WHERE license_number = ?", (license_number,)
+        ).fetchone()
+        return self.from_row(row) if row is not None else None
+
+    def iter_by_last_name(self, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Lazily yield all clients alphabetically by (last_name, id).
+        """
+        return self._iter_keyset(key=("last_name", "id"), page_size=page_size)
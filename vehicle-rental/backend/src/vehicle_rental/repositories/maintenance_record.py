@@ -0,0 +1,18 @@
+from ..models import MaintenanceRecord
+from .base import BaseRepository, to_db_date
+
+
+class MaintenanceRecordRepository(BaseRepository):
+    table = "maintenance_record"
+    columns = ("id", "vehicle_id", "description", "cost", "maintenance_date", "duration_days", "created_at")
+    conflict_keys = ("id",)
+    default_conflict_key = "id"
+
+    def to_params(self, m):
+        return (
+            m.id, m.vehicle_id, m.description, m.cost,
+            to_db_date(m.maintenance_date), m.duration_days, to_db_date(m.created_at),
+        )
+
+    def from_row(self, row):
+        return MaintenanceRecord.from_row(row)
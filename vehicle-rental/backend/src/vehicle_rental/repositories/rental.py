@@ -0,0 +1,44 @@
+from ..models import Rental
+from .base import BaseRepository, DEFAULT_PAGE_SIZE, to_db_date
+
+
+class RentalRepository(BaseRepository):
+    table = "rental"
+    columns = ("id", "vehicle_id", "client_id", "rental_date", "return_date", "status", "created_at")
+    conflict_keys = ("id",)
+    default_conflict_key = "id"
+
+    def to_params(self, r):
+        return (
+            r.id, r.vehicle_id, r.client_id,
+            to_db_date(r.rental_date), to_db_date(r.return_date),
+            r.status, to_db_date(r.created_at),
+        )
+
+    def from_row(self, row):
+        return Rental.from_row(row)
+
+    def iter_by_client(self, client_id, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Lazily yield a client's rentals: open ones first (by id), then
+        returned ones by (return_date, id), walking ix_rental_client_status.
+        """
+        yield from self._iter_keyset(
+            "client_id = ? AND return_date IS NULL", (client_id,), page_size=page_size
+        )
+        yield from self._iter_keyset(
+            "client_id = ? AND return_date IS NOT NULL", (client_id,),
+            key=("return_date", "id"), page_size=page_size,
+        )
+
+    def iter_by_vehicle(self, vehicle_id, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Lazily yield a vehicle's rentals, same order as iter_by_client.
+        """
+        yield from self._iter_keyset(
+            "vehicle_id = ? AND return_date IS NULL", (vehicle_id,), page_size=page_size
+        )
+        yield from self._iter_keyset(
+            "vehicle_id = ? AND return_date IS NOT NULL", (vehicle_id,),
+            key=("return_date", "id"), page_size=page_size,
+        )
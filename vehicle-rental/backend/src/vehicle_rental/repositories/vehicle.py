@@ -0,0 +1,23 @@
+from ..models import Vehicle
+from .base import BaseRepository, to_db_date
+
+
+class VehicleRepository(BaseRepository):
+    table = "vehicle"
+    columns = ("id", "license_plate", "brand", "model", "year", "daily_rate", "status", "created_at")
+    conflict_keys = ("license_plate", "id")
+    default_conflict_key = "license_plate"
+
+    def to_params(self, v):
+        # The model uses 'none' for "no special status"; the table stores NULL
+        status = None if v.status == 'none' else v.status
+        return (v.id, v.license_plate, v.brand, v.model, v.year, v.daily_rate, status, to_db_date(v.created_at))
+
+    def from_row(self, row):
+        return Vehicle.from_row(row)
+
+    def get_by_license_plate(self, license_plate):
+        row = self.conn.execute(
+            "SELECT * FROM vehicle WHERE license_plate = ?", (license_plate.strip().upper(),)
+        ).fetchone()
+        return self.from_row(row) if row is not None else None
@@ -0,0 +1,32 @@
+import importlib
+
+# Services are imported on first attribute access (PEP 562): a CLI command
+# or worker only loads the services it actually uses
+_EXPORTS = {
+    "AvailabilityIndex": ".availability",
+    "AvailabilityService": ".availability",
+    "LRUCache": ".cache",
+    "LookupCache": ".cache",
+    "ConflictDetector": ".conflicts",
+    "Conflict": ".conflicts",
+    "MaintenanceAnalytics": ".maintenance",
+    "VehicleTimeline": ".maintenance",
+    "RollupService": ".rollups",
+    "RentalWriter": ".writer",
+    "VehicleAlreadyRentedError": ".writer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,415 @@
+import itertools
+import threading
+import weakref
+from bisect import bisect_left, insort
+from collections.abc import Set
+from datetime import date, timedelta
+
+from ..db.connection import get_db_connection
+from ..repositories import RentalRepository, MaintenanceRecordRepository
+
+# Vehicle statuses that take a vehicle out of the bookable fleet
+UNAVAILABLE_STATUSES = ('maintenance', 'sold')
+
+
+def maintenance_end(maintenance_date, duration_days):
+    """
+    Exclusive end date of a maintenance window (one day when duration is unknown).
+    """
+    return maintenance_date + timedelta(days=duration_days or 1)
+
+
+def close_rental(conn, rental_id, return_date, status='completed', rollups=None):
+    """
+    Set the return date and final status of an open rental inside the
+    caller's transaction, folding it into `rollups` when given.
+    Returns (vehicle_id, rental_date) for the index update after commit.
+    """
+    if status not in ('completed', 'cancelled'):
+        raise ValueError(f"Invalid status: {status}")
+    row = conn.execute(
+        "SELECT vehicle_id, rental_date FROM rental WHERE id = ? AND return_date IS NULL",
+        (rental_id,),
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"No open rental with id: {rental_id}")
+    rental_date = date.fromisoformat(row["rental_date"][:10])
+    if return_date < rental_date:
+        raise ValueError("Return date cannot be before rental date")
+    conn.execute(
+        "UPDATE rental SET return_date = ?, status = ? WHERE id = ?",
+        (return_date.isoformat(), status, rental_id),
+    )
+    if rollups is not None:
+        rollups.apply_rental(conn, rental_id)
+    return row["vehicle_id"], rental_date
+
+
+def _length_bucket(length):
+    # Bucket k holds intervals of 2**(k-1) < length <= 2**k days
+    return (length - 1).bit_length()
+
+
+class AvailableVehicles(Set):
+    """
+    Result of AvailabilityIndex.available_vehicles(): the fleet minus the
+    busy vehicles, without copying the fleet. Membership is O(1); len() and
+    iteration walk the fleet the first time they are needed. The index
+    materializes outstanding results before it changes, so a result always
+    describes the index as it was when the query ran.
+    """
+    __slots__ = ("_fleet", "_open", "_end", "_busy", "_items", "_lock", "__weakref__")
+
+    def __init__(self, fleet, open_starts, end, busy, lock):
+        self._fleet = fleet          # the index's live fleet set
+        self._open = open_starts     # the index's live vehicle_id -> open rental start
+        self._end = end
+        self._busy = busy            # vehicles busy in closed intervals
+        self._items = None
+        self._lock = lock            # shared with the index, which materializes before changing
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def _free(self, vehicle_id):
+        return (vehicle_id not in self._busy
+                and self._open.get(vehicle_id, self._end) >= self._end)
+
+    def _materialize(self):
+        with self._lock:
+            if self._items is None:
+                self._items = frozenset(vid for vid in self._fleet if self._free(vid))
+                self._fleet = self._open = self._busy = None
+            return self._items
+
+    def __contains__(self, vehicle_id):
+        with self._lock:
+            if self._items is not None:
+                return vehicle_id in self._items
+            return vehicle_id in self._fleet and self._free(vehicle_id)
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({set(self._materialize())!r})"
+
+
+class AvailabilityIndex:
+    """
+    In-memory busy intervals per vehicle, as half-open [start, end) date ranges.
+
+    Closed intervals (completed rentals, maintenance) are kept sorted by start
+    per vehicle and, fleet-wide, in buckets by length: bucket k only holds
+    intervals at most 2**k days long, so only its intervals starting in
+    [query_start - 2**k, query_end) can overlap a query. A lookup costs two
+    bisects per bucket plus about the intervals that overlap, however long
+    the longest interval is. Open rentals (no return date) are busy from
+    their start onwards and are tracked apart.
+    """
+
+    def __init__(self):
+        self._fleet = set()
+        self._closed = {}        # vehicle_id -> sorted [(start, end)]
+        self._max_length = {}    # vehicle_id -> longest closed interval
+        self._buckets = {}       # length bucket -> sorted [(start, end, vehicle_id)]
+        self._open = {}          # vehicle_id -> start of the open rental
+        self._open_sorted = []   # sorted [(start, vehicle_id)]
+        # AvailableVehicles still reading live state (they are unhashable, hence keyed by a counter)
+        self._results = weakref.WeakValueDictionary()
+        self._result_ids = itertools.count()
+        self._results_lock = threading.Lock()
+
+    # ---------- maintenance of the index ----------
+    def _changing(self):
+        # Pin outstanding query results to the state they were computed on
+        if self._results:
+            for result in list(self._results.values()):
+                result._materialize()
+            self._results.clear()
+
+    def add_vehicle(self, vehicle_id):
+        self._changing()
+        self._fleet.add(vehicle_id)
+
+    def remove_vehicle(self, vehicle_id):
+        self._changing()
+        self._fleet.discard(vehicle_id)
+
+    def _add_closed(self, vehicle_id, s, e, add):
+        if e <= s:
+            e = s + 1  # same-day rental still occupies that day
+        add(self._closed.setdefault(vehicle_id, []), (s, e))
+        add(self._buckets.setdefault(_length_bucket(e - s), []), (s, e, vehicle_id))
+        if e - s > self._max_length.get(vehicle_id, 0):
+            self._max_length[vehicle_id] = e - s
+
+    def add_interval(self, vehicle_id, start, end=None):
+        """
+        Mark `vehicle_id` busy on [start, end); end=None means open-ended.
+        """
+        self._changing()
+        s = start.toordinal()
+        if end is None:
+            previous = self._open.get(vehicle_id)
+            if previous is not None:
+                self._open_sorted.remove((previous, vehicle_id))
+            self._open[vehicle_id] = s
+            insort(self._open_sorted, (s, vehicle_id))
+            return
+        self._add_closed(vehicle_id, s, end.toordinal(), insort)
+
+    def add_intervals(self, intervals):
+        """
+        add_interval() for many (vehicle_id, start, end) triples: appended
+        unsorted and sorted once at the end, for bulk loads.
+        """
+        self._changing()
+        append = list.append
+        for vehicle_id, start, end in intervals:
+            if end is None:
+                self._open[vehicle_id] = start.toordinal()
+            else:
+                self._add_closed(vehicle_id, start.toordinal(), end.toordinal(), append)
+        for per_vehicle in self._closed.values():
+            per_vehicle.sort()
+        for bucket in self._buckets.values():
+            bucket.sort()
+        self._open_sorted = sorted((s, vid) for vid, s in self._open.items())
+
+    def close_interval(self, vehicle_id, end):
+        """
+        Turn the open rental of `vehicle_id` into a closed interval ending at `end`.
+        """
+        self._changing()
+        s = self._open.pop(vehicle_id, None)
+        if s is None:
+            return
+        self._open_sorted.remove((s, vehicle_id))
+        self.add_interval(vehicle_id, date.fromordinal(s), end)
+
+    def remove_interval(self, vehicle_id, start, end=None):
+        self._changing()
+        s = start.toordinal()
+        if end is None:
+            if self._open.get(vehicle_id) == s:
+                del self._open[vehicle_id]
+                self._open_sorted.remove((s, vehicle_id))
+            return
+        e = max(end.toordinal(), s + 1)
+        intervals = self._closed.get(vehicle_id, [])
+        if (s, e) in intervals:
+            intervals.remove((s, e))
+            self._buckets[_length_bucket(e - s)].remove((s, e, vehicle_id))
+
+    # ---------- queries ----------
+    def _check_range(self, start, end):
+        if end <= start:
+            raise ValueError("End date must be after start date")
+        return start.toordinal(), end.toordinal()
+
+    def is_available(self, vehicle_id, start, end):
+        """
+        True if `vehicle_id` is in the fleet and free on [start, end).
+        """
+        s, e = self._check_range(start, end)
+        if vehicle_id not in self._fleet:
+            return False
+        open_start = self._open.get(vehicle_id)
+        if open_start is not None and open_start < e:
+            return False
+        intervals = self._closed.get(vehicle_id)
+        if not intervals:
+            return True
+        i = bisect_left(intervals, (e,)) - 1
+        lowest = s - self._max_length[vehicle_id]
+        while i >= 0 and intervals[i][0] >= lowest:
+            if intervals[i][1] > s:
+                return False
+            i -= 1
+        return True
+
+    def _busy_closed(self, s, e):
+        busy = set()
+        for k, bucket in self._buckets.items():
+            lo = bisect_left(bucket, (s - (1 << k) + 1,))
+            hi = bisect_left(bucket, (e,))
+            busy.update([vid for _, interval_end, vid in bucket[lo:hi] if interval_end > s])
+        return busy
+
+    def busy_vehicles(self, start, end):
+        """
+        Ids of vehicles with at least one interval overlapping [start, end).
+        """
+        s, e = self._check_range(start, end)
+        busy = self._busy_closed(s, e)
+        busy.update(vid for _, vid in self._open_sorted[:bisect_left(self._open_sorted, (e,))])
+        return busy
+
+    def available_vehicles(self, start, end):
+        """
+        Fleet vehicles free on the whole [start, end) range, as a read-only
+        set (see AvailableVehicles). Costs about the closed intervals that
+        overlap the range, not the size of the fleet.
+        """
+        s, e = self._check_range(start, end)
+        result = AvailableVehicles(self._fleet, self._open, e, self._busy_closed(s, e), self._results_lock)
+        self._results[next(self._result_ids)] = result
+        return result
+
+
+class AvailabilityService:
+    """
+    Answers "which vehicles are free between A and B".
+
+    After `load()` queries are served from an AvailabilityIndex, which
+    `create_rental`, `return_rental` and `add_maintenance` keep in sync with
+    the database. Before loading (or with use_index=False) queries fall
+    back to SQL over rental / maintenance_record.
+    """
+
+    def __init__(self, connection_factory=get_db_connection, use_index=True, rollups=None):
+        self.connection_factory = connection_factory
+        self.use_index = use_index
+        self.rollups = rollups  # optional RollupService kept current on returns
+        self.index = None
+        self._lock = threading.RLock()
+
+    def load(self):
+        """
+        Build the in-memory index from the database.
+        """
+        index = AvailabilityIndex()
+        with self.connection_factory() as conn:
+            for row in conn.execute("SELECT id, status FROM vehicle"):
+                if row["status"] not in UNAVAILABLE_STATUSES:
+                    index.add_vehicle(row["id"])
+            index.add_intervals(self._load_intervals(conn))
+        with self._lock:
+            self.index = index
+        return index
+
+    @staticmethod
+    def _load_intervals(conn):
+        for row in conn.execute(
+            "SELECT vehicle_id, rental_date, return_date FROM rental WHERE status != 'cancelled'"
+        ):
+            end = date.fromisoformat(row["return_date"][:10]) if row["return_date"] else None
+            yield row["vehicle_id"], date.fromisoformat(row["rental_date"][:10]), end
+        for row in conn.execute(
+            "SELECT vehicle_id, maintenance_date, duration_days FROM maintenance_record"
+        ):
+            start = date.fromisoformat(row["maintenance_date"][:10])
+            yield row["vehicle_id"], start, maintenance_end(start, row["duration_days"])
+
+    @property
+    def _indexed(self):
+        return self.use_index and self.index is not None
+
+    # ---------- queries ----------
+    def is_available(self, vehicle_id, start, end):
+        if self._indexed:
+            with self._lock:
+                return self.index.is_available(vehicle_id, start, end)
+        return vehicle_id in self._available_sql(start, end, vehicle_id)
+
+    def available_vehicles(self, start, end):
+        if self._indexed:
+            with self._lock:
+                return self.index.available_vehicles(start, end)
+        return self._available_sql(start, end)
+
+    def _available_sql(self, start, end, vehicle_id=None):
+        if end <= start:
+            raise ValueError("End date must be after start date")
+        # Busy vehicles are collected with one pass over each table instead of
+        # a correlated subquery per vehicle (maintenance_record has no vehicle index)
+        sql = """
+            SELECT v.id FROM vehicle v
+            WHERE (v.status IS NULL OR v.status NOT IN ('maintenance', 'sold'))
+              AND v.id NOT IN (
+                SELECT r.vehicle_id FROM rental r
+                WHERE r.status != 'cancelled'
+                  AND r.rental_date < :end
+                  AND (r.return_date IS NULL OR max(r.return_date, date(r.rental_date, '+1 day')) > :start)
+                  {rental_filter}
+                UNION
+                SELECT m.vehicle_id FROM maintenance_record m
+                WHERE m.maintenance_date < :end
+                  AND date(m.maintenance_date, '+' || COALESCE(m.duration_days, 1) || ' days') > :start
+                  {maintenance_filter})
+              {vehicle_filter}
+        """
+        params = {"start": start.isoformat(), "end": end.isoformat()}
+        filters = {"rental_filter": "", "maintenance_filter": "", "vehicle_filter": ""}
+        if vehicle_id is not None:
+            filters = {
+                "rental_filter": "AND r.vehicle_id = :vehicle_id",
+                "maintenance_filter": "AND m.vehicle_id = :vehicle_id",
+                "vehicle_filter": "AND v.id = :vehicle_id",
+            }
+            params["vehicle_id"] = vehicle_id
+        sql = sql.format(**filters)
+        with self.connection_factory() as conn:
+            return {row[0] for row in conn.execute(sql, params)}
+
+    # ---------- writes that keep the index in sync ----------
+    def create_rental(self, rental):
+        """
+        Persist a new rental and mark its vehicle busy. Returns the rental id.
+        """
+        with self.connection_factory() as conn:
+            rental_id = RentalRepository(conn).insert(rental)
+        self.track_rental(rental)
+        return rental_id
+
+    def return_rental(self, rental_id, return_date, status='completed'):
+        """
+        Close an open rental and shorten its busy interval to `return_date`.
+        """
+        with self.connection_factory() as conn:
+            with conn:
+                vehicle_id, rental_date = close_rental(conn, rental_id, return_date, status, self.rollups)
+        self.track_return(vehicle_id, rental_date, return_date, status)
+
+    def add_maintenance(self, record):
+        """
+        Persist a maintenance record and mark its window busy. Returns the record id.
+        """
+        with self.connection_factory() as conn:
+            record_id = MaintenanceRecordRepository(conn).insert(record)
+            if self.rollups is not None:
+                self.rollups.catch_up_maintenance(conn)
+        self.track_maintenance(record)
+        return record_id
+
+    # ---------- index updates for writes committed elsewhere ----------
+    def track_rental(self, rental):
+        if self.index is not None and rental.status != 'cancelled':
+            with self._lock:
+                self.index.add_interval(rental.vehicle_id, rental.rental_date, rental.return_date)
+
+    def track_return(self, vehicle_id, rental_date, return_date, status='completed'):
+        if self.index is not None:
+            with self._lock:
+                if status == 'cancelled':
+                    self.index.remove_interval(vehicle_id, rental_date)
+                else:
+                    self.index.close_interval(vehicle_id, return_date)
+
+    def track_maintenance(self, record):
+        if self.index is not None:
+            with self._lock:
+                self.index.add_interval(
+                    record.vehicle_id, record.maintenance_date,
+                    maintenance_end(record.maintenance_date, record.duration_days),
+                )
+
+    def add_vehicle(self, vehicle_id):
+        if self.index is not None:
+            with self._lock:
+                self.index.add_vehicle(vehicle_id)
@@ -0,0 +1,215 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from ..db.connection import get_db_connection
+from ..repositories import VehicleRepository, ClientRepository
+from ..repositories.base import add_change_listener, remove_change_listener
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional per-entry time to live.
+    """
+
+    def __init__(self, maxsize=10000, ttl=None, on_evict=None):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be positive: {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            expires_at = time.monotonic() + self.ttl if self.ttl else None
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._data:
+                return self._remove(key)
+            return None
+
+    def _remove(self, key):
+        _, value = self._data.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._remove(key)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class LookupCache:
+    """
+    Read-through cache for vehicle and client lookups.
+
+    Objects are cached once per (table, id); lookups by license_plate,
+    email or license_number go through an alias map to that entry.
+    Updates and deletes made through the repositories invalidate the
+    affected entries; changes made outside this process are only picked
+    up once an entry's `ttl` expires. Returned objects are copies.
+    """
+    ALIASES = {
+        "vehicle": ("license_plate",),
+        "client": ("email", "license_number"),
+    }
+    REPOSITORIES = {
+        "vehicle": VehicleRepository,
+        "client": ClientRepository,
+    }
+
+    def __init__(self, maxsize=10000, ttl=300.0, connection_factory=get_db_connection):
+        self.connection_factory = connection_factory
+        self.invalidations = 0
+        self._generation = 0  # bumped on every invalidation
+        self._aliases = {}  # (table, column, value) -> id
+        self._lock = threading.RLock()
+        self._entries = LRUCache(maxsize, ttl, on_evict=self._drop_aliases)
+        add_change_listener(self._on_change)
+
+    def close(self):
+        """
+        Stop listening for repository changes and empty the cache.
+        """
+        remove_change_listener(self._on_change)
+        self.clear()
+
+    # ---------- lookups ----------
+    def get_vehicle(self, id):
+        return self._get("vehicle", "id", id)
+
+    def get_vehicle_by_license_plate(self, license_plate):
+        return self._get("vehicle", "license_plate", license_plate.strip().upper())
+
+    def get_client(self, id):
+        return self._get("client", "id", id)
+
+    def get_client_by_email(self, email):
+        return self._get("client", "email", email.strip().lower())
+
+    def get_client_by_license_number(self, license_number):
+        return self._get("client", "license_number", license_number)
+
+    def _get(self, table, column, value):
+        with self._lock:
+            id = value if column == "id" else self._aliases.get((table, column, value))
+            if id is not None:
+                obj = self._entries.get((table, id))
+                if obj is not None:
+                    return copy.copy(obj)
+            else:
+                self._entries.misses += 1
+            generation = self._generation
+
+        obj = self._load(table, column, value)
+        if obj is None:
+            return None
+        with self._lock:
+            # Skip caching if a write invalidated entries while we were loading
+            if generation == self._generation:
+                self._store(table, obj)
+        return copy.copy(obj)
+
+    def _load(self, table, column, value):
+        with self.connection_factory() as conn:
+            repo = self.REPOSITORIES[table](conn)
+            if column == "id":
+                return repo.get(value)
+            row = conn.execute(f"SELECT * FROM {table} WHERE {column} = ?", (value,)).fetchone()
+            return repo.from_row(row) if row is not None else None
+
+    def _store(self, table, obj):
+        self._entries.put((table, obj.id), obj)
+        for column in self.ALIASES[table]:
+            value = getattr(obj, column)
+            if value is not None:
+                self._aliases[(table, column, value)] = obj.id
+
+    def _drop_aliases(self, key, obj):
+        table, id = key
+        for column in self.ALIASES[table]:
+            alias = (table, column, getattr(obj, column))
+            if self._aliases.get(alias) == id:
+                del self._aliases[alias]
+
+    # ---------- invalidation ----------
+    def invalidate(self, table, ids=(), keys=()):
+        """
+        Drop cached entries by id and/or by (column, value) aliases.
+        """
+        if table not in self.ALIASES:
+            return
+        with self._lock:
+            self._generation += 1
+            targets = set(ids)
+            for column, value in keys:
+                if column == "id":
+                    targets.add(value)
+                else:
+                    id = self._aliases.get((table, column, value))
+                    if id is not None:
+                        targets.add(id)
+            for id in targets:
+                if self._entries.pop((table, id)) is not None:
+                    self.invalidations += 1
+
+    def _on_change(self, table, ids, keys):
+        self.invalidate(table, ids, keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def stats(self):
+        stats = self._entries.stats()
+        stats["invalidations"] = self.invalidations
+        stats["aliases"] = len(self._aliases)
+        return stats
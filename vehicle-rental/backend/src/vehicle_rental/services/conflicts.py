@@ -0,0 +1,170 @@
+import heapq
+import sys
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import date
+
+from ..db.connection import get_db_connection
+from ..models import Rental, MaintenanceRecord
+
+RENTAL = "rental"
+MAINTENANCE = "maintenance"
+
+# Busy window as ordinals, half-open [start, end); end is _OPEN for an open rental.
+# `ref` is the row id for stored windows and the batch position for proposed ones.
+Window = namedtuple("Window", "vehicle_id start end kind ref proposed")
+
+_OPEN = sys.maxsize
+
+
+def _ordinal(value):
+    return (value if isinstance(value, date) else date.fromisoformat(value[:10])).toordinal()
+
+
+def rental_window(vehicle_id, rental_date, return_date, ref, proposed=False):
+    start = _ordinal(rental_date)
+    end = _ordinal(return_date) if return_date else _OPEN
+    # A same-day rental still occupies that day, as in AvailabilityIndex
+    return Window(vehicle_id, start, max(end, start + 1), RENTAL, ref, proposed)
+
+
+def maintenance_window(vehicle_id, maintenance_date, duration_days, ref, proposed=False):
+    # Same window as availability.maintenance_end(): one day when duration is unknown
+    start = _ordinal(maintenance_date)
+    return Window(vehicle_id, start, start + (duration_days or 1), MAINTENANCE, ref, proposed)
+
+
+@dataclass(frozen=True)
+class Conflict:
+    vehicle_id: int
+    first: Window
+    second: Window
+
+    @property
+    def start(self):
+        """First day both windows are busy."""
+        return date.fromordinal(max(self.first.start, self.second.start))
+
+    @property
+    def end(self):
+        """Exclusive end of the overlap, None if both are open rentals."""
+        end = min(self.first.end, self.second.end)
+        return None if end == _OPEN else date.fromordinal(end)
+
+    @property
+    def kinds(self):
+        return self.first.kind, self.second.kind
+
+
+def sweep(windows, proposed_only=False):
+    """
+    Yield a Conflict for every overlapping pair of windows on the same vehicle.
+
+    Windows are sorted by (vehicle_id, start) and swept once per vehicle
+    while a min-heap of end dates holds the windows still open at the
+    current start; each new window conflicts exactly with those. Cost is
+    O(n log n + conflicts) instead of comparing every pair. With
+    proposed_only, pairs of two stored windows are not reported.
+    """
+    active = []
+    vehicle_id = None
+    for seq, window in enumerate(sorted(windows, key=lambda w: (w.vehicle_id, w.start, w.end))):
+        if window.vehicle_id != vehicle_id:
+            vehicle_id = window.vehicle_id
+            active = []
+        while active and active[0][0] <= window.start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if not proposed_only or window.proposed or other.proposed:
+                yield Conflict(vehicle_id, other, window)
+        heapq.heappush(active, (window.end, seq, window))
+
+
+class BatchCheck:
+    """
+    Result of ConflictDetector.check(): conflicts per proposed item.
+    """
+
+    def __init__(self, size, conflicts):
+        self.conflicts = conflicts
+        self.by_item = [[] for _ in range(size)]
+        for conflict in conflicts:
+            for window in (conflict.first, conflict.second):
+                if window.proposed:
+                    self.by_item[window.ref].append(conflict)
+
+    @property
+    def ok(self):
+        return not self.conflicts
+
+    def accepted(self):
+        """Positions of proposed items without any conflict."""
+        return [i for i, found in enumerate(self.by_item) if not found]
+
+    def rejected(self):
+        return [i for i, found in enumerate(self.by_item) if found]
+
+
+class ConflictDetector:
+    """
+    Finds overlapping busy windows (rentals that are not cancelled and
+    maintenance_date + duration_days windows) per vehicle.
+
+    `check()` validates a batch of proposed Rental / MaintenanceRecord
+    objects against the stored history and each other in one sweep;
+    `audit()` reports every overlap already in the database.
+    """
+
+    def __init__(self, connection_factory=get_db_connection):
+        self.connection_factory = connection_factory
+
+    def stored_windows(self, vehicle_ids=None):
+        """
+        Windows for every stored rental and maintenance record, optionally
+        limited to `vehicle_ids`.
+        """
+        where, params = "", ()
+        if vehicle_ids is not None:
+            vehicle_ids = sorted(set(vehicle_ids))
+            # json_each keeps it one statement however many vehicles the batch touches
+            where, params = " AND vehicle_id IN (SELECT value FROM json_each(?))", ("[" + ",".join(map(str, vehicle_ids)) + "]",)
+        windows = []
+        with self.connection_factory() as conn:
+            for row in conn.execute(
+                "SELECT id, vehicle_id, rental_date, return_date FROM rental WHERE status != 'cancelled'" + where, params
+            ):
+                windows.append(rental_window(row[1], row[2], row[3], row[0]))
+            for row in conn.execute(
+                "SELECT id, vehicle_id, maintenance_date, duration_days FROM maintenance_record WHERE 1" + where, params
+            ):
+                windows.append(maintenance_window(row[1], row[2], row[3], row[0]))
+        return windows
+
+    @staticmethod
+    def proposed_window(item, position):
+        if isinstance(item, Rental):
+            return rental_window(item.vehicle_id, item.rental_date, item.return_date, position, proposed=True)
+        if isinstance(item, MaintenanceRecord):
+            return maintenance_window(item.vehicle_id, item.maintenance_date, item.duration_days, position, proposed=True)
+        raise TypeError(f"Cannot check {type(item).__name__} for conflicts")
+
+    def check(self, items):
+        """
+        Check proposed rentals / maintenance records against the database
+        and against each other. Cancelled rentals never conflict.
+        """
+        items = list(items)
+        proposed = [
+            self.proposed_window(item, i) for i, item in enumerate(items)
+            if not (isinstance(item, Rental) and item.status == 'cancelled')
+        ]
+        if not proposed:
+            return BatchCheck(len(items), [])
+        stored = self.stored_windows({w.vehicle_id for w in proposed})
+        return BatchCheck(len(items), list(sweep(stored + proposed, proposed_only=True)))
+
+    def audit(self):
+        """
+        Every overlap among stored windows, e.g. for a nightly consistency check.
+        """
+        return list(sweep(self.stored_windows()))
@@ -0,0 +1,232 @@
+import heapq
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+from ..db.connection import get_db_connection
+from ..models.fields import parse_date
+
+# Service interval used for vehicles without enough history of their own
+DEFAULT_SERVICE_INTERVAL_DAYS = 180
+# Vehicle ids per IN (...) lookup, well under SQLite's bound-parameter limit
+VEHICLE_LOOKUP_BATCH = 500
+
+
+@dataclass(slots=True)
+class VehicleTimeline:
+    """
+    Running maintenance totals for one vehicle; every field is updated in
+    O(1) per record, whatever order the records arrive in.
+    """
+    vehicle_id: int
+    brand: str
+    status: Optional[str] = None
+    services: int = 0
+    total_cost: float = 0.0
+    downtime_days: int = 0
+    first_service: Optional[date] = None
+    last_service: Optional[date] = None
+    last_cost: float = 0.0
+
+    def add(self, cost, maintenance_date, duration_days):
+        self.services += 1
+        self.total_cost += cost
+        self.downtime_days += duration_days or 1
+        if self.first_service is None or maintenance_date < self.first_service:
+            self.first_service = maintenance_date
+        if self.last_service is None or maintenance_date >= self.last_service:
+            self.last_service = maintenance_date
+            self.last_cost = cost
+
+    @property
+    def mean_interval(self):
+        """
+        Average days between services; consecutive gaps sum to last - first.
+        """
+        if self.services < 2:
+            return None
+        return (self.last_service - self.first_service).days / (self.services - 1)
+
+    def due_date(self, interval_days=DEFAULT_SERVICE_INTERVAL_DAYS, use_history=False):
+        """
+        Next service date, or None if the vehicle was never serviced.
+        With use_history the vehicle's own mean interval wins when known.
+        """
+        if self.last_service is None:
+            return None
+        interval = self.mean_interval if use_history and self.mean_interval else interval_days
+        return self.last_service + timedelta(days=round(interval))
+
+    def cost_per_day(self, today):
+        """
+        Maintenance cost per day since the first recorded service.
+        """
+        if self.first_service is None:
+            return 0.0
+        return self.total_cost / max((today - self.first_service).days, 1)
+
+
+class MaintenanceAnalytics:
+    """
+    Per-vehicle maintenance timelines built from maintenance_record in one
+    pass by `load()` and kept current incrementally: `add_record()` for
+    records written in-process, `refresh()` for records added elsewhere
+    (maintenance records are insert-only, so an id watermark is enough).
+    Fleet queries then cost O(1) per vehicle instead of a table scan, and
+    all of them cover the active fleet only (sold vehicles are left out).
+    """
+
+    def __init__(self, connection_factory=get_db_connection, interval_days=DEFAULT_SERVICE_INTERVAL_DAYS):
+        self.connection_factory = connection_factory
+        self.interval_days = interval_days
+        self.timelines = {}
+        self._last_id = 0
+        self._applied_ids = set()   # ids above the watermark already pushed via add_record
+        self._lock = threading.RLock()
+
+    # ---------- building ----------
+    def load(self):
+        """
+        Build every timeline from the database.
+        """
+        with self.connection_factory() as conn:
+            timelines = {
+                row["id"]: VehicleTimeline(row["id"], row["brand"], row["status"])
+                for row in conn.execute("SELECT id, brand, status FROM vehicle")
+            }
+            last_id = self._apply_rows(timelines, conn.execute(
+                "SELECT id, vehicle_id, cost, maintenance_date, duration_days FROM maintenance_record"
+            ), set())
+        with self._lock:
+            self.timelines = timelines
+            self._last_id = last_id
+            self._applied_ids.clear()
+        return self
+
+    @staticmethod
+    def _apply_rows(timelines, rows, skip):
+        last_id = 0
+        for row in rows:
+            last_id = max(last_id, row["id"])
+            if row["id"] in skip:
+                continue
+            timeline = timelines.get(row["vehicle_id"])
+            if timeline is not None:
+                timeline.add(row["cost"], parse_date(row["maintenance_date"]), row["duration_days"])
+        return last_id
+
+    def refresh(self):
+        """
+        Fold in records added since the last load/refresh. Returns how many.
+        Vehicles created since load() get their timeline here, so none of
+        their records are skipped.
+        """
+        with self.connection_factory() as conn:
+            rows = conn.execute(
+                "SELECT id, vehicle_id, cost, maintenance_date, duration_days FROM maintenance_record "
+                "WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+            unknown = sorted({row["vehicle_id"] for row in rows} - self.timelines.keys())
+            vehicles = []
+            for i in range(0, len(unknown), VEHICLE_LOOKUP_BATCH):
+                ids = unknown[i:i + VEHICLE_LOOKUP_BATCH]
+                vehicles += conn.execute(
+                    f"SELECT id, brand, status FROM vehicle WHERE id IN ({', '.join('?' * len(ids))})", ids
+                ).fetchall()
+        with self._lock:
+            for row in vehicles:
+                self.timelines.setdefault(row["id"], VehicleTimeline(row["id"], row["brand"], row["status"]))
+            last_id = self._apply_rows(self.timelines, rows, self._applied_ids)
+            self._last_id = max(self._last_id, last_id)
+            self._applied_ids = {i for i in self._applied_ids if i > self._last_id}
+        return len(rows)
+
+    def add_vehicle(self, vehicle_id, brand, status=None):
+        with self._lock:
+            self.timelines.setdefault(vehicle_id, VehicleTimeline(vehicle_id, brand, status))
+
+    def remove_vehicle(self, vehicle_id):
+        with self._lock:
+            self.timelines.pop(vehicle_id, None)
+
+    def add_record(self, record):
+        """
+        Apply a committed MaintenanceRecord (with its id) right away.
+        """
+        with self._lock:
+            timeline = self.timelines.get(record.vehicle_id)
+            if timeline is None:
+                return  # unknown vehicle: refresh() loads it together with this record
+            if record.id is not None:
+                if record.id <= self._last_id or record.id in self._applied_ids:
+                    return
+                self._applied_ids.add(record.id)
+            timeline.add(record.cost, record.maintenance_date, record.duration_days)
+
+    # ---------- queries ----------
+    def timeline(self, vehicle_id):
+        return self.timelines.get(vehicle_id)
+
+    def _active(self):
+        return [t for t in self.timelines.values() if t.status != 'sold']
+
+    def due_soon(self, within_days=30, today=None, use_history=False, include_unserviced=True):
+        """
+        [(vehicle_id, due_date, days_left)] for vehicles due within
+        `within_days` (negative days_left means overdue), soonest first.
+        Never-serviced vehicles come first with due_date None.
+        """
+        today = today or date.today()
+        horizon = today + timedelta(days=within_days)
+        due, unserviced = [], []
+        with self._lock:
+            for t in self._active():
+                due_date = t.due_date(self.interval_days, use_history)
+                if due_date is None:
+                    if include_unserviced:
+                        unserviced.append((t.vehicle_id, None, None))
+                elif due_date <= horizon:
+                    due.append((t.vehicle_id, due_date, (due_date - today).days))
+        due.sort(key=lambda item: (item[1], item[0]))
+        return sorted(unserviced) + due
+
+    def top_cost(self, n=10, by="total_cost", today=None):
+        """
+        The `n` vehicles with the highest total_cost, downtime_days,
+        services or cost_per_day, as [(vehicle_id, value)].
+        """
+        if by == "cost_per_day":
+            today = today or date.today()
+            key = lambda t: t.cost_per_day(today)
+        elif by in ("total_cost", "downtime_days", "services"):
+            key = lambda t: getattr(t, by)
+        else:
+            raise ValueError(f"Invalid ranking: {by}")
+        with self._lock:
+            top = heapq.nlargest(n, self._active(), key=key)
+            return [(t.vehicle_id, key(t)) for t in top]
+
+    def brand_summary(self, today=None):
+        """
+        Per brand: vehicles, services, total cost, downtime and cost per
+        vehicle-day since each vehicle's first service.
+        """
+        today = today or date.today()
+        summary = {}
+        with self._lock:
+            for t in self._active():
+                s = summary.setdefault(t.brand, {
+                    "vehicles": 0, "services": 0, "total_cost": 0.0, "downtime_days": 0, "_days": 0,
+                })
+                s["vehicles"] += 1
+                s["services"] += t.services
+                s["total_cost"] += t.total_cost
+                s["downtime_days"] += t.downtime_days
+                if t.first_service is not None:
+                    s["_days"] += max((today - t.first_service).days, 1)
+        for s in summary.values():
+            days = s.pop("_days")
+            s["cost_per_vehicle"] = round(s["total_cost"] / s["vehicles"], 2)
+            s["cost_per_day"] = round(s["total_cost"] / days, 2) if days else 0.0
+        return summary
@@ -0,0 +1,284 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from ..db.connection import get_db_connection
+from ..models.fields import parse_date
+
+DEFAULT_CHUNK_SIZE = 10000
+
+_UPSERT_BRAND_DAILY = """
+    INSERT INTO rollup_brand_daily (day, brand, rented_days, revenue, maintenance_cost)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(day, brand) DO UPDATE SET
+        rented_days = rented_days + excluded.rented_days,
+        revenue = revenue + excluded.revenue,
+        maintenance_cost = maintenance_cost + excluded.maintenance_cost
+"""
+
+_UPSERT_VEHICLE_MONTHLY = """
+    INSERT INTO rollup_vehicle_monthly (vehicle_id, month, rented_days, revenue, maintenance_cost)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(vehicle_id, month) DO UPDATE SET
+        rented_days = rented_days + excluded.rented_days,
+        revenue = revenue + excluded.revenue,
+        maintenance_cost = maintenance_cost + excluded.maintenance_cost
+"""
+
+_RENTAL_COLUMNS = """
+    SELECT r.id, r.vehicle_id, r.rental_date, r.return_date, v.brand, v.daily_rate
+    FROM rental r JOIN vehicle v ON v.id = r.vehicle_id
+"""
+
+
+def rental_days(rental_date, return_date):
+    """
+    Billable days of a rental; a same-day rental counts as one day.
+    """
+    return max((return_date - rental_date).days, 1)
+
+
+class _Deltas:
+    """
+    Increments for the rollup tables, accumulated in memory and written
+    with one executemany per table.
+    """
+
+    def __init__(self):
+        self.brand_daily = defaultdict(lambda: [0, 0.0, 0.0])
+        self.vehicle_monthly = defaultdict(lambda: [0, 0.0, 0.0])
+
+    def add_rental(self, vehicle_id, brand, daily_rate, start, end):
+        day = start
+        for _ in range(rental_days(start, end)):
+            b = self.brand_daily[(day.isoformat(), brand)]
+            b[0] += 1
+            b[1] += daily_rate
+            v = self.vehicle_monthly[(vehicle_id, day.strftime("%Y-%m"))]
+            v[0] += 1
+            v[1] += daily_rate
+            day += timedelta(days=1)
+
+    def add_maintenance(self, vehicle_id, brand, cost, day):
+        self.brand_daily[(day.isoformat(), brand)][2] += cost
+        self.vehicle_monthly[(vehicle_id, day.strftime("%Y-%m"))][2] += cost
+
+    def flush(self, conn):
+        conn.executemany(_UPSERT_BRAND_DAILY, ((*k, *v) for k, v in self.brand_daily.items()))
+        conn.executemany(_UPSERT_VEHICLE_MONTHLY, ((*k, *v) for k, v in self.vehicle_monthly.items()))
+        self.brand_daily.clear()
+        self.vehicle_monthly.clear()
+
+
+def _month_bounds(start_month, end_month):
+    """
+    First day of start_month and first day after end_month ('YYYY-MM', inclusive).
+    """
+    start = date.fromisoformat(start_month + "-01")
+    last = date.fromisoformat(end_month + "-01")
+    end = date(last.year + (last.month == 12), last.month % 12 + 1, 1)
+    return start, end
+
+
+class RollupService:
+    """
+    Maintains and queries the daily/monthly revenue, utilization and
+    maintenance cost rollups.
+
+    Completed rentals are folded in exactly once (tracked in
+    rollup_applied_rental), either right when they complete via
+    apply_rental() or later by catch_up(), which reads only the
+    rental_completion log past its watermark. Maintenance records are
+    insert-only and folded in by id watermark. Revenue is rental days x
+    the vehicle's current daily_rate, spread over the rented days.
+    """
+
+    def __init__(self, connection_factory=get_db_connection):
+        self.connection_factory = connection_factory
+
+    # ---------- maintenance of the rollups ----------
+    def apply_rental(self, conn, rental_id):
+        """
+        Fold one completed rental into the rollups on `conn`, inside the
+        caller's transaction. Returns False if it was already applied or
+        is not completed.
+        """
+        row = conn.execute(
+            _RENTAL_COLUMNS + " WHERE r.id = ? AND r.status = 'completed'", (rental_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        if conn.execute("INSERT OR IGNORE INTO rollup_applied_rental (rental_id) VALUES (?)", (rental_id,)).rowcount == 0:
+            return False
+        deltas = _Deltas()
+        deltas.add_rental(row["vehicle_id"], row["brand"], row["daily_rate"],
+                          parse_date(row["rental_date"]), parse_date(row["return_date"]))
+        deltas.flush(conn)
+        return True
+
+    def catch_up(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Fold in every completed rental and maintenance record not applied
+        yet, one transaction per chunk. Returns (rentals, maintenance records).
+        """
+        with self.connection_factory() as conn:
+            return self._catch_up_rentals(conn, chunk_size), self.catch_up_maintenance(conn, chunk_size)
+
+    def _catch_up_rentals(self, conn, chunk_size):
+        """
+        Fold in rentals completed since the stored rental_completion
+        watermark. Completions already applied by apply_rental() are in the
+        ledger and only advance the watermark.
+        """
+        applied = 0
+        while True:
+            state = conn.execute("SELECT value FROM rollup_state WHERE name = 'rental_completion'").fetchone()
+            last_seq = state[0] if state else 0
+            rows = conn.execute(
+                """
+                SELECT c.seq, r.id, r.vehicle_id, r.rental_date, r.return_date, r.status, v.brand, v.daily_rate,
+                       EXISTS (SELECT 1 FROM rollup_applied_rental a WHERE a.rental_id = r.id) AS done
+                FROM rental_completion c
+                JOIN rental r ON r.id = c.rental_id
+                JOIN vehicle v ON v.id = r.vehicle_id
+                WHERE c.seq > ? ORDER BY c.seq LIMIT ?
+                """,
+                (last_seq, chunk_size),
+            ).fetchall()
+            if not rows:
+                return applied
+            deltas = _Deltas()
+            new_ids = {}
+            for row in rows:
+                if row["status"] != 'completed' or row["done"] or row["id"] in new_ids:
+                    continue
+                new_ids[row["id"]] = None
+                deltas.add_rental(row["vehicle_id"], row["brand"], row["daily_rate"],
+                                  parse_date(row["rental_date"]), parse_date(row["return_date"]))
+            with conn:
+                conn.executemany("INSERT INTO rollup_applied_rental (rental_id) VALUES (?)", ((i,) for i in new_ids))
+                deltas.flush(conn)
+                conn.execute(
+                    "INSERT INTO rollup_state (name, value) VALUES ('rental_completion', ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                    (rows[-1]["seq"],),
+                )
+            applied += len(new_ids)
+
+    def catch_up_maintenance(self, conn, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Fold in maintenance records past the stored id watermark.
+        """
+        applied = 0
+        while True:
+            state = conn.execute("SELECT value FROM rollup_state WHERE name = 'maintenance_record'").fetchone()
+            last_id = state[0] if state else 0
+            rows = conn.execute(
+                """
+                SELECT m.id, m.vehicle_id, m.cost, m.maintenance_date, v.brand
+                FROM maintenance_record m JOIN vehicle v ON v.id = m.vehicle_id
+                WHERE m.id > ? ORDER BY m.id LIMIT ?
+                """,
+                (last_id, chunk_size),
+            ).fetchall()
+            if not rows:
+                return applied
+            deltas = _Deltas()
+            for row in rows:
+                deltas.add_maintenance(row["vehicle_id"], row["brand"], row["cost"], parse_date(row["maintenance_date"]))
+            with conn:
+                deltas.flush(conn)
+                conn.execute(
+                    "INSERT INTO rollup_state (name, value) VALUES ('maintenance_record', ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                    (rows[-1]["id"],),
+                )
+            applied += len(rows)
+
+    def rebuild(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Drop all rollup data and recompute it from rental / maintenance_record.
+        """
+        with self.connection_factory() as conn:
+            with conn:
+                for table in ("rollup_brand_daily", "rollup_vehicle_monthly", "rollup_applied_rental", "rollup_state"):
+                    conn.execute(f"DELETE FROM {table}")
+        return self.catch_up(chunk_size)
+
+    # ---------- queries ----------
+    def _query(self, sql, params=()):
+        with self.connection_factory() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def revenue(self, start, end, brand=None):
+        """
+        Fleet (or one brand's) revenue earned on days in [start, end).
+        """
+        sql = "SELECT COALESCE(SUM(revenue), 0) FROM rollup_brand_daily WHERE day >= ? AND day < ?"
+        params = [start.isoformat(), end.isoformat()]
+        if brand is not None:
+            sql += " AND brand = ?"
+            params.append(brand)
+        return self._query(sql, params)[0][0]
+
+    def revenue_by_brand(self, start, end):
+        rows = self._query(
+            "SELECT brand, SUM(revenue) FROM rollup_brand_daily WHERE day >= ? AND day < ? GROUP BY brand",
+            (start.isoformat(), end.isoformat()),
+        )
+        return {brand: revenue for brand, revenue in rows}
+
+    def utilization_by_brand(self, start, end):
+        """
+        Percentage of available vehicle-days rented in [start, end), per brand.
+        The fleet size is the current number of non-sold vehicles of that brand.
+        """
+        days = (end - start).days
+        if days <= 0:
+            raise ValueError("End date must be after start date")
+        fleet = dict(self._query(
+            "SELECT brand, COUNT(*) FROM vehicle WHERE status IS NULL OR status != 'sold' GROUP BY brand"
+        ))
+        rented = dict(self._query(
+            "SELECT brand, SUM(rented_days) FROM rollup_brand_daily WHERE day >= ? AND day < ? GROUP BY brand",
+            (start.isoformat(), end.isoformat()),
+        ))
+        return {
+            brand: round(100.0 * rented.get(brand, 0) / (count * days), 2)
+            for brand, count in fleet.items()
+        }
+
+    def vehicle_summary(self, vehicle_id, start_month, end_month):
+        """
+        Rented days, utilization %, revenue and maintenance cost of one
+        vehicle over whole months ('YYYY-MM', inclusive).
+        """
+        start, end = _month_bounds(start_month, end_month)
+        row = self._query(
+            """
+            SELECT COALESCE(SUM(rented_days), 0), COALESCE(SUM(revenue), 0), COALESCE(SUM(maintenance_cost), 0)
+            FROM rollup_vehicle_monthly WHERE vehicle_id = ? AND month >= ? AND month <= ?
+            """,
+            (vehicle_id, start_month, end_month),
+        )[0]
+        return {
+            "vehicle_id": vehicle_id,
+            "rented_days": row[0],
+            "utilization": round(100.0 * row[0] / (end - start).days, 2),
+            "revenue": row[1],
+            "maintenance_cost": row[2],
+        }
+
+    def maintenance_cost_by_vehicle(self, start_month, end_month, limit=None):
+        """
+        [(vehicle_id, cost)] over the month range, most expensive first.
+        """
+        sql = """
+            SELECT vehicle_id, SUM(maintenance_cost) AS cost FROM rollup_vehicle_monthly
+            WHERE month >= ? AND month <= ? AND maintenance_cost > 0
+            GROUP BY vehicle_id ORDER BY cost DESC
+        """
+        params = [start_month, end_month]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [(vehicle_id, cost) for vehicle_id, cost in self._query(sql, params)]
@@ -0,0 +1,343 @@
+import csv
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import compress
+
+from ..db.connection import get_db_connection
+from ..db.migrations import restore_deferred_indexes
+from ..db.schema import VEHICLE_STATUSES
+from ..models import Vehicle, Client, Rental, MaintenanceRecord
+from ..models.fields import parse_date, parse_datetime
+from ..models.validation import (
+    validate_vehicles, validate_clients, validate_rentals, validate_maintenance_records
+)
+from ..repositories import (
+    VehicleRepository, ClientRepository, RentalRepository, MaintenanceRecordRepository
+)
+from ..repositories.base import DEFAULT_CHUNK_SIZE, DEFAULT_PAGE_SIZE
+
+FORMATS = ("csv", "ndjson")
+
+
+# ---------- field converters (CSV gives strings, NDJSON gives typed values) ----------
+def _blank(value):
+    return value is None or value == ""
+
+
+def _int(value):
+    return int(value)
+
+
+def _float(value):
+    return float(value)
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _opt_int(value):
+    return None if _blank(value) else int(value)
+
+
+def _opt_text(value):
+    return None if _blank(value) else str(value)
+
+
+def _date(value):
+    return parse_date(value)
+
+
+def _opt_date(value):
+    return None if _blank(value) else parse_date(value)
+
+
+def _opt_datetime(value):
+    # Parsed here, not left to Model.from_row, so a bad timestamp only skips its row
+    return None if _blank(value) else parse_datetime(value)
+
+
+def _client_status(value):
+    return 1 if _blank(value) else int(value)
+
+
+@dataclass(frozen=True)
+class TableFormat:
+    """
+    How one table is read from and written to flat files: the fields in
+    repository column order with their converters, the columnar validator
+    and the normalization __post_init__ would apply.
+    """
+    name: str
+    repository: type
+    model: type
+    fields: tuple            # ((column, converter), ...)
+    validate: callable       # columns dict -> BatchValidation
+    normalize: callable = None  # row dict -> None (in place)
+
+    @property
+    def columns(self):
+        return [name for name, _ in self.fields]
+
+
+def _normalize_vehicle(row):
+    row["license_plate"] = row["license_plate"].strip().upper()
+    row["brand"] = row["brand"].strip().title()
+    row["model"] = row["model"].strip().title()
+
+
+def _normalize_client(row):
+    row["first_name"] = row["first_name"].strip()
+    row["last_name"] = row["last_name"].strip()
+    row["email"] = row["email"].strip().lower()
+
+
+TABLES = {
+    "vehicle": TableFormat(
+        "vehicle", VehicleRepository, Vehicle,
+        (("id", _opt_int), ("license_plate", _text), ("brand", _text), ("model", _text), ("year", _int),
+         ("daily_rate", _float), ("status", _opt_text), ("created_at", _opt_datetime)),
+        # Statuses are checked against the table's CHECK constraint, not the model's list
+        lambda c: validate_vehicles(c["license_plate"], c["brand"], c["model"], c["year"], c["daily_rate"], c["status"],
+                                    statuses=VEHICLE_STATUSES),
+        _normalize_vehicle,
+    ),
+    "client": TableFormat(
+        "client", ClientRepository, Client,
+        (("id", _opt_int), ("first_name", _text), ("last_name", _text), ("email", _text), ("phone", _opt_text),
+         ("license_number", _opt_text), ("status", _client_status), ("created_at", _opt_datetime)),
+        lambda c: validate_clients(c["first_name"], c["last_name"], c["email"], c["status"]),
+        _normalize_client,
+    ),
+    "rental": TableFormat(
+        "rental", RentalRepository, Rental,
+        (("id", _opt_int), ("vehicle_id", _int), ("client_id", _int), ("rental_date", _date),
+         ("return_date", _opt_date), ("status", _text), ("created_at", _opt_datetime)),
+        lambda c: validate_rentals(c["vehicle_id"], c["client_id"], c["rental_date"], c["return_date"], c["status"]),
+    ),
+    "maintenance_record": TableFormat(
+        "maintenance_record", MaintenanceRecordRepository, MaintenanceRecord,
+        (("id", _opt_int), ("vehicle_id", _int), ("description", _text), ("cost", _float),
+         ("maintenance_date", _date), ("duration_days", _opt_int), ("created_at", _opt_datetime)),
+        lambda c: validate_maintenance_records(
+            c["vehicle_id"], c["description"], c["cost"], c["maintenance_date"], c["duration_days"]),
+    ),
+}
+
+
+def get_table_format(table):
+    try:
+        return TABLES[table]
+    except KeyError:
+        raise ValueError(f"Unknown table: {table}. Expected one of {sorted(TABLES)}")
+
+
+def detect_format(path, fmt=None):
+    """
+    Explicit `fmt`, else from the extension (.csv, .ndjson / .jsonl).
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(ext)
+        if fmt is None:
+            raise ValueError(f"Cannot tell the format of {path}; pass csv or ndjson")
+    if fmt not in FORMATS:
+        raise ValueError(f"Invalid format: {fmt}. Expected one of {FORMATS}")
+    return fmt
+
+
+def read_records(path, fmt):
+    """
+    Lazily yield one dict per CSV row / NDJSON line.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ---------- import ----------
+@dataclass
+class ImportResult:
+    table: str
+    rows: int = 0
+    imported: int = 0
+    unparseable: int = 0
+    errors: Counter = field(default_factory=Counter)  # ErrorCode name -> rows
+    rejected: Counter = field(default_factory=Counter)  # database constraint message -> rows
+    elapsed: float = 0.0
+
+    @property
+    def invalid(self):
+        return self.unparseable + sum(self.errors.values()) + sum(self.rejected.values())
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def _secondary_indexes(conn, table):
+    """
+    (name, sql) of the non-unique indexes on `table`, which are safe to
+    drop during a load and rebuild once afterwards. Unique indexes stay:
+    they enforce constraints such as one open rental per vehicle.
+    """
+    indexes = []
+    for row in conn.execute(f"PRAGMA index_list({table})"):
+        name, unique, origin = row[1], row[2], row[3]
+        if unique or origin != "c":
+            continue
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()[0]
+        indexes.append((name, sql))
+    return indexes
+
+
+def _convert_chunk(spec, records, result):
+    """
+    Columns of the rows in `records` that convert cleanly; others are counted.
+    """
+    # Fast path: convert whole columns at once; a single bad value sends
+    # the chunk through the row-by-row path that can skip it
+    try:
+        columns = {
+            name: list(map(convert, [record.get(name) for record in records]))
+            for name, convert in spec.fields
+        }
+        return columns, len(records)
+    except (TypeError, ValueError):
+        pass
+    columns = {name: [] for name in spec.columns}
+    kept = 0
+    for record in records:
+        try:
+            values = [convert(record.get(name)) for name, convert in spec.fields]
+        except (TypeError, ValueError):
+            result.unparseable += 1
+            continue
+        for (name, _), value in zip(spec.fields, values):
+            columns[name].append(value)
+        kept += 1
+    return columns, kept
+
+
+def import_records(table, records, connection_factory=get_db_connection, chunk_size=DEFAULT_CHUNK_SIZE,
+                   upsert=False, defer_indexes=True, progress=None):
+    """
+    Load an iterable of dicts into `table`, `chunk_size` rows per transaction.
+
+    Each chunk is converted column by column, checked with the columnar
+    validator, and its valid rows go through the repository's bulk_insert
+    (or bulk_upsert on the default conflict key). Invalid rows are counted
+    per error code and skipped; rows the database still rejects are counted
+    in `rejected` without aborting the load. With defer_indexes the table's
+    non-unique indexes are dropped for the load and built once at the end,
+    followed by ANALYZE. `progress(result)` is called after every chunk.
+    """
+    spec = get_table_format(table)
+    result = ImportResult(table)
+    started = time.perf_counter()
+    with connection_factory() as conn:
+        repo = spec.repository(conn)
+        dropped = _secondary_indexes(conn, table) if defer_indexes else []
+        with conn:
+            # Recorded in the same transaction as the drop, so a crash mid-load
+            # leaves them for initialize_database() to rebuild
+            for name, sql in dropped:
+                conn.execute("INSERT OR REPLACE INTO deferred_index (name, table_name, sql) VALUES (?, ?, ?)",
+                             (name, table, sql))
+                conn.execute(f"DROP INDEX {name}")
+        try:
+            batch = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= chunk_size:
+                    _import_chunk(spec, repo, batch, result, upsert)
+                    batch = []
+                    result.elapsed = time.perf_counter() - started
+                    if progress is not None:
+                        progress(result)
+            if batch:
+                _import_chunk(spec, repo, batch, result, upsert)
+        finally:
+            if dropped:
+                restore_deferred_indexes(conn, table)
+                conn.execute(f"ANALYZE {table}")
+                conn.commit()
+    result.elapsed = time.perf_counter() - started
+    if progress is not None:
+        progress(result)
+    return result
+
+
+def _import_chunk(spec, repo, records, result, upsert):
+    result.rows += len(records)
+    columns, kept = _convert_chunk(spec, records, result)
+    if not kept:
+        return
+    validation = spec.validate(columns)
+    for code, count in validation.error_counts().items():
+        result.errors[code.name] += count
+    rows = (dict(zip(columns, values)) for values in zip(*columns.values()))
+    objs = []
+    for row in compress(rows, validation.mask):
+        if spec.normalize is not None:
+            spec.normalize(row)
+        objs.append(spec.model.from_row(row))
+    if not objs:
+        return
+    write = repo.bulk_upsert if upsert else repo.bulk_insert
+    try:
+        result.imported += write(objs, chunk_size=len(objs))
+    except sqlite3.IntegrityError:
+        # The chunk was rolled back as a whole; replay it row by row so only
+        # the rows the database rejects (duplicate keys, FKs, CHECKs) are lost
+        for obj in objs:
+            try:
+                result.imported += write([obj], chunk_size=1)
+            except sqlite3.IntegrityError as e:
+                result.rejected[str(e)] += 1
+
+
+def import_file(table, path, fmt=None, **kwargs):
+    """
+    import_records() over a CSV or NDJSON file, streamed row by row.
+    """
+    return import_records(table, read_records(path, detect_format(path, fmt)), **kwargs)
+
+
+# ---------- export ----------
+def export_file(table, path, fmt=None, connection_factory=get_db_connection, page_size=DEFAULT_PAGE_SIZE,
+                progress=None, progress_every=100000):
+    """
+    Stream `table` into a CSV or NDJSON file by ascending id, one keyset
+    page at a time, writing the same columns import_file() reads.
+    Returns the number of rows written.
+    """
+    spec = get_table_format(table)
+    fmt = detect_format(path, fmt)
+    columns = spec.repository.columns
+    written = 0
+    with connection_factory() as conn, open(path, "w", newline="", encoding="utf-8") as f:
+        repo = spec.repository(conn)
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            write = writer.writerow
+        else:
+            dumps = json.dumps
+            write = lambda values: f.write(dumps(dict(zip(columns, values)), ensure_ascii=False) + "\n")
+        for obj in repo.iter_all(page_size=page_size):
+            write(repo.to_params(obj))
+            written += 1
+            if progress is not None and written % progress_every == 0:
+                progress(written)
+    if progress is not None:
+        progress(written)
+    return written
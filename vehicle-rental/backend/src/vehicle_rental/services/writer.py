@@ -0,0 +1,213 @@
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+from ..db.connection import get_db_connection
+from ..models import Rental, MaintenanceRecord
+from ..repositories import RentalRepository, MaintenanceRecordRepository
+from .availability import close_rental
+
+DEFAULT_BATCH_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+
+class VehicleAlreadyRentedError(ValueError):
+    """Raised (through the command's future) when the vehicle has an open rental."""
+
+
+# ---------- commands ----------
+@dataclass
+class Checkout:
+    rental: Rental
+
+    def apply(self, conn, writer):
+        try:
+            rental_id = RentalRepository(conn).insert(self.rental, commit=False)
+        except sqlite3.IntegrityError as e:
+            # ux_rental_active_vehicle: at most one rental without return_date per vehicle
+            if "rental.vehicle_id" in str(e):
+                raise VehicleAlreadyRentedError(f"Vehicle {self.rental.vehicle_id} is already rented") from e
+            raise
+        return rental_id
+
+    def after_commit(self, availability):
+        availability.track_rental(self.rental)
+
+
+@dataclass
+class Return:
+    rental_id: int
+    return_date: date
+    status: str = 'completed'
+    # Filled in by apply() for the post-commit index update
+    vehicle_id: Optional[int] = field(default=None, init=False)
+    rental_date: Optional[date] = field(default=None, init=False)
+
+    def apply(self, conn, writer):
+        self.vehicle_id, self.rental_date = close_rental(
+            conn, self.rental_id, self.return_date, self.status, writer.rollups
+        )
+        return None
+
+    def after_commit(self, availability):
+        availability.track_return(self.vehicle_id, self.rental_date, self.return_date, self.status)
+
+
+@dataclass
+class AddMaintenance:
+    record: MaintenanceRecord
+
+    def apply(self, conn, writer):
+        # Rollups are folded in by the writer once the batch is committed
+        return MaintenanceRecordRepository(conn).insert(self.record, commit=False)
+
+    def after_commit(self, availability):
+        availability.track_maintenance(self.record)
+
+
+_STOP = object()
+
+
+class RentalWriter:
+    """
+    Serializes checkout / return / maintenance writes through one thread.
+
+    Callers enqueue commands and get a Future back. The writer thread takes
+    everything queued (up to `batch_size` commands), runs the batch inside a
+    single BEGIN IMMEDIATE transaction and commits once, so there is never
+    more than one writer competing for the SQLite lock and the commit cost
+    is shared by the whole batch. Each command runs under its own SAVEPOINT:
+    a failing command (e.g. VehicleAlreadyRentedError) is rolled back alone
+    and only its future gets the exception.
+
+    `availability` (an AvailabilityService) and `rollups` (a RollupService)
+    are optional and kept current exactly as the direct service calls do.
+    """
+
+    def __init__(self, connection_factory=get_db_connection, batch_size=DEFAULT_BATCH_SIZE,
+                 availability=None, rollups=None):
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be positive: {batch_size}")
+        self.connection_factory = connection_factory
+        self.batch_size = batch_size
+        self.availability = availability
+        self.rollups = rollups
+        self.batches = 0
+        self.commands = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="rental-writer", daemon=True)
+        self._closed = False
+        self._closing = threading.Lock()  # no command can be queued behind _STOP
+        self._thread.start()
+
+    # ---------- producer side ----------
+    def submit(self, command):
+        future = Future()
+        with self._closing:
+            if self._closed:
+                raise RuntimeError("Rental writer is closed")
+            self._queue.put((command, future))
+        return future
+
+    def checkout(self, rental):
+        """Future resolving to the new rental id."""
+        return self.submit(Checkout(rental))
+
+    def return_rental(self, rental_id, return_date, status='completed'):
+        """Future resolving to None once the return is committed."""
+        return self.submit(Return(rental_id, return_date, status))
+
+    def add_maintenance(self, record):
+        """Future resolving to the new maintenance record id."""
+        return self.submit(AddMaintenance(record))
+
+    def close(self, timeout=None):
+        """
+        Stop accepting commands, finish everything queued and stop the thread.
+        """
+        with self._closing:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- writer thread ----------
+    def _next_batch(self):
+        batch = []
+        item = self._queue.get()
+        while item is not _STOP:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        outcomes = []
+        try:
+            with self.connection_factory() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for command, _ in batch:
+                        conn.execute("SAVEPOINT command")
+                        try:
+                            outcomes.append((True, command.apply(conn, self)))
+                            conn.execute("RELEASE command")
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO command")
+                            conn.execute("RELEASE command")
+                            outcomes.append((False, e))
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                # catch_up_maintenance commits on its own, so it runs after
+                # the batch, as AvailabilityService.add_maintenance does
+                if self.rollups is not None and any(
+                    ok and isinstance(command, AddMaintenance) for (command, _), (ok, _) in zip(batch, outcomes)
+                ):
+                    try:
+                        self.rollups.catch_up_maintenance(conn)
+                    except Exception:
+                        logger.exception("Maintenance rollup catch-up failed; the next catch-up will retry")
+        except Exception as e:
+            # The batch as a whole failed (e.g. the commit); nothing was written
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.commands += len(batch)
+        for (command, future), (ok, value) in zip(batch, outcomes):
+            if not ok:
+                future.set_exception(value)
+                continue
+            if self.availability is not None:
+                try:
+                    command.after_commit(self.availability)
+                except Exception:
+                    # The write is committed; a stale index must not hang the future or kill the thread
+                    logger.exception("Availability update failed after %s was committed", type(command).__name__)
+            future.set_result(value)
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date
+from vehicle_rental.db import connection
+from vehicle_rental.db.aio import AsyncDatabase
+from vehicle_rental.models import Vehicle, Client, Rental
+
+SLOW_QUERY = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000)
+    SELECT COUNT(*) FROM n
+"""
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        connection.configure_pool(db_path=self.db_path, size=1)
+        connection.initialize_database()
+        connection.close_pool()
+        self.db = AsyncDatabase(db_path=self.db_path, size=2)
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        self.tmpdir.cleanup()
+
+    async def test_repository_methods(self):
+        """Test that repository operations are awaitable with the same signatures"""
+        vehicle_id = await self.db.vehicles.insert(
+            Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+        vehicle = await self.db.vehicles.get_by_license_plate("B1")
+        self.assertEqual(vehicle.id, vehicle_id)
+        self.assertEqual(await self.db.vehicles.count(), 1)
+        with self.assertRaises(AttributeError):
+            self.db.vehicles.missing_method
+
+    async def test_stream_pages(self):
+        """Test that iter_* methods are async iterators over every row"""
+        await self.db.vehicles.bulk_insert([
+            Vehicle(license_plate=f"B{i}", brand="Dacia", model="Logan", year=2020, daily_rate=30) for i in range(7)])
+        plates = [v.license_plate async for v in self.db.vehicles.iter_all(page_size=3)]
+        self.assertEqual(plates, [f"B{i}" for i in range(7)])
+
+    async def test_concurrent_requests_are_bounded(self):
+        """Test that many concurrent calls complete without exceeding the pool"""
+        results = await asyncio.gather(*(self.db.execute("SELECT ?", (i,)) for i in range(50)))
+        self.assertEqual([rows[0][0] for rows in results], list(range(50)))
+        self.assertLessEqual(self.db.pool.open_count, 2)
+
+    async def test_transaction_rolls_back_on_error(self):
+        """Test that a failing transaction leaves no partial writes"""
+        def failing(conn):
+            conn.execute("INSERT INTO client (first_name, last_name, email) VALUES ('A', 'B', 'a@b.ro')")
+            raise ValueError("boom")
+        with self.assertRaises(ValueError):
+            await self.db.transaction(failing)
+        self.assertEqual(await self.db.clients.count(), 0)
+
+    async def test_cancel_interrupts_query(self):
+        """Test that cancelling a task stops its SQLite statement"""
+        task = asyncio.create_task(self.db.execute(SLOW_QUERY))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # the worker is free again well before the query could have finished
+        await asyncio.wait_for(asyncio.gather(*(self.db.execute("SELECT 1") for _ in range(4))), timeout=5)
+        self.assertLess(time.perf_counter() - started, 5)
+
+    async def test_cancelled_call_holds_its_slot_until_the_worker_finishes(self):
+        """Test that cancelling a task does not let another call onto a busy connection"""
+        await self.db.close()
+        self.db = AsyncDatabase(db_path=self.db_path, size=2, max_concurrency=1)
+        release = threading.Event()
+        order = []
+
+        def blocking(conn):
+            release.wait(5)
+            order.append("first")
+
+        first = asyncio.create_task(self.db.run(blocking))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        second = asyncio.create_task(self.db.run(lambda conn: order.append("second")))
+        await asyncio.sleep(0.05)
+        self.assertFalse(second.done())
+        release.set()
+        await asyncio.wait_for(second, timeout=5)
+        self.assertEqual(order, ["first", "second"])
+
+    async def test_services(self):
+        """Test that the writer, availability and rollup services are awaitable"""
+        vehicle_id = await self.db.vehicles.insert(
+            Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+        client_id = await self.db.clients.insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+        await self.db.availability.load()
+        rental_id = await self.db.writer.checkout(
+            Rental(vehicle_id=vehicle_id, client_id=client_id, rental_date=date(2024, 1, 1)))
+        self.assertFalse(await self.db.availability.is_available(vehicle_id, date(2024, 1, 2), date(2024, 1, 3)))
+        await self.db.writer.return_rental(rental_id, date(2024, 1, 3))
+        self.assertTrue(await self.db.availability.is_available(vehicle_id, date(2024, 1, 4), date(2024, 1, 5)))
+        self.assertEqual(await self.db.rollups.revenue(date(2024, 1, 1), date(2024, 2, 1)), 60)
+        with self.assertRaises(AttributeError):
+            self.db.rollups.missing_method
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from vehicle_rental.db import connection
+from vehicle_rental.models import Vehicle, Client, Rental, MaintenanceRecord
+from vehicle_rental.repositories import VehicleRepository, ClientRepository
+from vehicle_rental.services import AvailabilityIndex, AvailabilityService
+
+class TestAvailabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = AvailabilityIndex()
+        for vid in (1, 2, 3):
+            self.index.add_vehicle(vid)
+
+    def test_free_vehicle(self):
+        """Test that a vehicle without intervals is available"""
+        self.assertTrue(self.index.is_available(1, date(2024, 1, 1), date(2024, 1, 5)))
+
+    def test_overlap_and_touching_ranges(self):
+        """Test half-open overlap semantics"""
+        self.index.add_interval(1, date(2024, 1, 10), date(2024, 1, 15))
+        self.assertFalse(self.index.is_available(1, date(2024, 1, 14), date(2024, 1, 20)))
+        self.assertFalse(self.index.is_available(1, date(2024, 1, 1), date(2024, 1, 11)))
+        self.assertTrue(self.index.is_available(1, date(2024, 1, 15), date(2024, 1, 20)))
+        self.assertTrue(self.index.is_available(1, date(2024, 1, 1), date(2024, 1, 10)))
+
+    def test_long_interval_found_from_window(self):
+        """Test that a long interval starting well before the query is detected"""
+        self.index.add_interval(2, date(2024, 1, 1), date(2024, 3, 1))
+        self.index.add_interval(2, date(2024, 3, 5), date(2024, 3, 6))
+        self.assertFalse(self.index.is_available(2, date(2024, 2, 10), date(2024, 2, 11)))
+        self.assertEqual(self.index.busy_vehicles(date(2024, 2, 10), date(2024, 2, 11)), {2})
+
+    def test_open_rental(self):
+        """Test that an open rental blocks every range after its start"""
+        self.index.add_interval(3, date(2024, 5, 1))
+        self.assertFalse(self.index.is_available(3, date(2030, 1, 1), date(2030, 1, 2)))
+        self.assertTrue(self.index.is_available(3, date(2024, 4, 1), date(2024, 5, 1)))
+        self.index.close_interval(3, date(2024, 5, 10))
+        self.assertTrue(self.index.is_available(3, date(2024, 5, 10), date(2024, 5, 12)))
+        self.assertFalse(self.index.is_available(3, date(2024, 5, 9), date(2024, 5, 12)))
+
+    def test_available_vehicles(self):
+        """Test fleet-wide availability"""
+        self.index.add_interval(1, date(2024, 1, 1))
+        self.index.add_interval(2, date(2024, 1, 1), date(2024, 1, 3))
+        self.assertEqual(self.index.available_vehicles(date(2024, 1, 2), date(2024, 1, 4)), {3})
+        self.assertEqual(self.index.available_vehicles(date(2024, 1, 3), date(2024, 1, 4)), {2, 3})
+
+    def test_available_vehicles_is_a_snapshot(self):
+        """Test that a fleet query result does not change when the index does"""
+        free = self.index.available_vehicles(date(2024, 1, 2), date(2024, 1, 4))
+        self.assertIn(1, free)
+        self.index.add_interval(1, date(2024, 1, 1))
+        self.index.remove_vehicle(2)
+        self.assertEqual(free, {1, 2, 3})
+        self.assertEqual(self.index.available_vehicles(date(2024, 1, 2), date(2024, 1, 4)), {3})
+
+    def test_bulk_load_matches_single_adds(self):
+        """Test that add_intervals builds the same index as add_interval"""
+        intervals = [
+            (2, date(2024, 3, 5), date(2024, 3, 6)),
+            (1, date(2021, 1, 1), date(2024, 1, 1)),   # three years long
+            (2, date(2024, 1, 1), date(2024, 3, 1)),
+            (3, date(2024, 2, 1), None),
+        ]
+        bulk = AvailabilityIndex()
+        for vid in (1, 2, 3):
+            bulk.add_vehicle(vid)
+        bulk.add_intervals(intervals)
+        for interval in intervals:
+            self.index.add_interval(*interval)
+        for start, end in [(date(2023, 6, 1), date(2023, 6, 2)), (date(2024, 2, 10), date(2024, 2, 11)),
+                           (date(2024, 3, 2), date(2024, 3, 5)), (date(2020, 1, 1), date(2020, 1, 2))]:
+            self.assertEqual(bulk.available_vehicles(start, end), self.index.available_vehicles(start, end))
+            for vid in (1, 2, 3):
+                self.assertEqual(bulk.is_available(vid, start, end), self.index.is_available(vid, start, end))
+        self.assertEqual(bulk.available_vehicles(date(2023, 6, 1), date(2023, 6, 2)), {2, 3})
+
+    def test_unknown_vehicle_and_invalid_range(self):
+        """Test unknown vehicles and empty ranges"""
+        self.assertFalse(self.index.is_available(99, date(2024, 1, 1), date(2024, 1, 2)))
+        with self.assertRaises(ValueError):
+            self.index.is_available(1, date(2024, 1, 2), date(2024, 1, 2))
+
+class TestAvailabilityService(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=2)
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            vehicles = VehicleRepository(conn)
+            self.v1 = vehicles.insert(Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+            self.v2 = vehicles.insert(Vehicle(license_plate="B2", brand="Dacia", model="Duster", year=2021, daily_rate=40))
+            self.client = ClientRepository(conn).insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def check_both_modes(self, service, start, end, expected):
+        self.assertEqual(service.available_vehicles(start, end), expected)
+        service.use_index = False
+        self.assertEqual(service.available_vehicles(start, end), expected)
+        service.use_index = True
+
+    def test_index_and_sql_agree(self):
+        """Test that indexed answers match the SQL fallback"""
+        service = AvailabilityService()
+        service.load()
+        rental_id = service.create_rental(Rental(vehicle_id=self.v1, client_id=self.client, rental_date=date(2024, 1, 1)))
+        service.add_maintenance(MaintenanceRecord(
+            vehicle_id=self.v2, description="Tyres", cost=200, maintenance_date=date(2024, 1, 3), duration_days=2))
+        self.check_both_modes(service, date(2024, 1, 2), date(2024, 1, 4), set())
+        self.check_both_modes(service, date(2024, 1, 5), date(2024, 1, 6), {self.v2})
+
+        service.return_rental(rental_id, date(2024, 1, 4))
+        self.check_both_modes(service, date(2024, 1, 4), date(2024, 1, 5), {self.v1})
+        self.assertTrue(service.is_available(self.v1, date(2024, 1, 4), date(2024, 1, 5)))
+
+    def test_load_from_existing_rows(self):
+        """Test that load() picks up rentals already in the database"""
+        AvailabilityService().create_rental(Rental(vehicle_id=self.v2, client_id=self.client, rental_date=date(2024, 2, 1)))
+        service = AvailabilityService()
+        service.load()
+        self.assertEqual(service.available_vehicles(date(2024, 3, 1), date(2024, 3, 2)), {self.v1})
+
+    def test_return_unknown_rental(self):
+        """Test that returning a rental that is not open raises ValueError"""
+        with self.assertRaises(ValueError):
+            AvailabilityService().return_rental(12345, date(2024, 1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
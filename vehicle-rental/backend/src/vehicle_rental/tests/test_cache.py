@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+from vehicle_rental.db import connection
+from vehicle_rental.models import Vehicle, Client
+from vehicle_rental.repositories import VehicleRepository, ClientRepository
+from vehicle_rental.services import LRUCache, LookupCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_order(self):
+        """Test that the least recently used entry is evicted"""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL"""
+        cache = LRUCache(maxsize=2, ttl=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.expirations, 1)
+
+class TestLookupCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=2)
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            self.vehicle_id = VehicleRepository(conn).insert(
+                Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+            self.client_id = ClientRepository(conn).insert(
+                Client(first_name="Ana", last_name="Pop", email="ana@example.com", license_number="DL1"))
+        self.cache = LookupCache(maxsize=10)
+
+    def tearDown(self):
+        self.cache.close()
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def test_read_through_and_aliases(self):
+        """Test that lookups by id and alias share one cached entry"""
+        self.assertEqual(self.cache.get_vehicle(self.vehicle_id).license_plate, "B1")
+        self.assertEqual(self.cache.get_vehicle_by_license_plate(" b1 ").id, self.vehicle_id)
+        self.assertEqual(self.cache.get_client_by_email("ANA@example.com").id, self.client_id)
+        self.assertEqual(self.cache.get_client_by_license_number("DL1").id, self.client_id)
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["size"], 2)
+
+    def test_returns_copies(self):
+        """Test that mutating a returned object does not change the cache"""
+        v = self.cache.get_vehicle(self.vehicle_id)
+        v.daily_rate = 999
+        self.assertEqual(self.cache.get_vehicle(self.vehicle_id).daily_rate, 30)
+
+    def test_update_invalidates(self):
+        """Test that repository updates invalidate cached entries"""
+        v = self.cache.get_vehicle_by_license_plate("B1")
+        v.daily_rate = 45.0
+        with connection.get_db_connection() as conn:
+            VehicleRepository(conn).update(v)
+        self.assertEqual(self.cache.get_vehicle(self.vehicle_id).daily_rate, 45.0)
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_upsert_invalidates_by_alias(self):
+        """Test that an upsert keyed on email invalidates the cached client"""
+        self.cache.get_client(self.client_id)
+        with connection.get_db_connection() as conn:
+            ClientRepository(conn).upsert(
+                Client(first_name="Anna", last_name="Pop", email="ana@example.com", license_number="DL1"))
+        self.assertEqual(self.cache.get_client(self.client_id).first_name, "Anna")
+
+    def test_delete_invalidates(self):
+        """Test that deleting a row removes it from the cache"""
+        self.cache.get_client_by_email("ana@example.com")
+        with connection.get_db_connection() as conn:
+            self.assertTrue(ClientRepository(conn).delete(self.client_id))
+        self.assertIsNone(self.cache.get_client_by_email("ana@example.com"))
+
+    def test_bounded_size(self):
+        """Test that the cache never grows past maxsize"""
+        cache = LookupCache(maxsize=1)
+        try:
+            cache.get_vehicle(self.vehicle_id)
+            cache.get_client(self.client_id)
+            self.assertEqual(cache.stats()["size"], 1)
+            self.assertEqual(cache.stats()["aliases"], 2)  # the client's email and license number
+        finally:
+            cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
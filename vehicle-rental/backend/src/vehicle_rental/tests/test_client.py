@@ -124,5 +124,16 @@ class TestClient(unittest.TestCase):
                 email="john.doe@example.com"
             )
 
+    def test_from_row_skips_validation(self):
+        """Test trusted construction from a database row"""
+        c = Client.from_row({
+            "id": 3, "first_name": "John", "last_name": "Doe", "email": "john.doe@example.com",
+            "phone": None, "license_number": "DL1", "status": 0, "created_at": None,
+        })
+        self.assertEqual(c.id, 3)
+        self.assertEqual(c.status, 0)
+        self.assertEqual(c.license_number, "DL1")
+        self.assertFalse(hasattr(c, "__dict__"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
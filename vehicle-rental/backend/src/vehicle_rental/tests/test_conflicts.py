@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import date
+from vehicle_rental.db import connection
+from vehicle_rental.models import Vehicle, Client, Rental, MaintenanceRecord
+from vehicle_rental.repositories import (
+    VehicleRepository, ClientRepository, RentalRepository, MaintenanceRecordRepository
+)
+from vehicle_rental.services import ConflictDetector
+from vehicle_rental.services.conflicts import rental_window, maintenance_window, sweep
+
+class TestSweep(unittest.TestCase):
+    def test_matches_pairwise_comparison(self):
+        """Test that the sweep finds exactly the pairwise overlaps"""
+        rng = random.Random(7)
+        windows = []
+        for i in range(300):
+            start = date(2024, 1, 1).toordinal() + rng.randrange(200)
+            end = None if rng.random() < 0.02 else date.fromordinal(start + rng.randrange(0, 10))
+            if rng.random() < 0.5:
+                windows.append(rental_window(rng.randrange(5), date.fromordinal(start), end, i))
+            else:
+                windows.append(maintenance_window(rng.randrange(5), date.fromordinal(start), rng.choice([None, 1, 3]), i))
+        expected = {
+            frozenset((a.ref, b.ref)) for i, a in enumerate(windows) for b in windows[i + 1:]
+            if a.vehicle_id == b.vehicle_id and a.start < b.end and b.start < a.end
+        }
+        found = {frozenset((c.first.ref, c.second.ref)) for c in sweep(windows)}
+        self.assertEqual(found, expected)
+
+    def test_touching_windows_do_not_conflict(self):
+        """Test half-open semantics and the overlap range"""
+        a = rental_window(1, date(2024, 1, 1), date(2024, 1, 5), 1)
+        b = maintenance_window(1, date(2024, 1, 5), 2, 2)
+        c = rental_window(1, date(2024, 1, 6), None, 3)
+        conflicts = list(sweep([c, b, a]))
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual((conflicts[0].start, conflicts[0].end), (date(2024, 1, 6), date(2024, 1, 7)))
+        self.assertEqual(set(conflicts[0].kinds), {"rental", "maintenance"})
+
+class TestConflictDetector(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=2)
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            vehicles = VehicleRepository(conn)
+            self.v1 = vehicles.insert(Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+            self.v2 = vehicles.insert(Vehicle(license_plate="B2", brand="Dacia", model="Duster", year=2021, daily_rate=40))
+            self.client = ClientRepository(conn).insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+            RentalRepository(conn).bulk_insert([
+                Rental(vehicle_id=self.v1, client_id=self.client, rental_date=date(2024, 1, 1),
+                       return_date=date(2024, 1, 10), status="completed"),
+                Rental(vehicle_id=self.v1, client_id=self.client, rental_date=date(2024, 1, 8),
+                       return_date=date(2024, 1, 9), status="cancelled"),
+            ])
+            MaintenanceRecordRepository(conn).bulk_insert([
+                MaintenanceRecord(vehicle_id=self.v1, description="Oil", cost=50, maintenance_date=date(2024, 1, 9)),
+            ])
+        self.detector = ConflictDetector()
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def rental(self, vehicle_id, start, end):
+        return Rental(vehicle_id=vehicle_id, client_id=self.client, rental_date=start, return_date=end, status="completed")
+
+    def test_audit_finds_stored_overlaps(self):
+        """Test that the audit reports the rental/maintenance overlap and ignores cancellations"""
+        conflicts = self.detector.audit()
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0].start, date(2024, 1, 9))
+
+    def test_check_batch(self):
+        """Test a batch against history and against itself"""
+        result = self.detector.check([
+            self.rental(self.v1, date(2024, 1, 5), date(2024, 1, 6)),        # overlaps stored rental
+            self.rental(self.v1, date(2024, 1, 10), date(2024, 1, 12)),      # free
+            self.rental(self.v2, date(2024, 2, 1), date(2024, 2, 3)),        # overlaps next item
+            MaintenanceRecord(vehicle_id=self.v2, description="Tyres", cost=10, maintenance_date=date(2024, 2, 2)),
+        ])
+        self.assertFalse(result.ok)
+        self.assertEqual(result.accepted(), [1])
+        self.assertEqual(result.rejected(), [0, 2, 3])
+        self.assertEqual(len(result.conflicts), 2)
+        with self.assertRaises(TypeError):
+            self.detector.check([object()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from vehicle_rental.db import connection
+from vehicle_rental.db.instrumentation import QueryRecorder, normalize_sql
+
+class TestNormalizeSql(unittest.TestCase):
+    def test_literals_and_in_lists(self):
+        """Test that statements differing only in values normalize alike"""
+        self.assertEqual(
+            normalize_sql("SELECT *  FROM rental\n WHERE id IN (1, 2, 3) AND status = 'active' AND x = 1.5;"),
+            "SELECT * FROM rental WHERE id IN (?...) AND status = ? AND x = ?",
+        )
+        self.assertEqual(normalize_sql("SELECT v2.id FROM t1"), "SELECT v2.id FROM t1")
+
+class TestQueryRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "logs", "slow.log")
+        self.recorder = QueryRecorder(slow_threshold=None, slow_log_path=self.log_path)
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=1, recorder=self.recorder)
+        connection.initialize_database()
+        self.recorder.reset()
+
+    def tearDown(self):
+        connection.close_pool()
+        self.recorder.close()
+        self.tmpdir.cleanup()
+
+    def test_statements_are_aggregated(self):
+        """Test calls, rows and caller per normalized statement"""
+        with connection.get_db_connection() as conn:
+            conn.executemany("INSERT INTO client (first_name, last_name, email) VALUES (?, ?, ?)",
+                             [("A", "B", f"a{i}@b.ro") for i in range(5)])
+            conn.commit()
+            for i in range(3):
+                conn.execute(f"SELECT * FROM client WHERE id > {i}").fetchall()
+            rows = list(conn.execute("SELECT id FROM client"))
+        self.assertEqual(len(rows), 5)
+        stats = {s.sql: s for s in self.recorder.stats()}
+        select = stats["SELECT * FROM client WHERE id > ?"]
+        self.assertEqual(select.calls, 3)
+        self.assertEqual(select.rows, 5 + 4 + 3)
+        self.assertEqual(sum(select.buckets), 3)
+        self.assertTrue(all(caller.startswith("test_instrumentation.py:") for caller in select.callers))
+        self.assertEqual(stats["SELECT id FROM client"].rows, 5)
+        self.assertEqual(stats["INSERT INTO client (first_name, last_name, email) VALUES (?, ?, ?)"].rows, 5)
+
+    def test_slow_queries_are_logged(self):
+        """Test that statements over the threshold go to the slow-query log"""
+        self.recorder.slow_threshold = 0
+        with connection.get_db_connection() as conn:
+            conn.execute("SELECT COUNT(*) FROM rental").fetchone()
+        self.recorder.close()
+        with open(self.log_path, encoding="utf-8") as f:
+            self.assertIn("sql=SELECT COUNT(*) FROM rental", f.read())
+
+    def test_explain_top(self):
+        """Test that the top statements come with their query plan"""
+        with connection.get_db_connection() as conn:
+            conn.execute("SELECT * FROM rental WHERE rental_date >= ?", ("2024-01-01",)).fetchall()
+            conn.execute("SELECT * FROM maintenance_record WHERE cost > ?", (10,)).fetchall()
+            plans = dict((s.sql, plan) for s, plan in self.recorder.explain_top(conn, n=5))
+        self.assertTrue(any("ix_rental_rental_date" in line for line in plans["SELECT * FROM rental WHERE rental_date >= ?"]))
+        self.assertTrue(any(line.startswith("SCAN") for line in plans["SELECT * FROM maintenance_record WHERE cost > ?"]))
+        self.assertIn("calls", self.recorder.report())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from vehicle_rental.db import connection
+from vehicle_rental.models import Vehicle, MaintenanceRecord
+from vehicle_rental.repositories import VehicleRepository, MaintenanceRecordRepository
+from vehicle_rental.services import MaintenanceAnalytics, VehicleTimeline
+
+TODAY = date(2024, 7, 1)
+
+class TestVehicleTimeline(unittest.TestCase):
+    def test_out_of_order_records(self):
+        """Test that totals and interval do not depend on record order"""
+        t = VehicleTimeline(1, "Dacia")
+        t.add(100, date(2024, 3, 1), 2)
+        t.add(50, date(2024, 1, 1), None)
+        t.add(70, date(2024, 2, 1), 1)
+        self.assertEqual((t.services, t.total_cost, t.downtime_days), (3, 220, 4))
+        self.assertEqual((t.first_service, t.last_service, t.last_cost), (date(2024, 1, 1), date(2024, 3, 1), 100))
+        self.assertEqual(t.mean_interval, 30)
+        self.assertEqual(t.due_date(90), date(2024, 5, 30))
+        self.assertEqual(t.due_date(90, use_history=True), date(2024, 3, 31))
+
+class TestMaintenanceAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=2)
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            vehicles = VehicleRepository(conn)
+            self.v1 = vehicles.insert(Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+            self.v2 = vehicles.insert(Vehicle(license_plate="B2", brand="Dacia", model="Duster", year=2021, daily_rate=40))
+            self.v3 = vehicles.insert(Vehicle(license_plate="B3", brand="Ford", model="Focus", year=2021, daily_rate=50))
+            MaintenanceRecordRepository(conn).bulk_insert([
+                MaintenanceRecord(vehicle_id=self.v1, description="Oil", cost=100, maintenance_date=date(2024, 1, 1)),
+                MaintenanceRecord(vehicle_id=self.v2, description="Brakes", cost=400, maintenance_date=date(2024, 6, 1),
+                                  duration_days=3),
+            ])
+        self.analytics = MaintenanceAnalytics(interval_days=180).load()
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def insert_record(self, vehicle_id, cost, day):
+        with connection.get_db_connection() as conn:
+            record = MaintenanceRecord(vehicle_id=vehicle_id, description="Service", cost=cost, maintenance_date=day)
+            MaintenanceRecordRepository(conn).insert(record)
+        return record
+
+    def test_due_soon(self):
+        """Test due-soon ordering, horizon and never-serviced vehicles"""
+        self.assertEqual(self.analytics.due_soon(within_days=30, today=TODAY),
+                         [(self.v3, None, None), (self.v1, date(2024, 6, 29), -2)])
+        self.assertEqual(self.analytics.due_soon(within_days=30, today=TODAY, include_unserviced=False),
+                         [(self.v1, date(2024, 6, 29), -2)])
+
+    def test_top_cost_and_brand_summary(self):
+        """Test rankings and per-brand aggregates"""
+        self.assertEqual(self.analytics.top_cost(2), [(self.v2, 400), (self.v1, 100)])
+        self.assertEqual(self.analytics.top_cost(1, by="downtime_days"), [(self.v2, 3)])
+        with self.assertRaises(ValueError):
+            self.analytics.top_cost(by="mileage")
+        summary = self.analytics.brand_summary(today=TODAY)
+        self.assertEqual(summary["Dacia"]["total_cost"], 500)
+        self.assertEqual(summary["Dacia"]["cost_per_vehicle"], 250)
+        self.assertEqual(summary["Dacia"]["cost_per_day"], round(500 / (182 + 30), 2))
+        self.assertEqual(summary["Ford"]["cost_per_day"], 0.0)
+
+    def test_sold_vehicles_are_excluded_everywhere(self):
+        """Test that every fleet query leaves sold vehicles out"""
+        with connection.get_db_connection() as conn:
+            conn.execute("UPDATE vehicle SET status = 'sold' WHERE id = ?", (self.v2,))
+            conn.commit()
+        analytics = MaintenanceAnalytics(interval_days=180).load()
+        self.assertNotIn(self.v2, [v for v, _, _ in analytics.due_soon(within_days=365, today=TODAY)])
+        self.assertEqual(analytics.top_cost(2), [(self.v1, 100), (self.v3, 0)])
+        summary = analytics.brand_summary(today=TODAY)
+        self.assertEqual((summary["Dacia"]["vehicles"], summary["Dacia"]["total_cost"]), (1, 100))
+
+    def test_incremental_updates_are_not_double_counted(self):
+        """Test add_record and refresh together apply every record once"""
+        pushed = self.insert_record(self.v3, 80, date(2024, 6, 15))
+        self.analytics.add_record(pushed)
+        self.insert_record(self.v3, 20, date(2024, 6, 20))   # written elsewhere
+        self.assertEqual(self.analytics.refresh(), 2)
+        self.assertEqual(self.analytics.refresh(), 0)
+        self.analytics.add_record(pushed)
+        timeline = self.analytics.timeline(self.v3)
+        self.assertEqual((timeline.services, timeline.total_cost), (2, 100))
+
+    def test_refresh_picks_up_vehicles_created_after_load(self):
+        """Test that records of a vehicle unknown to load() are not lost"""
+        with connection.get_db_connection() as conn:
+            vid = VehicleRepository(conn).insert(
+                Vehicle(license_plate="B4", brand="Skoda", model="Octavia", year=2022, daily_rate=45))
+        record = self.insert_record(vid, 150, date(2024, 6, 10))
+        self.analytics.add_record(record)    # not applied yet: the vehicle is unknown
+        self.assertEqual(self.analytics.refresh(), 1)
+        timeline = self.analytics.timeline(vid)
+        self.assertEqual((timeline.brand, timeline.services, timeline.total_cost), ("Skoda", 1, 150))
+        self.analytics.add_vehicle(vid, "Skoda")
+        self.assertEqual(self.analytics.refresh(), 0)
+        self.assertEqual(self.analytics.timeline(vid).services, 1)
+
+if __name__ == '__main__':
+    unittest.main()
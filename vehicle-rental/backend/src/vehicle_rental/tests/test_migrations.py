@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from vehicle_rental.db import migrations
+from vehicle_rental.db.migrations import Migration, MigrationError, Step, create_index, migrate
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.tmpdir.name, "test.db"))
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmpdir.cleanup()
+
+    def index_names(self):
+        return {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    def test_fresh_database_reaches_latest(self):
+        """Test that a new database gets every migration and planner statistics"""
+        self.assertEqual(migrate(self.conn), [m.version for m in migrations.MIGRATIONS])
+        self.assertEqual(migrations.current_version(self.conn), migrations.LATEST_VERSION)
+        self.assertTrue({"ix_maintenance_vehicle_date", "ix_rental_rental_date", "ix_client_last_name"} <= self.index_names())
+        self.assertIsNotNone(self.conn.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone())
+        self.assertEqual(migrate(self.conn), [])
+
+    def test_upgrade_from_baseline(self):
+        """Test that an existing version-1 database only gets the new steps"""
+        migrate(self.conn, target=1)
+        self.assertNotIn("ix_rental_rental_date", self.index_names())
+        self.assertEqual(migrate(self.conn), list(range(2, migrations.LATEST_VERSION + 1)))
+        self.assertIn("ix_rental_rental_date", self.index_names())
+
+    def test_failed_step_keeps_previous_version(self):
+        """Test that a failing migration leaves user_version at the last good migration"""
+        def boom(conn):
+            raise sqlite3.OperationalError("boom")
+        original = migrations.MIGRATIONS
+        migrations.MIGRATIONS = original + [Migration(99, "Broken", [create_index("ix_x", "client", ["email"]), Step("boom", boom)])]
+        try:
+            with self.assertRaises(MigrationError):
+                migrate(self.conn, target=99)
+        finally:
+            migrations.MIGRATIONS = original
+        self.assertEqual(migrations.current_version(self.conn), migrations.LATEST_VERSION)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from vehicle_rental.db.pool import ConnectionPool, PoolTimeoutError
+from vehicle_rental.db import connection
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_connection_is_reused(self):
+        """Test that a released connection is handed out again"""
+        pool = ConnectionPool(self.db_path, size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats.misses, 1)
+        self.assertEqual(pool.stats.hits, 1)
+        pool.close()
+
+    def test_foreign_keys_enabled(self):
+        """Test that pooled connections enforce foreign keys"""
+        pool = ConnectionPool(self.db_path, size=1)
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        pool.close()
+
+    def test_pool_is_bounded(self):
+        """Test that the pool never opens more than `size` connections"""
+        pool = ConnectionPool(self.db_path, size=1, timeout=0.05)
+        conn = pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+        self.assertEqual(pool.stats.waits, 1)
+        self.assertEqual(pool.open_count, 1)
+        pool.release(conn)
+        pool.close()
+
+    def test_waiter_gets_released_connection(self):
+        """Test that a blocked checkout is served when a connection is returned"""
+        pool = ConnectionPool(self.db_path, size=1, timeout=5)
+        conn = pool.acquire()
+        result = []
+        t = threading.Thread(target=lambda: result.append(pool.acquire()))
+        t.start()
+        pool.release(conn)
+        t.join()
+        self.assertIs(result[0], conn)
+        pool.release(result[0])
+        pool.close()
+
+    def test_broken_connection_is_discarded(self):
+        """Test that a connection failing the health check is replaced"""
+        pool = ConnectionPool(self.db_path, size=1)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()
+        with pool.connection() as fresh:
+            self.assertIsNot(fresh, conn)
+        self.assertEqual(pool.stats.discarded, 1)
+        pool.close()
+
+    def test_discard_wakes_waiter(self):
+        """Test that a blocked checkout opens a new connection when one is discarded"""
+        pool = ConnectionPool(self.db_path, size=1, timeout=5)
+        conn = pool.acquire()
+        result = []
+        t = threading.Thread(target=lambda: result.append(pool.acquire()))
+        t.start()
+        while pool.stats.waits == 0:
+            time.sleep(0.001)
+        # Simulate a failed rollback: the connection is dropped, not returned
+        pool._discard(conn)
+        t.join(timeout=5)
+        self.assertFalse(t.is_alive())
+        self.assertIsNot(result[0], conn)
+        self.assertEqual(pool.open_count, 1)
+        pool.release(result[0])
+        pool.close()
+
+    def test_idle_hook_runs_off_the_releasing_thread(self):
+        """Test that release does not wait for the on_idle hook"""
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def on_idle(conn):
+            started.set()
+            proceed.wait(5)
+
+        pool = ConnectionPool(self.db_path, size=2, timeout=5, on_idle=on_idle)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertTrue(started.wait(5))
+        # The hook still holds the connection, so the next checkout opens another
+        with pool.connection() as other:
+            self.assertIsNot(other, conn)
+        proceed.set()
+        self.assertTrue(pool.wait_idle_hook(timeout=5))
+        self.assertEqual(pool.idle_count, 2)
+        pool.close()
+
+    def test_idle_hook_waits_for_interval(self):
+        """Test that no idle thread is started before idle_interval has elapsed"""
+        calls = []
+        pool = ConnectionPool(self.db_path, size=1, on_idle=calls.append, idle_interval=3600)
+        for _ in range(3):
+            with pool.connection():
+                pass
+            self.assertIsNone(pool._idle_thread)
+        self.assertEqual(calls, [])
+        self.assertEqual(pool.idle_count, 1)
+        pool.close()
+
+    def test_uncommitted_work_is_rolled_back(self):
+        """Test that uncommitted writes do not leak to the next checkout"""
+        pool = ConnectionPool(self.db_path, size=1)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        pool.close()
+
+    def test_get_db_connection_uses_configured_pool(self):
+        """Test that get_db_connection draws from the configured pool"""
+        pool = connection.configure_pool(db_path=self.db_path, size=2)
+        try:
+            with connection.get_db_connection() as conn:
+                conn.execute("SELECT 1")
+            pool.wait_idle_hook(timeout=5)
+            with connection.get_db_connection() as conn:
+                conn.execute("SELECT 1")
+            self.assertEqual(pool.stats.hits, 1)
+        finally:
+            connection.close_pool()
+
+if __name__ == '__main__':
+    unittest.main()
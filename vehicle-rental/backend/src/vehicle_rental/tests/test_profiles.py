@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from vehicle_rental.db.profiles import PragmaProfile, PROFILES, get_profile
+from vehicle_rental.db import connection
+
+class TestPragmaProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def test_performance_profile_applied(self):
+        """Test that the performance profile switches the database to WAL"""
+        conn = sqlite3.connect(self.db_path)
+        PROFILES["performance"].apply(conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        conn.close()
+
+    def test_default_profile_keeps_rollback_journal(self):
+        """Test that the default profile leaves the journal mode alone"""
+        connection.configure_pool(db_path=self.db_path, size=1, profile="default")
+        with connection.get_db_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+
+    def test_configure_pool_with_profile_name(self):
+        """Test that pooled connections get the selected profile"""
+        pool = connection.configure_pool(db_path=self.db_path, size=1, profile="performance")
+        self.assertIs(pool.profile, PROFILES["performance"])
+        with connection.get_db_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_custom_profile_overrides(self):
+        """Test overriding individual PRAGMAs of a profile"""
+        profile = PROFILES["performance"].with_overrides(busy_timeout=250)
+        conn = sqlite3.connect(self.db_path)
+        profile.apply(conn)
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 250)
+        conn.close()
+
+    def test_invalid_values(self):
+        """Test that invalid PRAGMA values are rejected"""
+        with self.assertRaises(ValueError):
+            PragmaProfile(name="bad", journal_mode="fast")
+        with self.assertRaises(ValueError):
+            PragmaProfile(name="bad", synchronous="sometimes")
+        with self.assertRaises(ValueError) as cm:
+            get_profile("turbo")
+        self.assertIn("Unknown database profile", str(cm.exception))
+
+    def test_checkpoint(self):
+        """Test running a WAL checkpoint"""
+        connection.configure_pool(db_path=self.db_path, size=1, profile="performance")
+        with connection.get_db_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            busy, _, _ = connection.checkpoint(conn, "truncate")
+            self.assertEqual(busy, 0)
+            with self.assertRaises(ValueError):
+                connection.checkpoint(conn, "sometimes")
+
+    def test_idle_checkpoint_hook(self):
+        """Test that the pool checkpoints when it goes idle"""
+        profile = PROFILES["performance"].with_overrides(checkpoint_interval=0.0001)
+        pool = connection.configure_pool(db_path=self.db_path, size=2, profile=profile)
+        calls = []
+        hook = pool.on_idle
+        pool.on_idle = lambda conn: (calls.append(conn), hook(conn))
+        with pool.connection():
+            with pool.connection():
+                pass
+            self.assertEqual(calls, [])
+        self.assertTrue(pool.wait_idle_hook(timeout=5))
+        self.assertEqual(len(calls), 1)
+
+if __name__ == '__main__':
+    unittest.main()
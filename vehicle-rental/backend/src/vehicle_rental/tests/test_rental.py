@@ -170,5 +170,16 @@ class TestRental(unittest.TestCase):
             )
         self.assertIn("Rental date cannot be in the future", str(cm.exception))
 
+    def test_from_row_parses_dates(self):
+        """Test trusted construction parses ISO dates from the database"""
+        r = Rental.from_row({
+            "id": 1, "vehicle_id": 2, "client_id": 3, "rental_date": "2024-01-01",
+            "return_date": "2024-01-05", "status": "completed", "created_at": "2024-01-01 10:00:00",
+        })
+        self.assertEqual(r.rental_date, datetime(2024, 1, 1).date())
+        self.assertEqual(r.return_date, datetime(2024, 1, 5).date())
+        self.assertEqual(r.created_at, datetime(2024, 1, 1, 10, 0, 0))
+        self.assertFalse(hasattr(r, "__dict__"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import sqlite3
+import unittest
+from datetime import date
+from vehicle_rental.db.schema import create_tables
+from vehicle_rental.models import Vehicle, Client, Rental, MaintenanceRecord
+from vehicle_rental.repositories import (
+    VehicleRepository, ClientRepository, RentalRepository, MaintenanceRecordRepository
+)
+
+def make_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.row_factory = sqlite3.Row
+    create_tables(conn)
+    return conn
+
+def make_vehicle(i, daily_rate=50.0):
+    return Vehicle(license_plate=f"B{i:06d}", brand="toyota", model="camry", year=2020, daily_rate=daily_rate)
+
+class TestRepositories(unittest.TestCase):
+    def setUp(self):
+        self.conn = make_conn()
+        self.vehicles = VehicleRepository(self.conn)
+        self.clients = ClientRepository(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_insert_and_get_vehicle(self):
+        """Test inserting a vehicle and reading it back"""
+        v = make_vehicle(1)
+        vehicle_id = self.vehicles.insert(v)
+        self.assertEqual(v.id, vehicle_id)
+        loaded = self.vehicles.get(vehicle_id)
+        self.assertEqual(loaded.license_plate, "B000001")
+        self.assertEqual(loaded.brand, "Toyota")
+        self.assertIsNotNone(loaded.created_at)
+        self.assertEqual(self.vehicles.get_by_license_plate(" b000001 ").id, vehicle_id)
+
+    def test_none_status_stored_as_null(self):
+        """Test that the model's 'none' status maps to NULL in the table"""
+        v = make_vehicle(1)
+        v.status = "none"
+        self.vehicles.insert(v)
+        self.assertIsNone(self.conn.execute("SELECT status FROM vehicle").fetchone()[0])
+
+    def test_bulk_insert_in_chunks(self):
+        """Test bulk inserting more rows than one chunk"""
+        count = self.vehicles.bulk_insert((make_vehicle(i) for i in range(25)), chunk_size=10)
+        self.assertEqual(count, 25)
+        self.assertEqual(self.vehicles.count(), 25)
+
+    def test_bulk_insert_failure_rolls_back_chunk(self):
+        """Test that a duplicate key rolls back only the failing chunk"""
+        vehicles = [make_vehicle(i) for i in range(10)] + [make_vehicle(10), make_vehicle(10)]
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.vehicles.bulk_insert(vehicles, chunk_size=10)
+        self.assertEqual(self.vehicles.count(), 10)
+
+    def test_bulk_upsert_vehicle_by_license_plate(self):
+        """Test that upsert updates existing vehicles by license plate"""
+        self.vehicles.bulk_insert([make_vehicle(1), make_vehicle(2)])
+        count = self.vehicles.bulk_upsert([make_vehicle(2, daily_rate=99.0), make_vehicle(3)])
+        self.assertEqual(count, 2)
+        self.assertEqual(self.vehicles.count(), 3)
+        self.assertEqual(self.vehicles.get_by_license_plate("B000002").daily_rate, 99.0)
+
+    def test_upsert_client_by_email_and_license_number(self):
+        """Test client upserts keyed on email and license number"""
+        self.clients.insert(Client(first_name="John", last_name="Doe", email="john@example.com", license_number="DL1"))
+        self.clients.upsert(Client(first_name="Johnny", last_name="Doe", email="JOHN@example.com", license_number="DL1"))
+        self.assertEqual(self.clients.get_by_email("john@example.com").first_name, "Johnny")
+        self.clients.upsert(
+            Client(first_name="Johnny", last_name="Doe", email="johnny@example.com", license_number="DL1"),
+            key="license_number",
+        )
+        self.assertEqual(self.clients.count(), 1)
+        self.assertEqual(self.clients.get_by_license_number("DL1").email, "johnny@example.com")
+
+    def test_invalid_conflict_key(self):
+        """Test that an unknown conflict key is rejected"""
+        with self.assertRaises(ValueError) as cm:
+            self.vehicles.upsert(make_vehicle(1), key="brand")
+        self.assertIn("Invalid conflict key", str(cm.exception))
+
+    def test_rental_and_maintenance_round_trip(self):
+        """Test that dates survive a round trip through the database"""
+        vehicle_id = self.vehicles.insert(make_vehicle(1))
+        client_id = self.clients.insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+        rentals = RentalRepository(self.conn)
+        rental_id = rentals.insert(Rental(
+            vehicle_id=vehicle_id, client_id=client_id,
+            rental_date=date(2024, 1, 1), return_date=date(2024, 1, 5), status="completed",
+        ))
+        self.assertEqual(rentals.get(rental_id).return_date, date(2024, 1, 5))
+
+        records = MaintenanceRecordRepository(self.conn)
+        records.bulk_insert([
+            MaintenanceRecord(vehicle_id=vehicle_id, description="Oil", cost=100.0,
+                              maintenance_date=date(2024, 2, 1), duration_days=1),
+        ])
+        record = records.get(1)
+        self.assertEqual(record.maintenance_date, date(2024, 2, 1))
+        self.assertEqual(record.duration_days, 1)
+
+    def test_iter_all_pages_by_id(self):
+        """Test that keyset paging yields every row once, in id order"""
+        self.vehicles.bulk_insert(make_vehicle(i) for i in range(25))
+        plates = [v.license_plate for v in self.vehicles.iter_all(page_size=10)]
+        self.assertEqual(plates, [f"B{i:06d}" for i in range(25)])
+        self.assertEqual(len(list(self.vehicles.iter_all(page_size=5, after_id=20))), 5)
+        self.assertEqual(list(self.vehicles.iter_all(page_size=25, after_id=25)), [])
+        with self.assertRaises(ValueError):
+            next(self.vehicles.iter_all(page_size=0))
+
+    def test_iter_rentals_by_client(self):
+        """Test open-then-returned ordering on (return_date, id) across pages"""
+        self.vehicles.bulk_insert(make_vehicle(i) for i in range(6))
+        client_id = self.clients.insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+        other_id = self.clients.insert(Client(first_name="Ion", last_name="Ion", email="ion@example.com"))
+        rentals = RentalRepository(self.conn)
+        returns = [date(2024, 3, 1), date(2024, 2, 1), date(2024, 2, 1), date(2024, 1, 1)]
+        for vid, returned in enumerate(returns, start=1):
+            rentals.insert(Rental(vehicle_id=vid, client_id=client_id, rental_date=date(2023, 12, 1),
+                                  return_date=returned, status="completed"))
+        open_id = rentals.insert(Rental(vehicle_id=5, client_id=client_id, rental_date=date(2024, 4, 1)))
+        rentals.insert(Rental(vehicle_id=6, client_id=other_id, rental_date=date(2024, 4, 1)))
+
+        listed = list(rentals.iter_by_client(client_id, page_size=2))
+        self.assertEqual([r.id for r in listed], [open_id, 4, 2, 3, 1])
+        self.assertEqual([r.id for r in rentals.iter_by_vehicle(2)], [2])
+
+    def test_iter_clients_by_last_name(self):
+        """Test keyset paging on a non-unique column"""
+        for i, last_name in enumerate(["Pop", "Ionescu", "Pop", "Albu", "Pop"]):
+            self.clients.insert(Client(first_name="X", last_name=last_name, email=f"c{i}@example.com"))
+        listed = [(c.last_name, c.id) for c in self.clients.iter_by_last_name(page_size=2)]
+        self.assertEqual(listed, sorted(listed))
+        self.assertEqual(len(listed), 5)
+
+if __name__ == '__main__':
+    unittest.main()
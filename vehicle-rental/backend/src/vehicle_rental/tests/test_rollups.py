@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from vehicle_rental.db import connection
+from vehicle_rental.models import Vehicle, Client, Rental, MaintenanceRecord
+from vehicle_rental.repositories import VehicleRepository, ClientRepository, RentalRepository
+from vehicle_rental.services import AvailabilityService, RollupService
+
+class TestRollupService(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=2)
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            vehicles = VehicleRepository(conn)
+            self.v1 = vehicles.insert(Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+            self.v2 = vehicles.insert(Vehicle(license_plate="B2", brand="Ford", model="Focus", year=2021, daily_rate=50))
+            self.client = ClientRepository(conn).insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+        self.rollups = RollupService()
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def add_rental(self, vehicle_id, start, end, status='completed'):
+        with connection.get_db_connection() as conn:
+            return RentalRepository(conn).insert(Rental(
+                vehicle_id=vehicle_id, client_id=self.client, rental_date=start, return_date=end, status=status))
+
+    def test_catch_up_matches_base_tables(self):
+        """Test that catch-up folds in completed rentals and maintenance once"""
+        self.add_rental(self.v1, date(2024, 1, 30), date(2024, 2, 2))   # 3 days across two months
+        self.add_rental(self.v2, date(2024, 1, 10), date(2024, 1, 10))  # same day counts as 1
+        self.add_rental(self.v2, date(2024, 1, 20), date(2024, 1, 25), status='cancelled')
+        AvailabilityService().add_maintenance(MaintenanceRecord(
+            vehicle_id=self.v1, description="Oil", cost=120, maintenance_date=date(2024, 2, 5)))
+
+        self.assertEqual(self.rollups.catch_up(), (2, 1))
+        self.assertEqual(self.rollups.catch_up(), (0, 0))
+
+        self.assertEqual(self.rollups.revenue(date(2024, 1, 1), date(2024, 3, 1)), 140)
+        self.assertEqual(self.rollups.revenue(date(2024, 2, 1), date(2024, 3, 1), brand="Dacia"), 30)
+        self.assertEqual(self.rollups.revenue_by_brand(date(2024, 1, 1), date(2024, 2, 1)), {"Dacia": 60, "Ford": 50})
+
+        summary = self.rollups.vehicle_summary(self.v1, "2024-01", "2024-02")
+        self.assertEqual(summary["rented_days"], 3)
+        self.assertEqual(summary["revenue"], 90)
+        self.assertEqual(summary["maintenance_cost"], 120)
+        self.assertEqual(self.rollups.maintenance_cost_by_vehicle("2024-01", "2024-12"), [(self.v1, 120)])
+
+    def test_utilization_by_brand(self):
+        """Test utilization as rented days over fleet days"""
+        self.add_rental(self.v1, date(2024, 3, 1), date(2024, 3, 6))
+        self.rollups.catch_up()
+        self.assertEqual(self.rollups.utilization_by_brand(date(2024, 3, 1), date(2024, 3, 11)), {"Dacia": 50.0, "Ford": 0.0})
+        with self.assertRaises(ValueError):
+            self.rollups.utilization_by_brand(date(2024, 3, 1), date(2024, 3, 1))
+
+    def test_catch_up_reads_only_new_completions(self):
+        """Test that catch-up follows the completion log past its watermark"""
+        old = self.add_rental(self.v1, date(2024, 1, 1), None, status='active')
+        self.add_rental(self.v2, date(2024, 1, 10), date(2024, 1, 12))
+        self.assertEqual(self.rollups.catch_up(), (1, 0))
+        with connection.get_db_connection() as conn:
+            with conn:
+                # An older rental completed later, outside the services
+                conn.execute("UPDATE rental SET return_date = '2024-01-03', status = 'completed' WHERE id = ?", (old,))
+            seq = conn.execute("SELECT MAX(seq) FROM rental_completion").fetchone()[0]
+        self.assertEqual(self.rollups.catch_up(), (1, 0))
+        self.assertEqual(self.rollups.catch_up(), (0, 0))
+        with connection.get_db_connection() as conn:
+            watermark = conn.execute("SELECT value FROM rollup_state WHERE name = 'rental_completion'").fetchone()[0]
+        self.assertEqual(watermark, seq)
+        self.assertEqual(self.rollups.revenue(date(2024, 1, 1), date(2024, 2, 1)), 160)
+
+    def test_return_updates_rollups(self):
+        """Test that completing a rental through the service updates rollups immediately"""
+        service = AvailabilityService(use_index=False, rollups=self.rollups)
+        rental_id = service.create_rental(Rental(vehicle_id=self.v2, client_id=self.client, rental_date=date(2024, 4, 1)))
+        service.return_rental(rental_id, date(2024, 4, 3))
+        self.assertEqual(self.rollups.revenue(date(2024, 4, 1), date(2024, 5, 1)), 100)
+        self.assertEqual(self.rollups.catch_up(), (0, 0))
+
+    def test_rebuild(self):
+        """Test that rebuild recomputes the same totals"""
+        self.add_rental(self.v1, date(2024, 5, 1), date(2024, 5, 4))
+        self.rollups.catch_up()
+        self.assertEqual(self.rollups.rebuild(), (1, 0))
+        self.assertEqual(self.rollups.revenue(date(2024, 5, 1), date(2024, 6, 1)), 90)
+
+if __name__ == '__main__':
+    unittest.main()
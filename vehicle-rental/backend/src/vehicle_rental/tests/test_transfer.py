@@ -0,0 +1,150 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from vehicle_rental.db import connection
+from vehicle_rental.main import main
+from vehicle_rental.repositories import VehicleRepository, RentalRepository
+from vehicle_rental.services.transfer import detect_format, export_file, import_file, import_records
+
+VEHICLE_FIELDS = ["id", "license_plate", "brand", "model", "year", "daily_rate", "status", "created_at"]
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=2)
+        connection.initialize_database()
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def write_vehicles_csv(self, name, n):
+        with open(self.path(name), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(VEHICLE_FIELDS)
+            for i in range(1, n + 1):
+                writer.writerow([i, f" b{i:05d} ", "dacia", "logan", 2020, 30.5, "", ""])
+        return self.path(name)
+
+    def test_csv_import_normalizes_and_reports_invalid_rows(self):
+        """Test chunked import with normalization, validation and unparseable rows"""
+        path = self.write_vehicles_csv("vehicles.csv", 25)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([26, "B26", "Dacia", "Logan", 1800, 30, "", ""])        # invalid year
+            writer.writerow([27, "B27", "Dacia", "Logan", "abc", 30, "", ""])       # unparseable
+        progress = []
+        result = import_file("vehicle", path, chunk_size=10, progress=lambda r: progress.append(r.rows))
+        self.assertEqual((result.rows, result.imported, result.unparseable), (27, 25, 1))
+        self.assertEqual(dict(result.errors), {"INVALID_YEAR": 1})
+        self.assertEqual(progress[:2], [10, 20])
+        with connection.get_db_connection() as conn:
+            vehicle = VehicleRepository(conn).get(3)
+        self.assertEqual((vehicle.license_plate, vehicle.brand, vehicle.model), ("B00003", "Dacia", "Logan"))
+
+    def test_bad_created_at_skips_only_its_row(self):
+        """Test that an unparseable created_at is counted instead of aborting the load"""
+        vehicle = {"license_plate": "B1", "brand": "Dacia", "model": "Logan", "year": 2020, "daily_rate": 30}
+        result = import_records("vehicle", [
+            dict(vehicle, created_at="2024-01-02 10:00:00"),
+            dict(vehicle, license_plate="B2", created_at="yesterday"),
+            dict(vehicle, license_plate="B3", created_at=1704189600),
+        ])
+        self.assertEqual((result.rows, result.imported, result.unparseable), (3, 1, 2))
+        with connection.get_db_connection() as conn:
+            imported = VehicleRepository(conn).get_by_license_plate("B1")
+        self.assertEqual(imported.created_at.isoformat(sep=" "), "2024-01-02 10:00:00")
+
+    def test_deferred_indexes_are_rebuilt(self):
+        """Test that secondary indexes exist again after the load"""
+        with connection.get_db_connection() as conn:
+            before = {row[1] for row in conn.execute("PRAGMA index_list(rental)")}
+        import_records("vehicle", [{"license_plate": "B1", "brand": "Dacia", "model": "Logan", "year": 2020, "daily_rate": 30}])
+        import_records("client", [{"first_name": "Ana", "last_name": "Pop", "email": "ana@example.com"}])
+        result = import_records("rental", [
+            {"vehicle_id": 1, "client_id": 1, "rental_date": "2024-01-01", "return_date": "2024-01-03", "status": "completed"},
+            {"vehicle_id": 1, "client_id": 1, "rental_date": "2024-01-05", "status": "active"},
+        ])
+        self.assertEqual(result.imported, 2)
+        with connection.get_db_connection() as conn:
+            after = {row[1] for row in conn.execute("PRAGMA index_list(rental)")}
+            self.assertEqual(RentalRepository(conn).count(), 2)
+        self.assertEqual(before, after)
+
+    def test_export_round_trip(self):
+        """Test that an exported file re-imports to the same rows in both formats"""
+        import_file("vehicle", self.write_vehicles_csv("vehicles.csv", 12))
+        for name in ("out.csv", "out.ndjson"):
+            self.assertEqual(export_file("vehicle", self.path(name), page_size=5), 12)
+        with open(self.path("out.ndjson"), encoding="utf-8") as f:
+            first = json.loads(f.readline())
+        self.assertEqual(first["license_plate"], "B00001")
+        self.assertIsNone(first["status"])
+
+        connection.configure_pool(db_path=self.path("copy.db"), size=1)
+        connection.initialize_database()
+        self.assertEqual(import_file("vehicle", self.path("out.ndjson")).imported, 12)
+        self.assertEqual(export_file("vehicle", self.path("copy.csv")), 12)
+        with open(self.path("out.csv"), encoding="utf-8") as a, open(self.path("copy.csv"), encoding="utf-8") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_statuses_follow_table_constraint(self):
+        """Test that vehicle statuses are validated against the table, so sold vehicles round-trip"""
+        rows = [
+            {"license_plate": "B1", "brand": "Dacia", "model": "Logan", "year": 2020, "daily_rate": 30, "status": "sold"},
+            {"license_plate": "B2", "brand": "Dacia", "model": "Logan", "year": 2020, "daily_rate": 30, "status": "rented"},
+        ]
+        result = import_records("vehicle", rows)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(dict(result.errors), {"INVALID_STATUS": 1})
+        export_file("vehicle", self.path("out.csv"))
+        connection.configure_pool(db_path=self.path("copy.db"), size=1)
+        connection.initialize_database()
+        self.assertEqual(import_file("vehicle", self.path("out.csv")).imported, 1)
+
+    def test_constraint_violations_skip_rows(self):
+        """Test that rows the database rejects are counted instead of aborting the import"""
+        rows = [
+            {"license_plate": f"B{i}", "brand": "Dacia", "model": "Logan", "year": 2020, "daily_rate": 30}
+            for i in (1, 2, 1, 3)
+        ]
+        result = import_records("vehicle", rows, chunk_size=2)
+        self.assertEqual((result.rows, result.imported, result.invalid), (4, 3, 1))
+        self.assertEqual(list(result.rejected), ["UNIQUE constraint failed: vehicle.license_plate"])
+        with connection.get_db_connection() as conn:
+            self.assertEqual(VehicleRepository(conn).count(), 3)
+
+    def test_indexes_dropped_by_interrupted_load_are_restored(self):
+        """Test that initialize_database rebuilds indexes recorded as dropped by a load that never finished"""
+        with connection.get_db_connection() as conn:
+            sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'ix_rental_rental_date'").fetchone()[0]
+            with conn:
+                conn.execute("INSERT INTO deferred_index (name, table_name, sql) VALUES ('ix_rental_rental_date', 'rental', ?)", (sql,))
+                conn.execute("DROP INDEX ix_rental_rental_date")
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            self.assertIn("ix_rental_rental_date", {row[1] for row in conn.execute("PRAGMA index_list(rental)")})
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM deferred_index").fetchone()[0], 0)
+
+    def test_cli(self):
+        """Test the import / export subcommands"""
+        path = self.write_vehicles_csv("vehicles.csv", 3)
+        self.assertEqual(main(["import", "vehicle", path, "--quiet"]), 0)
+        self.assertEqual(main(["export", "vehicle", self.path("out.jsonl"), "--quiet"]), 0)
+        with open(self.path("out.jsonl"), encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_detect_format(self):
+        """Test format detection from the file extension"""
+        self.assertEqual(detect_format("a.CSV"), "csv")
+        self.assertEqual(detect_format("a.jsonl"), "ndjson")
+        with self.assertRaises(ValueError):
+            detect_format("a.txt")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from datetime import date, timedelta
+from vehicle_rental.models import (
+    Vehicle, Client, Rental, MaintenanceRecord, ErrorCode,
+    validate_vehicles, validate_clients, validate_rentals, validate_maintenance_records,
+)
+
+class TestBatchValidation(unittest.TestCase):
+    def test_clients_match_constructor(self):
+        """Test that batch results agree with Client.__post_init__"""
+        rows = [
+            ("John", "Doe", "john@example.com", 1),
+            ("", "Doe", "john@example.com", 1),
+            ("John", "  ", "john@example.com", 1),
+            ("John", "Doe", "", 1),
+            ("John", "Doe", "invalid-email", 1),
+            ("John", "Doe", "john@example.com", 2),
+            (" Ana ", "Pop", " ANA@EXAMPLE.COM ", 0),
+        ]
+        result = validate_clients(*map(list, zip(*rows)))
+        for (first, last, email, status), valid in zip(rows, result.mask):
+            try:
+                Client(first_name=first, last_name=last, email=email, status=status)
+                constructed = True
+            except ValueError:
+                constructed = False
+            self.assertEqual(valid, constructed, (first, last, email, status))
+        self.assertEqual(result.codes, [
+            ErrorCode.OK, ErrorCode.EMPTY_FIRST_NAME, ErrorCode.EMPTY_LAST_NAME, ErrorCode.EMPTY_EMAIL,
+            ErrorCode.INVALID_EMAIL, ErrorCode.INVALID_STATUS, ErrorCode.OK,
+        ])
+        self.assertEqual(result.valid_count, 2)
+        self.assertEqual(result.invalid_rows(), [1, 2, 3, 4, 5])
+
+    def test_vehicles(self):
+        """Test vehicle checks and error counts"""
+        result = validate_vehicles(
+            license_plate=["B1", "B2", "  ", "B4", "B5"],
+            brand=["Dacia"] * 5,
+            model=["Logan"] * 5,
+            year=[2020, 1800, 2020, 2020, 2020],
+            daily_rate=[30.0, 30.0, 30.0, 0.0, 30.0],
+            status=[None, None, None, None, "flying"],
+        )
+        self.assertEqual(result.codes, [
+            ErrorCode.OK, ErrorCode.INVALID_YEAR, ErrorCode.EMPTY_LICENSE_PLATE,
+            ErrorCode.INVALID_DAILY_RATE, ErrorCode.INVALID_STATUS,
+        ])
+        self.assertEqual(result.error_counts()[ErrorCode.INVALID_YEAR], 1)
+        Vehicle(license_plate="B1", brand="Dacia", model="Logan", year=2020, daily_rate=30.0)
+
+    def test_rentals_use_given_today(self):
+        """Test rental checks against a fixed 'today'"""
+        today = date(2024, 6, 1)
+        result = validate_rentals(
+            vehicle_id=[1, 1, 0, 1, 1, 1],
+            client_id=[1, 1, 1, 1, 1, -1],
+            rental_date=[date(2024, 5, 1), date(2024, 7, 1), date(2024, 5, 1),
+                         date(2024, 5, 1), date(2024, 5, 10), date(2024, 5, 1)],
+            return_date=[None, None, None, date(2024, 5, 2), date(2024, 5, 9), None],
+            status=["active", "active", "active", "active", "completed", "active"],
+            today=today,
+        )
+        self.assertEqual(result.codes, [
+            ErrorCode.OK, ErrorCode.FUTURE_DATE, ErrorCode.INVALID_VEHICLE_ID,
+            ErrorCode.RETURN_DATE_ON_ACTIVE, ErrorCode.RETURN_BEFORE_RENTAL, ErrorCode.INVALID_CLIENT_ID,
+        ])
+        Rental(vehicle_id=1, client_id=1, rental_date=date(2024, 5, 1))
+
+    def test_maintenance_records(self):
+        """Test maintenance record checks"""
+        future = date.today() + timedelta(days=1)
+        result = validate_maintenance_records(
+            vehicle_id=[1, 1, 1, 1, 1],
+            description=["Oil", " ", "Oil", "Oil", "Oil"],
+            cost=[10.0, 10.0, -1.0, 10.0, 10.0],
+            maintenance_date=[date(2024, 1, 1)] * 3 + [future, date(2024, 1, 1)],
+            duration_days=[1, None, None, None, 0],
+        )
+        self.assertEqual(result.codes, [
+            ErrorCode.OK, ErrorCode.EMPTY_DESCRIPTION, ErrorCode.NEGATIVE_COST,
+            ErrorCode.FUTURE_DATE, ErrorCode.INVALID_DURATION,
+        ])
+        MaintenanceRecord(vehicle_id=1, description="Oil", cost=10.0, maintenance_date=date(2024, 1, 1), duration_days=1)
+
+    def test_column_length_mismatch(self):
+        """Test that columns of different lengths are rejected"""
+        with self.assertRaises(ValueError):
+            validate_clients(["John"], ["Doe", "Doe"], ["john@example.com"])
+
+if __name__ == '__main__':
+    unittest.main()
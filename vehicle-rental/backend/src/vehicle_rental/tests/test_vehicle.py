@@ -145,5 +145,20 @@ class TestVehicle(unittest.TestCase):
         self.assertEqual(v.brand, "Toyota")
         self.assertEqual(v.model, "Camry")
 
+    def test_from_row_skips_validation(self):
+        """Test trusted construction from a database row"""
+        v = Vehicle.from_row({
+            "id": 7, "license_plate": "AB123CD", "brand": "Toyota", "model": "Camry",
+            "year": 2020, "daily_rate": 50.0, "status": "sold", "created_at": "2024-01-02 03:04:05",
+        })
+        self.assertEqual(v.id, 7)
+        self.assertEqual(v.status, "sold")  # allowed by the table, not by __post_init__
+        self.assertEqual(v.created_at, datetime(2024, 1, 2, 3, 4, 5))
+
+    def test_slots(self):
+        """Test that vehicles do not carry a per-instance __dict__"""
+        v = Vehicle(license_plate="AB123CD", brand="Toyota", model="Camry", year=2020, daily_rate=50.0)
+        self.assertFalse(hasattr(v, "__dict__"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+from vehicle_rental.db import connection
+from vehicle_rental.models import Vehicle, Client, Rental, MaintenanceRecord
+from vehicle_rental.repositories import VehicleRepository, ClientRepository, RentalRepository
+from vehicle_rental.services import AvailabilityService, RentalWriter, RollupService, VehicleAlreadyRentedError
+
+class TestRentalWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        connection.configure_pool(db_path=os.path.join(self.tmpdir.name, "test.db"), size=4)
+        connection.initialize_database()
+        with connection.get_db_connection() as conn:
+            vehicles = VehicleRepository(conn)
+            self.vehicles = [
+                vehicles.insert(Vehicle(license_plate=f"B{i}", brand="Dacia", model="Logan", year=2020, daily_rate=30))
+                for i in range(20)
+            ]
+            self.client = ClientRepository(conn).insert(Client(first_name="Ana", last_name="Pop", email="ana@example.com"))
+
+    def tearDown(self):
+        connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def rental(self, vehicle_id):
+        return Rental(vehicle_id=vehicle_id, client_id=self.client, rental_date=date(2024, 1, 1))
+
+    def test_double_checkout_fails_alone(self):
+        """Test that a second open rental for a vehicle fails without affecting the batch"""
+        with RentalWriter() as writer:
+            first = writer.checkout(self.rental(self.vehicles[0]))
+            second = writer.checkout(self.rental(self.vehicles[0]))
+            other = writer.checkout(self.rental(self.vehicles[1]))
+            self.assertIsInstance(first.result(), int)
+            with self.assertRaises(VehicleAlreadyRentedError):
+                second.result()
+            self.assertIsInstance(other.result(), int)
+        with connection.get_db_connection() as conn:
+            self.assertEqual(RentalRepository(conn).count(), 2)
+
+    def test_concurrent_checkouts_are_group_committed(self):
+        """Test that concurrent producers are served in fewer transactions than commands"""
+        writer = RentalWriter(batch_size=64)
+        futures = []
+        lock = threading.Lock()
+
+        def producer(vehicle_ids):
+            for vid in vehicle_ids:
+                future = writer.checkout(self.rental(vid))
+                with lock:
+                    futures.append(future)
+
+        threads = [threading.Thread(target=producer, args=(self.vehicles * 5,)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+        succeeded = [f for f in futures if f.exception() is None]
+        self.assertEqual(len(succeeded), len(self.vehicles))
+        self.assertTrue(all(isinstance(f.exception(), VehicleAlreadyRentedError) for f in futures if f not in succeeded))
+        self.assertEqual(writer.commands, len(futures))
+        self.assertLess(writer.batches, len(futures))
+
+    def test_return_and_maintenance_update_index(self):
+        """Test that committed commands keep the availability index in sync"""
+        service = AvailabilityService()
+        service.load()
+        with RentalWriter(availability=service) as writer:
+            rental_id = writer.checkout(self.rental(self.vehicles[0])).result()
+            self.assertFalse(service.is_available(self.vehicles[0], date(2024, 2, 1), date(2024, 2, 2)))
+            writer.return_rental(rental_id, date(2024, 1, 5)).result()
+            self.assertTrue(service.is_available(self.vehicles[0], date(2024, 2, 1), date(2024, 2, 2)))
+            writer.add_maintenance(MaintenanceRecord(
+                vehicle_id=self.vehicles[0], description="Oil", cost=100, maintenance_date=date(2024, 2, 1))).result()
+            self.assertFalse(service.is_available(self.vehicles[0], date(2024, 2, 1), date(2024, 2, 2)))
+            with self.assertRaises(ValueError):
+                writer.return_rental(rental_id, date(2024, 1, 6)).result()
+
+    def test_maintenance_updates_rollups(self):
+        """Test that maintenance written through the writer reaches the rollups"""
+        rollups = RollupService()
+        with RentalWriter(rollups=rollups) as writer:
+            writer.add_maintenance(MaintenanceRecord(
+                vehicle_id=self.vehicles[0], description="Oil", cost=100, maintenance_date=date(2024, 2, 1))).result()
+        self.assertEqual(rollups.maintenance_cost_by_vehicle("2024-01", "2024-12"), [(self.vehicles[0], 100)])
+
+    def test_failing_index_update_still_resolves_future(self):
+        """Test that an exception after commit neither hangs the future nor stops the writer"""
+        class BrokenAvailability:
+            def track_rental(self, rental):
+                raise RuntimeError("index is broken")
+
+        with self.assertLogs("vehicle_rental.services.writer", level="ERROR"):
+            with RentalWriter(availability=BrokenAvailability()) as writer:
+                self.assertIsInstance(writer.checkout(self.rental(self.vehicles[0])).result(timeout=5), int)
+                self.assertIsInstance(writer.checkout(self.rental(self.vehicles[1])).result(timeout=5), int)
+
+    def test_closed_writer_rejects_commands(self):
+        """Test that submitting after close raises"""
+        writer = RentalWriter()
+        writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.checkout(self.rental(self.vehicles[0]))
+
+if __name__ == '__main__':
+    unittest.main()